@@ -1,9 +1,9 @@
 import pandas as pd
-from src.authorship_util import extract_authors
+from src.authorship_util import extract_authors_table, AUTHORSHIP_SOURCE_COLUMNS
+from src.institutions_util import new_institution_table
+from src.csv_util import iter_openalex_csv, CSV_ENGINES
 import argparse
 import os
-import csv
-import sys
 
 def main():
   parser = argparse.ArgumentParser(
@@ -24,21 +24,35 @@ def main():
     help='O caminho para o arquivo CSV de saída com os autores.'
   )
 
+  parser.add_argument(
+    '--chunk-size',
+    type=int,
+    default=None,
+    help='Se especificado, o CSV de entrada é lido em blocos com esse número de linhas, limitando o uso de memória.'
+  )
+
+  parser.add_argument(
+    '--csv-engine',
+    type=str,
+    default='c',
+    choices=CSV_ENGINES,
+    help='O parser de CSV do pandas: "c" (padrão, mais rápido) ou "python".'
+  )
+
   args = parser.parse_args()
 
   csv_path = args.csv_path
   output_csv_path = args.output_csv_path
-  new_limit = sys.maxsize
 
   try:
-    csv.field_size_limit(new_limit)
-    df_works = pd.read_csv(csv_path, encoding='utf8', engine='python')
-    print(f"DataFrame lido de: {csv_path}\n")
     print("Extraindo os autores do arquivo de entrada...")
-    authors_frozenset = extract_authors(df_works)
-    
-    authors_list_of_dicts = [dict(item) for item in authors_frozenset]
-    authors_df = pd.DataFrame(authors_list_of_dicts)
+    institution_table = new_institution_table()
+    authors_tables = [
+      extract_authors_table(df_works, institution_table)
+      for df_works in iter_openalex_csv(csv_path, columns=AUTHORSHIP_SOURCE_COLUMNS, chunksize=args.chunk_size, engine=args.csv_engine)
+    ]
+    print(f"DataFrame lido de: {csv_path}\n")
+    authors_df = pd.concat(authors_tables, ignore_index=True).drop_duplicates(subset='id', keep='first').reset_index(drop=True)
     
     print("\nLista de Autores Gerada (Exemplo de Saída no Terminal):")
     print(authors_df.head())
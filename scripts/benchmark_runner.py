@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import pandas as pd
+from src.benchmark_util import (
+  BENCHMARK_STAGES, BENCHMARK_DEFAULTS, REGRESSION_THRESHOLD, run_benchmark, append_benchmark_results,
+  load_benchmark_results, compare_benchmarks
+)
+from src.network_util import METRICS_BACKENDS, GRAPH_METRICS, OPTIONAL_METRICS
+from src.synthetic_util import write_synthetic_works
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Mede o tempo e o pico de memória de cada estágio da análise (extração de autores, grafos de coautoria, grafos anuais, métricas e ataques a hubs) sobre bases sintéticas de vários tamanhos, guarda os resultados com a versão do código e os compara com a versão medida anteriormente.'
+  )
+
+  parser.add_argument(
+    '--sizes',
+    type=int,
+    nargs='+',
+    default=[10000, 100000],
+    help='Os números de trabalhos das bases sintéticas (separados por espaço, ex.: 10000 100000 1000000 5000000).'
+  )
+
+  parser.add_argument(
+    '--stages',
+    type=str,
+    nargs='+',
+    default=list(BENCHMARK_STAGES),
+    choices=list(BENCHMARK_STAGES),
+    help='Os estágios medidos (separados por espaço). Padrão: todos.'
+  )
+
+  parser.add_argument(
+    '--data-dir',
+    type=str,
+    default='results/benchmarks/data',
+    help='A pasta dos CSVs sintéticos. Cada base é gerada uma única vez e reaproveitada.'
+  )
+
+  parser.add_argument(
+    '--results-path',
+    type=str,
+    default='results/benchmarks/benchmarks.jsonl',
+    help='O arquivo (um JSON por linha) ao qual os resultados são acrescentados.'
+  )
+
+  parser.add_argument(
+    '--seed',
+    type=int,
+    default=42,
+    help='A semente das bases sintéticas e dos sorteios das métricas.'
+  )
+
+  parser.add_argument(
+    '--repeat',
+    type=int,
+    default=1,
+    help='O número de execuções cronometradas de cada estágio (vale a menor).'
+  )
+
+  parser.add_argument(
+    '--no-memory',
+    action='store_true',
+    help='Se especificado, não mede o pico de memória (que exige uma execução a mais de cada estágio).'
+  )
+
+  parser.add_argument(
+    '--metrics-backend',
+    type=str,
+    default=BENCHMARK_DEFAULTS['metrics_backend'],
+    choices=METRICS_BACKENDS,
+    help='O backend de `extract_graph_metrics`.'
+  )
+
+  parser.add_argument(
+    '--pivots',
+    type=int,
+    default=BENCHMARK_DEFAULTS['pivots'],
+    help='O número de pivôs das centralidades de intermediação e proximidade e da média da distância geodésica. Com 0, essas métricas são exatas (inviável nas bases maiores).'
+  )
+
+  parser.add_argument(
+    '--metrics',
+    type=str,
+    nargs='+',
+    default=None,
+    choices=GRAPH_METRICS + OPTIONAL_METRICS,
+    help='As métricas calculadas em `extract_graph_metrics` (separadas por espaço). Padrão: todas, exceto o agrupamento ponderado.'
+  )
+
+  parser.add_argument(
+    '--workers',
+    type=int,
+    default=BENCHMARK_DEFAULTS['workers'],
+    help='O número de processos das varreduras BFS das métricas e dos ataques.'
+  )
+
+  parser.add_argument(
+    '--num-hubs',
+    type=int,
+    default=BENCHMARK_DEFAULTS['num_hubs'],
+    help='O número de hubs (maiores graus) removidos no ataque.'
+  )
+
+  parser.add_argument(
+    '--baseline',
+    type=str,
+    default=None,
+    help='O commit (ou prefixo) com que os resultados são comparados. Padrão: a última versão medida antes da atual.'
+  )
+
+  parser.add_argument(
+    '--threshold',
+    type=float,
+    default=REGRESSION_THRESHOLD,
+    help='O aumento relativo de tempo ou memória considerado regressão (0.2 = 20%%).'
+  )
+
+  parser.add_argument(
+    '--compare-only',
+    action='store_true',
+    help='Se especificado, não mede nada e apenas compara os resultados já gravados.'
+  )
+
+  args = parser.parse_args()
+
+  options = {
+    'metrics_backend': args.metrics_backend,
+    'pivots': args.pivots,
+    'metrics': args.metrics,
+    'seed': args.seed,
+    'workers': args.workers,
+    'num_hubs': args.num_hubs
+  }
+
+  try:
+    if not args.compare_only:
+      results_dir = os.path.dirname(args.results_path)
+      if results_dir:
+        os.makedirs(results_dir, exist_ok=True)
+
+      for num_works in args.sizes:
+        csv_path = os.path.join(args.data_dir, f"works_synthetic_{num_works}_{args.seed}.csv")
+        if not os.path.exists(csv_path):
+          print(f"Gerando a base sintética com {num_works} trabalhos: {csv_path}")
+          write_synthetic_works(csv_path, num_works, seed=args.seed)
+
+        print(f"\nBase com {num_works} trabalhos:")
+        results = run_benchmark(
+          csv_path,
+          stages=args.stages,
+          repeat=args.repeat,
+          memory=not args.no_memory,
+          options=options,
+          dataset={'generator': 'synthetic', 'num_works': num_works, 'seed': args.seed}
+        )
+        append_benchmark_results(args.results_path, results)
+      print(f"\nResultados gravados em: {args.results_path}")
+
+    comparison = compare_benchmarks(
+      load_benchmark_results(args.results_path), baseline=args.baseline, threshold=args.threshold
+    )
+    if comparison.empty:
+      print("Não há outra versão medida para comparar.")
+      return
+
+    print(f"\nComparação de {comparison.attrs['current'][:12]} com {comparison.attrs['baseline'][:12]}:")
+    table = comparison.reset_index()
+    table['num_works'] = table['dataset'].map(lambda dataset: json.loads(dataset).get('num_works'))
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+      print(table[['num_works', 'stage', 'seconds_baseline', 'seconds_current', 'time_ratio', 'memory_ratio', 'regression']].to_string(index=False))
+
+    regressions = comparison[comparison['regression']]
+    if not regressions.empty:
+      print(f"\nAviso: {len(regressions)} medições pioraram mais de {args.threshold:.0%}.")
+  except FileNotFoundError as e:
+    print(f"Erro: O arquivo '{e.filename}' não foi encontrado.")
+  except ValueError as e:
+    print(f"Erro: {e}")
+  except Exception as e:
+    print(f"Erro nao especificado. {e}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+from contextlib import nullcontext
+from src.graph_store_util import read_graph, write_graph, open_author_registry
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Converte grafos entre o formato GEXF (Gephi) e o formato binário. O formato de saída é definido pela extensão: ".gexf" gera GEXF, qualquer outra gera o formato binário.'
+  )
+
+  parser.add_argument(
+    '--input-path',
+    type=str,
+    required=True,
+    help='O caminho para o grafo de entrada: arquivo GEXF ou pasta no formato binário.'
+  )
+
+  parser.add_argument(
+    '--output-path',
+    type=str,
+    required=True,
+    help='O caminho para o grafo de saída (ex.: "graph_uft_2024.gexf" ou "graph_uft_2024.graph").'
+  )
+
+  parser.add_argument(
+    '--registry-path',
+    type=str,
+    default=None,
+    help='Se especificado (com saída no formato binário), o diretório do registro global de autores: o grafo guarda só as chaves inteiras dos autores, e os autores novos são incluídos no registro.'
+  )
+
+  args = parser.parse_args()
+
+  try:
+    graph = read_graph(args.input_path)
+    print(f"Grafo lido de: {args.input_path}\n")
+
+    try:
+      output_dir = os.path.dirname(args.output_path)
+      if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Diretório de saída '{output_dir}' criado.")
+
+      with open_author_registry(args.registry_path) if args.registry_path else nullcontext() as registry:
+        write_graph(graph, args.output_path, registry=registry, registry_path=args.registry_path)
+      print(f"Grafo salvo com sucesso em: {args.output_path}")
+    except IOError as e:
+      print(f"\nErro ao salvar o grafo de saída em '{args.output_path}': {e}")
+    except Exception as e:
+      print(f"\nOcorreu um erro inesperado ao salvar o grafo: {e}")
+
+  except FileNotFoundError:
+    print(f"Erro: Grafo não encontrado em '{args.input_path}'")
+  except Exception as e:
+    print(f"Erro nao especificado. {e}")
+
+
+if __name__ == "__main__":
+  main()
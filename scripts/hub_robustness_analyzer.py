@@ -1,8 +1,44 @@
 import argparse
 import os
 import json
-import networkx as nx
-from src.network_util import identify_hubs, analyze_network_attack
+from src.network_util import identify_hubs, analyze_network_attack, extract_graph_metrics
+from src.graph_store_util import read_csr_graph, export_node_ids
+from src.metrics_store_util import load_metrics, import_node_metrics
+from src.catalog_util import record_attack_results
+from src.robustness_util import (
+  HUB_METRIC_KEYS, ADAPTIVE_METRICS, ADAPTIVE_MAX_RECOMPUTES, ADAPTIVE_CURVE_PIVOTS, ANALYSIS_SCOPES, load_sweep_spec, run_robustness_sweep, attack_curve, export_attack_nodes,
+  RANDOM_FAILURE_FRACTIONS, RANDOM_FAILURE_EFFICIENCY_PIVOTS, adaptive_hub_ranking, hub_attack_results, hub_attack_curves, random_failure_analysis
+)
+from src.csr_util import largest_component
+
+def save_attack_results(output_json_path, attack_results, curve=False, random_failure=False):
+  try:
+    output_dir = os.path.dirname(output_json_path)
+    if output_dir and not os.path.exists(output_dir):
+      os.makedirs(output_dir)
+
+    with open(output_json_path, 'w', encoding='utf-8') as f:
+      json.dump(attack_results, f, ensure_ascii=False, indent=4)
+    
+    print(f"\nAnálise de robustez concluída. Resultados salvos em: {output_json_path}")
+    if random_failure:
+      lcc_fraction = attack_results['largest_connected_component_fraction']['mean']
+      print(f"Fração média do grafo no maior componente conectado, de {attack_results['fractions'][0]:.0%} a {attack_results['fractions'][-1]:.0%} removidos: "
+            f"{lcc_fraction[0]:.4f} -> {lcc_fraction[-1]:.4f}")
+    elif curve:
+      print(f"Índice de robustez R: {attack_results['robustness_index']:.4f}")
+    else:
+      print(f"Redução no tamanho do maior componente conectado: {attack_results['impact']['lcc_size_reduction_percent']:.2f}%")
+
+  except IOError as e:
+    print(f"Erro ao salvar o arquivo JSON de saída: {e}")
+
+
+def catalog_attack_results(args, attack_results):
+  if args.catalog_path:
+    record_attack_results(args.catalog_path, args.institution, args.year, {args.metric: {args.num_hubs: attack_results}})
+    print(f"Resultado registrado no catálogo: {args.catalog_path}")
+
 
 def main():
   parser = argparse.ArgumentParser(
@@ -10,22 +46,22 @@ def main():
   )
 
   parser.add_argument(
-    '--gexf-path', type=str, required=True,
-    help='O caminho para o arquivo GEXF de entrada do grafo (necessário para a topologia da rede).'
+    '--gexf-path', '--graph-path', dest='gexf_path', type=str, default=None,
+    help='O caminho para o grafo de entrada, em GEXF ou no formato binário (necessário para a topologia da rede).'
   )
   
   parser.add_argument(
-    '--metrics-json-path', type=str, required=True,
-    help='O caminho para o arquivo JSON de entrada com as métricas pré-calculadas.'
+    '--metrics-json-path', type=str, default=None,
+    help='O caminho para as métricas pré-calculadas (JSON ou formato colunar ".metrics", preferido se existir ao lado do JSON). Se omitido, apenas a métrica escolhida é calculada a partir do grafo.'
   )
 
   parser.add_argument(
-    '--output-json-path', type=str, required=True,
+    '--output-json-path', type=str, default=None,
     help='O caminho para o arquivo JSON de saída com os resultados da análise.'
   )
 
   parser.add_argument(
-    '--metric', type=str, default='degree', choices=['degree', 'betweenness', 'eigenvector', 'closeness'],
+    '--metric', type=str, default='degree', choices=list(HUB_METRIC_KEYS),
     help='A métrica de centralidade para identificar os hubs.'
   )
 
@@ -40,36 +76,204 @@ def main():
     help='Se especificado, a análise de hubs será restrita ao Maior Componente Conectado (LCC).'
   )
 
+  parser.add_argument(
+    '--workers',
+    type=int,
+    default=1,
+    help='Número de processos usados nas varreduras BFS (divididas por vértice de origem).'
+  )
+
+  parser.add_argument(
+    '--cache-dir', type=str, default=None,
+    help='Diretório do cache de métricas, usado quando a métrica é calculada a partir do grafo.'
+  )
+
+  parser.add_argument(
+    '--curve',
+    action='store_true',
+    help='Se especificado, remove todos os vértices em ordem de centralidade e salva a curva completa do maior componente conectado após cada remoção, com o índice de robustez R (ignora --num-hubs).'
+  )
+
+  parser.add_argument(
+    '--adaptive',
+    action='store_true',
+    help='Se especificado, executa um ataque adaptativo: o próximo hub é escolhido pela centralidade no grafo restante após cada remoção. Aceita apenas as métricas "degree" e "betweenness" e dispensa o JSON de métricas.'
+  )
+
+  parser.add_argument(
+    '--recompute-interval', type=int, default=None,
+    help=f'No ataque adaptativo por intermediação, número de remoções entre dois recálculos da centralidade. Cada recálculo exato custa uma varredura BFS completa. Padrão: automático, com no máximo {ADAPTIVE_MAX_RECOMPUTES} recálculos (intervalo 1 para poucos hubs).'
+  )
+
+  parser.add_argument(
+    '--approximate-pivots', type=int, default=None,
+    help=f'No ataque adaptativo por intermediação, estima a centralidade com esse número de pivôs em cada recálculo. Padrão: exata, exceto na curva completa (--curve), em que são usados {ADAPTIVE_CURVE_PIVOTS} pivôs.'
+  )
+
+  parser.add_argument(
+    '--seed', type=int, default=42,
+    help='Semente do sorteio dos pivôs do ataque adaptativo e dos ensaios de falha aleatória.'
+  )
+
+  parser.add_argument(
+    '--random-failure',
+    action='store_true',
+    help='Se especificado, simula falhas aleatórias em vez de ataques: em cada ensaio os vértices são removidos em ordem uniformemente aleatória, e a média e as faixas de confiança do maior componente conectado e da eficiência global são salvas por fração removida (dispensa --metric e o JSON de métricas).'
+  )
+
+  parser.add_argument(
+    '--trials', type=int, default=1000,
+    help='Número de ensaios de falha aleatória.'
+  )
+
+  parser.add_argument(
+    '--fractions', type=float, nargs='+', default=RANDOM_FAILURE_FRACTIONS,
+    help='Frações de vértices removidos em que a rede é medida nas falhas aleatórias (padrão: 0 a 0.95, de 0.05 em 0.05).'
+  )
+
+  parser.add_argument(
+    '--efficiency-pivots', type=int, default=RANDOM_FAILURE_EFFICIENCY_PIVOTS,
+    help=f'Nas falhas aleatórias, estima a eficiência global a partir desse número de origens sorteadas por ensaio e fração (padrão: {RANDOM_FAILURE_EFFICIENCY_PIVOTS}). Com 0, a eficiência é exata (uma varredura BFS completa por ensaio e fração; lenta com muitos ensaios).'
+  )
+
+  parser.add_argument(
+    '--no-efficiency',
+    action='store_true',
+    help='Nas falhas aleatórias, mede apenas o maior componente conectado (muito mais rápido).'
+  )
+
+  parser.add_argument(
+    '--sweep-spec', type=str, default=None,
+    help='Caminho para um JSON com uma varredura completa (instituições, anos, métricas e quantidades de hubs; ver `robustness_util.load_sweep_spec`). Substitui as opções de análise única.'
+  )
+
+  parser.add_argument(
+    '--processes', type=int, default=1,
+    help='Número de processos entre os quais os grafos da varredura (--sweep-spec) são distribuídos.'
+  )
+
+  parser.add_argument(
+    '--catalog-path', type=str, default=None,
+    help='Se especificado, o catálogo SQLite de métricas (`catalog_util`) onde o resultado do ataque a hubs é registrado. Exige --institution e --year. Na varredura, use o campo "catalog_path" da especificação.'
+  )
+
+  parser.add_argument(
+    '--institution', type=str, default=None,
+    help='A instituição do grafo, usada no catálogo.'
+  )
+
+  parser.add_argument(
+    '--year', type=int, default=None,
+    help='O ano do grafo, usado no catálogo.'
+  )
+
   args = parser.parse_args()
 
+  if args.catalog_path and (args.institution is None or args.year is None):
+    parser.error('--catalog-path exige --institution e --year.')
+
+  if args.sweep_spec:
+    try:
+      spec = load_sweep_spec(args.sweep_spec)
+    except FileNotFoundError:
+      print(f"Erro: Especificação da varredura não encontrada em '{args.sweep_spec}'")
+      return
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+      print(f"Erro: Especificação da varredura inválida: {e}")
+      return
+
+    print(f"Iniciando a varredura de robustez: {len(spec['institutions'])} instituições, {len(spec['years'])} anos, "
+          f"métricas {spec['metrics']} e {spec['num_hubs']} hubs.")
+    run_robustness_sweep(spec, processes=args.processes, workers=args.workers)
+    print("\nVarredura de robustez concluída.")
+    return
+
+  if not args.gexf_path or not args.output_json_path:
+    parser.error('--graph-path e --output-json-path são obrigatórios quando --sweep-spec não é informado.')
+
   try:
     print(f"Lendo o grafo de: {args.gexf_path}")
-    graph = nx.read_gexf(args.gexf_path)
+    csr_graph = read_csr_graph(args.gexf_path, interned=True)
   except FileNotFoundError:
-    print(f"Erro: Arquivo GEXF não encontrado em '{args.gexf_path}'")
+    print(f"Erro: Grafo não encontrado em '{args.gexf_path}'")
     return
       
-  try:
-    print(f"Lendo as métricas pré-calculadas de: {args.metrics_json_path}")
-    with open(args.metrics_json_path, 'r', encoding='utf-8') as f:
-      metrics_data = json.load(f)
-  except FileNotFoundError:
-    print(f"Erro: Arquivo JSON de métricas não encontrado em '{args.metrics_json_path}'")
+  selected_metric_key = HUB_METRIC_KEYS.get(args.metric)
+
+  if args.random_failure:
+    print(f"\nIniciando {args.trials} ensaios de falha aleatória em {len(args.fractions)} frações removidas.")
+    attack_results = random_failure_analysis(
+      csr_graph, fractions=args.fractions, trials=args.trials, seed=args.seed,
+      efficiency=not args.no_efficiency, efficiency_pivots=args.efficiency_pivots or None, workers=args.workers
+    )
+    save_attack_results(args.output_json_path, attack_results, random_failure=True)
     return
-  except json.JSONDecodeError:
-    print(f"Erro: Falha ao decodificar o arquivo JSON de métricas.")
+
+  if args.adaptive:
+    if args.metric not in ADAPTIVE_METRICS:
+      print(f"Erro: O ataque adaptativo aceita apenas as métricas: {', '.join(ADAPTIVE_METRICS)}")
+      return
+
+    analysis_scope = ANALYSIS_SCOPES[args.lcc_only]
+    pivots = args.approximate_pivots
+    if pivots is None and args.curve and args.metric == 'betweenness':
+      pivots = ADAPTIVE_CURVE_PIVOTS
+      print(f"Curva completa do ataque adaptativo: intermediação estimada com {pivots} pivôs em cada recálculo (use --approximate-pivots para mudar).")
+    adaptive_info = {
+      'recompute_interval': args.recompute_interval,
+      'pivots': pivots,
+      'seed': args.seed
+    }
+    print(f"\nIniciando ataque adaptativo pela métrica de '{args.metric}' (escopo: {analysis_scope}).")
+
+    removal_order = adaptive_hub_ranking(
+      csr_graph, args.metric, num_removals=None if args.curve else args.num_hubs, lcc_only=args.lcc_only,
+      workers=args.workers, **adaptive_info
+    )
+    rankings = {args.metric: removal_order}
+
+    if args.curve:
+      attack_results = hub_attack_curves(csr_graph, rankings, lcc_only=args.lcc_only, attack_info={'adaptive': adaptive_info})[args.metric]
+    else:
+      attack_results = hub_attack_results(
+        csr_graph, rankings, [args.num_hubs], lcc_only=args.lcc_only, workers=args.workers,
+        attack_info={'adaptive': adaptive_info}
+      )[args.metric][args.num_hubs]
+    attack_results = export_attack_nodes(attack_results, args.gexf_path)
+    if not args.curve:
+      print(f"Hubs removidos, em ordem: {attack_results['hubs_removed_info']['hubs_ids']}")
+
+    save_attack_results(args.output_json_path, attack_results, args.curve)
+    if not args.curve:
+      catalog_attack_results(args, attack_results)
     return
 
-  metric_key_map = {
-    'degree': 'degrees', 'betweenness': 'betweenness_centrality',
-    'closeness': 'closeness_centrality', 'eigenvector': 'eigenvector_centrality'
-  }
-  selected_metric_key = metric_key_map.get(args.metric)
+  if args.metrics_json_path:
+    try:
+      print(f"Lendo as métricas pré-calculadas de: {args.metrics_json_path}")
+      metrics_data = import_node_metrics(load_metrics(args.metrics_json_path, node_metrics=[selected_metric_key]), args.gexf_path)
+    except FileNotFoundError:
+      print(f"Erro: Arquivo JSON de métricas não encontrado em '{args.metrics_json_path}'")
+      return
+    except json.JSONDecodeError:
+      print(f"Erro: Falha ao decodificar o arquivo JSON de métricas.")
+      return
+  else:
+    print(f"Calculando apenas a métrica '{selected_metric_key}' a partir do grafo...")
+    metrics_data = extract_graph_metrics(
+      csr_graph, backend='csr', workers=args.workers, requested_metrics=[selected_metric_key], cache_dir=args.cache_dir
+    )
 
   if not selected_metric_key or selected_metric_key not in metrics_data:
     print(f"Erro: A métrica '{selected_metric_key}' não foi encontrada no arquivo JSON.")
     return
 
+  if not isinstance(metrics_data[selected_metric_key], dict):
+    print(f"Aviso: A métrica '{selected_metric_key}' do JSON não tem valores por vértice ({metrics_data[selected_metric_key]!r}). Recalculando a partir do grafo...")
+    metrics_data[selected_metric_key] = extract_graph_metrics(
+      csr_graph, backend='csr', workers=args.workers, requested_metrics=[selected_metric_key]
+    )[selected_metric_key]
+
   centrality_dict = metrics_data[selected_metric_key]
   
   hubs_id_source_dict = centrality_dict
@@ -80,13 +284,11 @@ def main():
     analysis_scope = "Largest Connected Component (LCC)"
     
     print("Identificando o Maior Componente Conectado (LCC)...")
-    if nx.is_connected(graph):
-      lcc_nodes = set(graph.nodes())
+    lcc_nodes = {csr_graph.node_ids[index] for index in largest_component(csr_graph).tolist()}
+    if len(lcc_nodes) == len(csr_graph.node_ids):
       print("O grafo já é totalmente conectado.")
     else:
-      largest_component = max(nx.connected_components(graph), key=len)
-      lcc_nodes = set(largest_component)
-      print(f"LCC identificado com {len(lcc_nodes)} nós (de um total de {graph.number_of_nodes()}).")
+      print(f"LCC identificado com {len(lcc_nodes)} nós (de um total de {len(csr_graph.node_ids)}).")
 
     print(f"Filtrando a métrica '{selected_metric_key}' para conter apenas os nós do LCC...")
     lcc_centrality_dict = {
@@ -101,33 +303,38 @@ def main():
   else:
     print("\nAnálise será executada nos vértices gerais do grafo (comportamento padrão).")
 
-  print(f"\nIniciando análise de robustez com a remoção dos {args.num_hubs} principais hubs pela métrica de '{args.metric}'.")
-  print(f"Escopo da identificação dos hubs: {analysis_scope}")
-  
-  hubs_to_remove = identify_hubs(hubs_id_source_dict, top_n=args.num_hubs)
-  print(f"Principais hubs identificados: {hubs_to_remove}")
-
-  attack_results = analyze_network_attack(graph, hubs_to_remove)
-  attack_results['hubs_removed_info'] = {
-    'metric_used': args.metric,
-    'source_metric_key': selected_metric_key,
-    'analysis_scope': analysis_scope, # Registra o escopo no resultado
-    'hubs_ids': hubs_to_remove
-  }
+  if args.curve:
+    print(f"\nIniciando a curva de ataque completa pela métrica de '{args.metric}'.")
+    print(f"Escopo da identificação dos hubs: {analysis_scope}")
 
-  try:
-    output_dir = os.path.dirname(args.output_json_path)
-    if output_dir and not os.path.exists(output_dir):
-      os.makedirs(output_dir)
+    removal_order = identify_hubs(hubs_id_source_dict, top_n=len(hubs_id_source_dict))
+    attack_results = attack_curve(csr_graph, removal_order)
+    attack_results.update({
+      'metric_used': args.metric,
+      'source_metric_key': selected_metric_key,
+      'analysis_scope': analysis_scope
+    })
+  else:
+    print(f"\nIniciando análise de robustez com a remoção dos {args.num_hubs} principais hubs pela métrica de '{args.metric}'.")
+    print(f"Escopo da identificação dos hubs: {analysis_scope}")
+  
+    hubs_to_remove = identify_hubs(hubs_id_source_dict, top_n=args.num_hubs)
+    print(f"Principais hubs identificados: {export_node_ids(args.gexf_path, hubs_to_remove)}")
 
-    with open(args.output_json_path, 'w', encoding='utf-8') as f:
-      json.dump(attack_results, f, ensure_ascii=False, indent=4)
-    
-    print(f"\nAnálise de robustez concluída. Resultados salvos em: {args.output_json_path}")
-    print(f"Redução no tamanho do maior componente conectado: {attack_results['impact']['lcc_size_reduction_percent']:.2f}%")
+    attack_results = analyze_network_attack(csr_graph, hubs_to_remove, workers=args.workers)
+    attack_results['hubs_removed_info'] = {
+      'metric_used': args.metric,
+      'source_metric_key': selected_metric_key,
+      'analysis_scope': analysis_scope, # Registra o escopo no resultado
+      'hubs_ids': hubs_to_remove
+    }
+    if 'centrality_sampling' in metrics_data:
+      attack_results['hubs_removed_info']['centrality_sampling'] = metrics_data['centrality_sampling']
 
-  except IOError as e:
-    print(f"Erro ao salvar o arquivo JSON de saída: {e}")
+  attack_results = export_attack_nodes(attack_results, args.gexf_path)
+  save_attack_results(args.output_json_path, attack_results, args.curve)
+  if not args.curve:
+    catalog_attack_results(args, attack_results)
 
 if __name__ == '__main__':
   main()
\ No newline at end of file
@@ -1,9 +1,8 @@
 import pandas as pd
 import argparse
 import os
-import csv
-import sys
 import json
+from src.csv_util import iter_openalex_csv, CSV_ENGINES
 
 def main():
   parser = argparse.ArgumentParser(
@@ -25,25 +24,39 @@ def main():
     help='O caminho para o arquivo JSON de saída com os resultados das análises.'
   )
 
+  parser.add_argument(
+    '--chunk-size',
+    type=int,
+    default=None,
+    help='Se especificado, os CSVs de entrada são lidos em blocos com esse número de linhas, limitando o uso de memória.'
+  )
+
+  parser.add_argument(
+    '--csv-engine',
+    type=str,
+    default='c',
+    choices=CSV_ENGINES,
+    help='O parser de CSV do pandas: "c" (padrão, mais rápido) ou "python".'
+  )
+
   args = parser.parse_args()
 
   csv_paths = args.csv_paths
   output_json_path = args.output_json_path
 
-  new_limit = sys.maxsize
   all_analysis_results = {}
-  csv.field_size_limit(new_limit)
 
 
   for i, csv_path in enumerate(csv_paths):
     try:
-      df_authors = pd.read_csv(csv_path, encoding='utf8', engine='python')
-      print(f"DataFrame lido de: {csv_path}\n")
-      
       file_name = os.path.basename(csv_path).replace('.csv', '')
 
       print(f"Realizando a contagem de autores por ano para {file_name}...")
-      authors_count = len(df_authors)
+      authors_count = sum(
+        len(df_authors)
+        for df_authors in iter_openalex_csv(csv_path, columns=['id'], chunksize=args.chunk_size, engine=args.csv_engine)
+      )
+      print(f"DataFrame lido de: {csv_path}\n")
       print("Contagem de autores por ano concluída.")
         
       all_analysis_results[file_name] = authors_count
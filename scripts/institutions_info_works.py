@@ -1,10 +1,10 @@
 import pandas as pd
 import argparse
 import os
-import csv
-import sys
 import json
-from src.institutions_util import count_institutions, analyze_institution_papers
+from collections import Counter
+from src.institutions_util import new_institution_table, count_institutions, analyze_institution_papers, merge_institution_analyses, INSTITUTIONS_SOURCE_COLUMNS
+from src.csv_util import iter_openalex_csv, CSV_ENGINES
 
 def main():
   parser = argparse.ArgumentParser(
@@ -32,32 +32,55 @@ def main():
     help='Uma lista de nomes de instituições para análise específica (separadas por espaço). Ex: "Instituto Federal do Tocantins" "Universidade Federal do Tocantins"'
   )
 
+  parser.add_argument(
+    '--chunk-size',
+    type=int,
+    default=None,
+    help='Se especificado, o CSV de entrada é lido em blocos com esse número de linhas, limitando o uso de memória.'
+  )
+
+  parser.add_argument(
+    '--csv-engine',
+    type=str,
+    default='c',
+    choices=CSV_ENGINES,
+    help='O parser de CSV do pandas: "c" (padrão, mais rápido) ou "python".'
+  )
+
   args = parser.parse_args()
 
   csv_path = args.csv_path
   output_json_path = args.output_json_path
   target_institutions = args.target_institutions if args.target_institutions else []
 
-  new_limit = sys.maxsize
   try:
-    csv.field_size_limit(new_limit)
-    df_works = pd.read_csv(csv_path, encoding='utf8', engine='python')
+    has_institutions_column = False
+    institution_counts = Counter()
+    target_analyses = []
+    institution_table = new_institution_table()
+
+    for df_works in iter_openalex_csv(csv_path, columns=INSTITUTIONS_SOURCE_COLUMNS, chunksize=args.chunk_size, engine=args.csv_engine):
+      if 'authorships.institutions' not in df_works.columns:
+        break
+      has_institutions_column = True
+
+      institution_counts.update(count_institutions(df_works, institution_table))
+      if target_institutions:
+        target_analyses.append(analyze_institution_papers(df_works, target_institutions, institution_table))
     print(f"DataFrame lido de: {csv_path}\n")
     
     analysis_results = {}
 
-    if 'authorships.institutions' in df_works.columns:
+    if has_institutions_column:
       print("Realizando a contagem de trabalhos por instituição...")
-      institution_counts = count_institutions(df_works)
-      analysis_results['institution_counts'] = institution_counts
+      analysis_results['institution_counts'] = dict(institution_counts)
       print("Contagem de instituições concluída.")
     else:
       print("Coluna 'authorships.institutions' não encontrada. Pulando a contagem de instituições.")
 
-    if 'authorships.institutions' in df_works.columns and target_institutions:
+    if has_institutions_column and target_institutions:
       print(f"Realizando a análise para as instituições alvo: {target_institutions}...")
-      target_analysis = analyze_institution_papers(df_works, target_institutions)
-      analysis_results['target_institution_analysis'] = target_analysis
+      analysis_results['target_institution_analysis'] = merge_institution_analyses(target_analyses)
       print("Análise de instituições alvo concluída.")
     elif not target_institutions:
       print("Nenhuma instituição alvo fornecida. Pulando a análise de instituições alvo.")
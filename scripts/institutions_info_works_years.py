@@ -1,10 +1,10 @@
 import pandas as pd
 import argparse
 import os
-import csv
-import sys
 import json
-from src.works_util import count_papers_by_year
+from collections import Counter
+from src.works_util import count_papers_by_year, PUBLICATION_YEAR_COLUMNS
+from src.csv_util import iter_openalex_csv, CSV_ENGINES
 
 def main():
   parser = argparse.ArgumentParser(
@@ -40,6 +40,21 @@ def main():
     help='O ano de término para a análise de trabalhos por ano (inclusive).'
   )
 
+  parser.add_argument(
+    '--chunk-size',
+    type=int,
+    default=None,
+    help='Se especificado, os CSVs de entrada são lidos em blocos com esse número de linhas, limitando o uso de memória.'
+  )
+
+  parser.add_argument(
+    '--csv-engine',
+    type=str,
+    default='c',
+    choices=CSV_ENGINES,
+    help='O parser de CSV do pandas: "c" (padrão, mais rápido) ou "python".'
+  )
+
   args = parser.parse_args()
 
   csv_paths = args.csv_paths
@@ -47,20 +62,19 @@ def main():
   start_year = args.start_year
   end_year = args.end_year
 
-  new_limit = sys.maxsize
   all_analysis_results = {}
-  csv.field_size_limit(new_limit)
 
 
   for i, csv_path in enumerate(csv_paths):
     try:
-      df_works = pd.read_csv(csv_path, encoding='utf8', engine='python')
-      print(f"DataFrame lido de: {csv_path}\n")
-      
       file_name = os.path.basename(csv_path).replace('.csv', '')
 
       print(f"Realizando a contagem de trabalhos por ano para {file_name} entre {start_year} e {end_year}...")
-      year_counts = count_papers_by_year(df_works, start_year, end_year)
+      year_counts = Counter({year: 0 for year in range(start_year, end_year + 1)})
+      for df_works in iter_openalex_csv(csv_path, columns=PUBLICATION_YEAR_COLUMNS, chunksize=args.chunk_size, engine=args.csv_engine):
+        year_counts.update(count_papers_by_year(df_works, start_year, end_year))
+      year_counts = dict(year_counts)
+      print(f"DataFrame lido de: {csv_path}\n")
       print("Contagem de trabalhos por ano concluída.")
         
       all_analysis_results[file_name] = year_counts
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+from src.catalog_util import record_graph_metrics, record_attack_results
+from src.metrics_store_util import load_metrics, resolve_metrics_path
+from src.robustness_util import load_sweep_spec
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Preenche o catálogo SQLite de métricas com os resultados já calculados (métricas em JSON ou formato colunar e JSONs dos ataques a hubs), para consultá-los de uma vez nas tabelas e gráficos.'
+  )
+
+  parser.add_argument(
+    '--catalog-path',
+    type=str,
+    default='results/metrics/catalog.sqlite',
+    help='O caminho do catálogo SQLite (criado se não existir).'
+  )
+
+  parser.add_argument(
+    '--institutions',
+    type=str,
+    nargs='+',
+    required=True,
+    help='As instituições (separadas por espaço).'
+  )
+
+  parser.add_argument(
+    '--start-year',
+    type=int,
+    default=1998,
+    help='O primeiro ano (inclusive).'
+  )
+
+  parser.add_argument(
+    '--end-year',
+    type=int,
+    default=2024,
+    help='O último ano (inclusive).'
+  )
+
+  parser.add_argument(
+    '--metrics-path',
+    type=str,
+    default='results/metrics/{institution}/{institution}_{year}.json',
+    help='Modelo do caminho das métricas, com "{institution}" e "{year}". A versão colunar (".metrics") é preferida, se existir.'
+  )
+
+  parser.add_argument(
+    '--sweep-spec',
+    type=str,
+    default=None,
+    help='Se especificado, a varredura de robustez (`robustness_util.load_sweep_spec`) cujos JSONs de ataque ("output_json_path") também são catalogados.'
+  )
+
+  args = parser.parse_args()
+
+  num_metrics = 0
+  for institution in args.institutions:
+    for year in range(args.start_year, args.end_year + 1):
+      metrics_path = resolve_metrics_path(args.metrics_path.format(institution=institution, year=year))
+      if not os.path.exists(metrics_path):
+        continue
+
+      try:
+        record_graph_metrics(args.catalog_path, institution, year, load_metrics(metrics_path, node_metrics=[]))
+        num_metrics += 1
+      except (json.JSONDecodeError, KeyError) as e:
+        print(f"Aviso: métricas de '{metrics_path}' ignoradas: {e}")
+  print(f"Métricas de {num_metrics} grafos registradas em: {args.catalog_path}")
+
+  if args.sweep_spec:
+    try:
+      spec = load_sweep_spec(args.sweep_spec)
+    except FileNotFoundError:
+      print(f"Erro: Especificação da varredura não encontrada em '{args.sweep_spec}'")
+      return
+    except ValueError as e:
+      print(f"Erro na especificação da varredura: {e}")
+      return
+
+    if not spec.get('output_json_path'):
+      print("Aviso: a especificação não tem 'output_json_path'; nenhum ataque catalogado.")
+      return
+
+    num_attacks = 0
+    for institution in spec['institutions']:
+      for year in spec['years']:
+        results = {}
+        for metric in spec['metrics']:
+          for num_hubs in spec['num_hubs']:
+            attack_path = spec['output_json_path'].format(institution=institution, year=year, metric=metric, num_hubs=num_hubs)
+            if os.path.exists(attack_path):
+              with open(attack_path, 'r', encoding='utf-8') as f:
+                results.setdefault(metric, {})[num_hubs] = json.load(f)
+              num_attacks += 1
+
+        if results:
+          record_attack_results(args.catalog_path, institution, year, results)
+    print(f"{num_attacks} ataques registrados em: {args.catalog_path}")
+
+
+if __name__ == "__main__":
+  main()
@@ -1,14 +1,27 @@
 import argparse
 import os
-import csv
-import sys
 import pandas as pd
-import networkx as nx
-from src.network_util import evolution_graphs
+from src.network_util import COAUTHORSHIP_SOURCE_COLUMNS, author_nodes
+from src.temporal_util import build_temporal_index, evolution_snapshots, write_temporal_index
+from src.csv_util import read_openalex_csv, CSV_ENGINES
+from src.graph_store_util import write_graph, open_author_registry, intern_author, GRAPH_STORE_EXTENSION
+
+OUTPUT_FORMATS = {
+  'gexf': ['.gexf'],
+  'binary': [GRAPH_STORE_EXTENSION],
+  'both': ['.gexf', GRAPH_STORE_EXTENSION]
+}
+
+def positive_int(value):
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: '{value}'")
+  return number
+
 
 def main():
   parser = argparse.ArgumentParser(
-    description='Monta um grafo de coautoria em um determinado período de tempo e exporta os dados em formato GEXF.'
+    description='Monta um grafo de coautoria em um determinado período de tempo e exporta os dados em formato GEXF e/ou binário.'
   )
 
   parser.add_argument(
@@ -29,7 +42,15 @@ def main():
     '--output-gexf-path',
     type=str,
     required=True,
-    help='O caminho para o arquivos GEXF de saída com os grafos de coautoria.'
+    help='O caminho para a pasta de saída com os grafos de coautoria.'
+  )
+
+  parser.add_argument(
+    '--output-format',
+    type=str,
+    default='gexf',
+    choices=list(OUTPUT_FORMATS),
+    help='O formato dos grafos de saída: "gexf" (padrão, compatível com o Gephi), "binary" (formato binário mapeável em memória) ou "both".'
   )
 
   parser.add_argument(
@@ -52,8 +73,39 @@ def main():
     default=2024,
     help='O ano de término para a modelagem do grafo por ano (inclusive).'
   )
+
+  parser.add_argument(
+    '--window-size',
+    type=positive_int,
+    default=None,
+    help='Se especificado, o grafo de cada ano considera apenas os trabalhos dos últimos N anos (janela deslizante), em vez de todos os anteriores.'
+  )
+
+  parser.add_argument(
+    '--temporal-index-path',
+    type=str,
+    default=None,
+    help='Se especificado, salva também o índice temporal de coautoria nesse diretório (ex.: "index_uft.temporal"), do qual `temporal_snapshot.py` gera grafos de qualquer intervalo de anos sem reler os CSVs.'
+  )
+
+  parser.add_argument(
+    '--registry-path',
+    type=str,
+    default=None,
+    help='Se especificado, o diretório do registro global de autores (criado se não existir). Os grafos binários e o índice temporal guardam só as chaves inteiras dos autores, com os IDs uma única vez no registro (os atributos continuam em cada grafo).'
+  )
+
+  parser.add_argument(
+    '--csv-engine',
+    type=str,
+    default='c',
+    choices=CSV_ENGINES,
+    help='O parser de CSV do pandas: "c" (padrão, mais rápido) ou "python".'
+  )
   
   args = parser.parse_args()
+  if args.start_year > args.end_year:
+    parser.error(f"--start-year ({args.start_year}) é posterior a --end-year ({args.end_year})")
 
   csv_path_works = args.csv_path_works
   csv_path_authors = args.csv_path_authors
@@ -62,17 +114,26 @@ def main():
   start_year = args.start_year
   end_year = args.end_year
 
-  new_limit = sys.maxsize
-  csv.field_size_limit(new_limit)
-  
   try:
-    df_works = pd.read_csv(csv_path_works, encoding='utf8', engine='python')
+    df_works = read_openalex_csv(csv_path_works, columns=COAUTHORSHIP_SOURCE_COLUMNS, engine=args.csv_engine)
     print(f"DataFrame de trabalhos lido de: {csv_path_works}\n")
     
-    df_authors = pd.read_csv(csv_path_authors, encoding='utf8', engine='python')
+    df_authors = read_openalex_csv(csv_path_authors, engine=args.csv_engine)
     print(f"DataFrame de autores lido de: {csv_path_authors}\n")
     
-    graphs = evolution_graphs(df_works, df_authors, start_year, end_year)
+    temporal_index = build_temporal_index(df_works, author_nodes(df_authors))
+    graphs = evolution_snapshots(temporal_index, start_year, end_year, window_size=args.window_size)
+
+    registry = None
+    if args.registry_path:
+      with open_author_registry(args.registry_path) as registry:
+        for author_id in temporal_index.authors_ids:
+          intern_author(registry, author_id)
+      print(f"Registro de autores atualizado em: {args.registry_path} ({len(registry.authors_ids)} autores)\n")
+
+    if args.temporal_index_path:
+      write_temporal_index(temporal_index, args.temporal_index_path, registry=registry, registry_path=args.registry_path)
+      print(f"Índice temporal salvo em: {args.temporal_index_path}\n")
 
     try:
       output_gexf_dir = os.path.dirname(output_gexf_path)
@@ -84,13 +145,14 @@ def main():
 
       for year, graph in graphs.items():
           if graph:
-              file_name = f"graph_{file_suffix}_{year}.gexf"
-              file_path = os.path.join(output_gexf_path, file_name)
-              nx.write_gexf(graph, file_path)
-              print(f"Grafo do ano {year} salvo em: {file_path}")
+              for extension in OUTPUT_FORMATS[args.output_format]:
+                file_name = f"graph_{file_suffix}_{year}{extension}"
+                file_path = os.path.join(output_gexf_path, file_name)
+                write_graph(graph, file_path, registry=registry, registry_path=args.registry_path)
+                print(f"Grafo do ano {year} salvo em: {file_path}")
           else:
               print(f"Nenhum grafo gerado para o ano {year}. Arquivo não será salvo.")
-      print(f"\nGrafos salvos com sucesso em GEXF: {output_gexf_path}")
+      print(f"\nGrafos salvos com sucesso: {output_gexf_path}")
     except IOError as e:
       print(f"\nErro ao salvar o arquivo GEXF de saída em '{output_gexf_path}': {e}")
     except Exception as e:
@@ -102,6 +164,8 @@ def main():
     print(f"Erro: O arquivo CSV '{e}' está vazio ou contém apenas cabeçalho.")
   except pd.errors.ParserError as e:
     print(f"Erro: Não foi possível analisar o arquivo CSV '{e}'. Verifique o formato. Detalhes: {e}")
+  except ValueError as e:
+    print(f"Erro: {e}")
   except Exception as e:
     print(f"Erro nao especificado. {e}")
 
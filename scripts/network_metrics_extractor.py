@@ -1,39 +1,187 @@
 import argparse
 import os
-import networkx as nx
 import json
-from src.network_util import extract_graph_metrics
+from src.network_util import extract_graph_metrics, METRICS_BACKENDS, GRAPH_METRICS, OPTIONAL_METRICS
+from src.graph_store_util import read_graph, read_csr_graph
+from src.metrics_store_util import METRICS_OUTPUT_FORMATS, load_metrics, metrics_output_paths, write_metrics, export_node_metrics, import_node_metrics
+from src.catalog_util import record_graph_metrics
+
+def positive_int(value):
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: '{value}'")
+  return number
+
+
+def positive_float(value):
+  number = float(value)
+  if not number > 0:
+    raise argparse.ArgumentTypeError(f"deve ser um número positivo: '{value}'")
+  return number
+
 
 def main():
   parser = argparse.ArgumentParser(
-    description='Extrai as métricas de um grafo e salva elas como JSON.'
+    description='Extrai as métricas de um grafo e salva elas no formato escolhido em --output-format (padrão: colunar).'
   )
 
   parser.add_argument(
     '--gexf-path',
+    '--graph-path',
+    dest='gexf_path',
     type=str,
     required=True,
-    help='O caminho para o arquivo GEXF de entrada do grafo.'
+    help='O caminho para o grafo de entrada: arquivo GEXF ou pasta no formato binário.'
   )
 
   parser.add_argument(
     '--output-json-path',
+    '--output-path',
+    dest='output_json_path',
     type=str,
     required=True,
-    help='O caminho para o arquivo JSON de saída com as métricas do grafo.'
+    help='O caminho de saída das métricas do grafo. A extensão (ex.: ".json") é substituída pela do formato de --output-format: ".metrics" no formato colunar (padrão) e ".json" no formato JSON.'
+  )
+
+  parser.add_argument(
+    '--output-format',
+    type=str,
+    default='columnar',
+    choices=list(METRICS_OUTPUT_FORMATS),
+    help='O formato de saída: "columnar" (padrão; métricas por vértice em colunas alinhadas e as demais em um JSON pequeno à parte), "json" (um único JSON, como antes) ou "both".'
+  )
+
+  parser.add_argument(
+    '--backend',
+    type=str,
+    default='networkx',
+    choices=METRICS_BACKENDS,
+    help='O backend usado no cálculo das métricas: "networkx" (padrão) ou "csr" (matrizes esparsas NumPy/SciPy).'
+  )
+
+  parser.add_argument(
+    '--approximate-pivots',
+    type=positive_int,
+    default=None,
+    help='Se especificado, estima as centralidades de intermediação e proximidade e a média da distância geodésica a partir desse número de vértices de origem sorteados.'
+  )
+
+  parser.add_argument(
+    '--approximate-epsilon',
+    type=positive_float,
+    default=None,
+    help='Alternativa a --approximate-pivots: erro absoluto máximo desejado nas centralidades estimadas (positivo).'
+  )
+
+  parser.add_argument(
+    '--seed',
+    type=int,
+    default=42,
+    help='Semente do sorteio dos vértices de origem no modo aproximado.'
+  )
+
+  parser.add_argument(
+    '--workers',
+    type=int,
+    default=1,
+    help='Número de processos usados na varredura BFS da média da distância geodésica e das centralidades de intermediação e proximidade, nos dois backends (dividida por vértice de origem).'
+  )
+
+  parser.add_argument(
+    '--metrics',
+    type=str,
+    nargs='+',
+    default=None,
+    choices=GRAPH_METRICS + OPTIONAL_METRICS,
+    help='As métricas a serem calculadas (separadas por espaço). Padrão: todas, exceto o agrupamento ponderado (veja --weighted-clustering).'
+  )
+
+  parser.add_argument(
+    '--weighted-clustering',
+    action='store_true',
+    help='Se especificado, calcula também o coeficiente de agrupamento ponderado pelo número de trabalhos em coautoria (local e médio).'
+  )
+
+  parser.add_argument(
+    '--cache-dir',
+    type=str,
+    default=None,
+    help='Diretório do cache de métricas. Se especificado, métricas já calculadas para o mesmo grafo e parâmetros são reaproveitadas.'
+  )
+  
+  parser.add_argument(
+    '--eigenvector-warm-start',
+    type=str,
+    default=None,
+    help='Métricas (JSON ou formato colunar) de um grafo anterior da mesma série (ex.: o ano anterior). Sua centralidade de autovetor é usada como ponto de partida do solver, que converge em menos iterações.'
+  )
+  
+  parser.add_argument(
+    '--catalog-path',
+    type=str,
+    default=None,
+    help='Se especificado, o catálogo SQLite de métricas (`catalog_util`) onde as métricas escalares e a distribuição de graus são registradas, por instituição, ano e parâmetros. Exige --institution e --year.'
+  )
+
+  parser.add_argument(
+    '--institution',
+    type=str,
+    default=None,
+    help='A instituição do grafo, usada no catálogo.'
+  )
+
+  parser.add_argument(
+    '--year',
+    type=int,
+    default=None,
+    help='O ano do grafo, usado no catálogo.'
   )
   
   args = parser.parse_args()
 
+  if args.catalog_path and (args.institution is None or args.year is None):
+    parser.error('--catalog-path exige --institution e --year.')
+
   gexf_path = args.gexf_path
   output_json_path = args.output_json_path
+
+  requested_metrics = args.metrics
+  if args.weighted_clustering:
+    requested_metrics = list(dict.fromkeys((requested_metrics or GRAPH_METRICS) + OPTIONAL_METRICS))
   
   try:
-    graph = nx.read_gexf(gexf_path)
+    # O backend "csr" dispensa o grafo NetworkX (no formato binário, o CSR é montado direto dos
+    # vetores, com as chaves inteiras do registro de autores como vértices até a gravação)
+    graph = read_csr_graph(gexf_path, interned=True) if args.backend == 'csr' else read_graph(gexf_path)
     print(f"Grafo lido de: {gexf_path}\n")
     
+    eigenvector_start = None
+    if args.eigenvector_warm_start:
+      try:
+        eigenvector_start = load_metrics(args.eigenvector_warm_start, node_metrics=['eigenvector_centrality']).get('eigenvector_centrality')
+      except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Aviso: ponto de partida da centralidade de autovetor ignorado ('{args.eigenvector_warm_start}'): {e}")
+      if not isinstance(eigenvector_start, dict):
+        eigenvector_start = None
+      else:
+        if args.backend == 'csr':
+          eigenvector_start = import_node_metrics({'eigenvector_centrality': eigenvector_start}, gexf_path)['eigenvector_centrality']
+        print(f"Centralidade de autovetor partindo de: {args.eigenvector_warm_start}\n")
+
     print(f"Iniciando a coleta das métricas")
-    metrics = extract_graph_metrics(graph)
+    metrics = extract_graph_metrics(
+      graph,
+      backend=args.backend,
+      pivots=args.approximate_pivots,
+      epsilon=args.approximate_epsilon,
+      seed=args.seed,
+      workers=args.workers,
+      requested_metrics=requested_metrics,
+      cache_dir=args.cache_dir,
+      eigenvector_start=eigenvector_start
+    )
+    if args.backend == 'csr':
+      metrics = export_node_metrics(metrics, gexf_path)
 
     try:
       output_json_dir = os.path.dirname(output_json_path)
@@ -41,13 +189,19 @@ def main():
         os.makedirs(output_json_dir)
         print(f"Diretório de saída JSON '{output_json_dir}' criado.")
 
-      with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(metrics, f, ensure_ascii=False, indent=4)
-      print(f"\nResultados das métricas salvos com sucesso em JSON: {output_json_path}")
+      for output_path in metrics_output_paths(output_json_path, args.output_format):
+        write_metrics(metrics, output_path)
+        print(f"\nResultados das métricas salvos com sucesso em: {output_path}")
+
+      if args.catalog_path:
+        approximate = args.approximate_pivots is not None or args.approximate_epsilon is not None
+        parameters = {'pivots': args.approximate_pivots, 'epsilon': args.approximate_epsilon, 'seed': args.seed} if approximate else None
+        record_graph_metrics(args.catalog_path, args.institution, args.year, metrics, parameters=parameters)
+        print(f"Métricas registradas no catálogo: {args.catalog_path}")
     except IOError as e:
-      print(f"\nErro ao salvar o arquivo JSON de saída em '{output_json_path}': {e}")
+      print(f"\nErro ao salvar as métricas de saída em '{output_json_path}': {e}")
     except Exception as e:
-      print(f"\nOcorreu um erro inesperado ao salvar o arquivo JSON: {e}")
+      print(f"\nOcorreu um erro inesperado ao salvar as métricas: {e}")
     
   except FileNotFoundError as e:
     print(f"Erro: O arquivo CSV '{e.filename}' não foi encontrado.")
@@ -0,0 +1,85 @@
+import argparse
+from collections import Counter
+from src.pipeline_util import PIPELINE_STAGES, load_pipeline_config, build_pipeline, run_pipeline
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Executa o pipeline completo (autores, grafos, métricas e ataques) das instituições de um arquivo de configuração, pulando as saídas já atualizadas (hash do conteúdo das entradas) e executando instituições e anos independentes em paralelo.'
+  )
+
+  parser.add_argument(
+    '--config',
+    type=str,
+    default='shellscripts/pipeline.json',
+    help='O caminho para o JSON de configuração do pipeline (ver `pipeline_util.load_pipeline_config`).'
+  )
+
+  parser.add_argument(
+    '--processes',
+    type=int,
+    default=1,
+    help='Número máximo de tarefas executadas ao mesmo tempo.'
+  )
+
+  parser.add_argument(
+    '--stages',
+    type=str,
+    nargs='+',
+    default=None,
+    choices=PIPELINE_STAGES,
+    help='As etapas a serem executadas (separadas por espaço). Padrão: as da configuração.'
+  )
+
+  parser.add_argument(
+    '--institutions',
+    type=str,
+    nargs='+',
+    default=None,
+    help='Restringe o pipeline a essas instituições (separadas por espaço). Padrão: as da configuração.'
+  )
+
+  parser.add_argument(
+    '--force',
+    action='store_true',
+    help='Se especificado, executa todas as tarefas, mesmo as que estão atualizadas.'
+  )
+
+  parser.add_argument(
+    '--dry-run',
+    action='store_true',
+    help='Se especificado, apenas mostra as tarefas que seriam executadas.'
+  )
+
+  args = parser.parse_args()
+
+  try:
+    config = load_pipeline_config(args.config, overrides={'stages': args.stages, 'institutions': args.institutions})
+  except FileNotFoundError:
+    print(f"Erro: Configuração do pipeline não encontrada em '{args.config}'")
+    return
+  except ValueError as e:
+    print(f"Erro na configuração do pipeline: {e}")
+    return
+
+  try:
+    tasks = build_pipeline(config)
+    print(f"Pipeline com {len(tasks)} tarefas ({', '.join(config['stages'])}) para: {', '.join(config['institutions'])}\n")
+
+    results = run_pipeline(
+      tasks,
+      config['state_path'],
+      processes=args.processes,
+      force=args.force,
+      dry_run=args.dry_run
+    )
+
+    summary = Counter(results.values())
+    print("\nResumo: " + ", ".join(f"{status}: {count}" for status, count in sorted(summary.items())))
+  except FileNotFoundError as e:
+    print(f"Erro: O arquivo '{e.filename}' não foi encontrado.")
+  except Exception as e:
+    print(f"Erro nao especificado. {e}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,110 @@
+import argparse
+import os
+from src.temporal_util import read_temporal_index, snapshot_graph, evolution_snapshots
+from src.graph_store_util import write_graph
+
+def positive_int(value):
+  number = int(value)
+  if number < 1:
+    raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: '{value}'")
+  return number
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Gera grafos de coautoria a partir de um índice temporal salvo por `network_generator.py --temporal-index-path`, sem reler os CSVs: um intervalo de anos qualquer ou uma série anual (acumulada ou em janela deslizante).'
+  )
+
+  parser.add_argument(
+    '--index-path',
+    type=str,
+    required=True,
+    help='O caminho para o diretório do índice temporal.'
+  )
+
+  parser.add_argument(
+    '--output-path',
+    type=str,
+    required=True,
+    help='Com --series, a pasta de saída dos grafos; sem, o caminho do grafo de saída (".gexf" gera GEXF, qualquer outra extensão gera o formato binário).'
+  )
+
+  parser.add_argument(
+    '--start-year',
+    type=int,
+    default=None,
+    help='O primeiro ano (inclusive). Padrão: desde o primeiro trabalho.'
+  )
+
+  parser.add_argument(
+    '--end-year',
+    type=int,
+    default=None,
+    help='O último ano (inclusive). Padrão: até o último trabalho.'
+  )
+
+  parser.add_argument(
+    '--series',
+    action='store_true',
+    help='Se especificado, gera um grafo por ano de --start-year a --end-year, em vez de um único grafo do intervalo.'
+  )
+
+  parser.add_argument(
+    '--window-size',
+    type=positive_int,
+    default=None,
+    help='Com --series, o grafo de cada ano considera apenas os trabalhos dos últimos N anos (janela deslizante).'
+  )
+
+  parser.add_argument(
+    '--file-suffix',
+    type=str,
+    default='snapshot',
+    help='Com --series, sufixo dos arquivos de saída ("graph_<sufixo>_<ano>").'
+  )
+
+  parser.add_argument(
+    '--extension',
+    type=str,
+    default='.gexf',
+    help='Com --series, a extensão dos grafos de saída: ".gexf" (padrão) ou ".graph" (formato binário).'
+  )
+
+  args = parser.parse_args()
+
+  try:
+    index = read_temporal_index(args.index_path)
+    print(f"Índice temporal lido de: {args.index_path} ({len(index.authors_ids)} autores, {len(index.edge_sources)} arestas)\n")
+  except FileNotFoundError:
+    print(f"Erro: Índice temporal não encontrado em '{args.index_path}'")
+    return
+
+  try:
+    if args.series:
+      start_year = args.start_year if args.start_year is not None else int(index.years[0])
+      end_year = args.end_year if args.end_year is not None else int(index.years[-1])
+      graphs = evolution_snapshots(index, start_year, end_year, window_size=args.window_size)
+
+      os.makedirs(args.output_path, exist_ok=True)
+      for year, graph in graphs.items():
+        file_path = os.path.join(args.output_path, f"graph_{args.file_suffix}_{year}{args.extension}")
+        write_graph(graph, file_path)
+        print(f"Grafo do ano {year} salvo em: {file_path}")
+    else:
+      graph = snapshot_graph(index, args.start_year, args.end_year)
+      output_dir = os.path.dirname(args.output_path)
+      if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+      write_graph(graph, args.output_path)
+      print(f"Grafo com {graph.number_of_nodes()} vértices e {graph.number_of_edges()} arestas salvo em: {args.output_path}")
+  except IOError as e:
+    print(f"\nErro ao salvar os grafos em '{args.output_path}': {e}")
+  except ValueError as e:
+    print(f"Erro: {e}")
+  except Exception as e:
+    print(f"Erro nao especificado. {e}")
+
+
+if __name__ == "__main__":
+  main()
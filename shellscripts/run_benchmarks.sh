@@ -0,0 +1,60 @@
+CONDA_ENV_NAME="networks_tocantins"
+
+PYTHON_SCRIPT="scripts/benchmark_runner.py"
+
+RESULTS_PATH="results/benchmarks/benchmarks.jsonl"
+
+# Todos os estágios nas bases menores; nas maiores, apenas as implementações vetorizadas
+# (os grafos anuais do NetworkX de evolution_graphs não cabem na memória nessas bases)
+SMALL_SIZES="10000 100000"
+LARGE_SIZES="1000000 5000000"
+LARGE_STAGES="read_openalex_csv extract_authors_table generate_coauthorship_graph_sparse extract_graph_metrics"
+# Sem a média da distância geodésica, que exige as distâncias entre todos os pares de vértices
+LARGE_METRICS="num_nodes num_edges largest_connected_component_size degrees average_degree degree_distribution local_clustering_coefficient average_clustering_coefficient betweenness_centrality closeness_centrality eigenvector_centrality degree_assortativity_coefficient"
+
+if ! command -v conda &> /dev/null
+then
+    echo "Erro: Conda não encontrado. Por favor, certifique-se de que o Conda esteja instalado e no seu PATH."
+    exit 1
+fi
+
+echo "Ativando o ambiente Conda: $CONDA_ENV_NAME..."
+source "$(conda info --base)/etc/profile.d/conda.sh" 
+conda activate "$CONDA_ENV_NAME"
+
+if [ $? -ne 0 ]; then
+    echo "Erro: Não foi possível ativar o ambiente Conda '$CONDA_ENV_NAME'. Verifique se ele existe."
+    exit 1
+fi
+
+echo "Verificando e instalando o pacote 'src'..."
+pip install -e .
+
+if [ $? -ne 0 ]; then
+    echo "Erro: Falha ao instalar o pacote 'src' com 'pip install -e .'."
+    exit 1
+fi
+
+echo "Ambiente $CONDA_ENV_NAME ativado e 'src' instalado."
+
+
+echo "Medindo todos os estágios nas bases com $SMALL_SIZES trabalhos..."
+python "$PYTHON_SCRIPT" --sizes $SMALL_SIZES --results-path "$RESULTS_PATH"
+
+if [ $? -ne 0 ]; then
+    echo "Erro ao medir as bases menores. O script Python retornou um erro."
+fi
+echo "----------------------------------------------------"
+
+echo "Medindo os estágios vetorizados nas bases com $LARGE_SIZES trabalhos..."
+python "$PYTHON_SCRIPT" --sizes $LARGE_SIZES --stages $LARGE_STAGES --metrics $LARGE_METRICS --results-path "$RESULTS_PATH"
+
+if [ $? -ne 0 ]; then
+    echo "Erro ao medir as bases maiores. O script Python retornou um erro."
+fi
+echo "----------------------------------------------------"
+
+echo "Desativando o ambiente Conda..."
+conda deactivate
+
+echo "Script concluído."
@@ -8,6 +8,9 @@ OUTPUT_GEXF_BASE_DIR="results/graphs"
 
 DEFAULT_FILE_SUFFIX="geral"
 
+# Formato dos grafos de saída: "gexf", "binary" ou "both"
+OUTPUT_FORMAT="both"
+
 START_YEAR=1998
 END_YEAR=2024
 
@@ -67,8 +70,10 @@ for works_csv_path in "$DATA_DIR"/works_*.csv; do
       --csv-path-authors "$authors_csv_path" \
       --output-gexf-path "$CURRENT_OUTPUT_GEXF_DIR/" \
       --file-suffix "$file_suffix" \
+      --output-format "$OUTPUT_FORMAT" \
       --start-year "$START_YEAR" \
-      --end-year "$END_YEAR"
+      --end-year "$END_YEAR" \
+      --temporal-index-path "$CURRENT_OUTPUT_GEXF_DIR/index_${file_suffix}.temporal"
 
     if [ $? -ne 0 ]; then
       echo "Erro ao processar $works_csv_path e $authors_csv_path. O script Python retornou um erro."
@@ -47,15 +47,28 @@ for institution in "${institutions[@]}"; do
 
     # Define os caminhos de entrada e saída para o grafo GEXF e as métricas JSON
     gexf_path="results/graphs/${institution}/graph_${institution}_${year}.gexf"
+    # Usa o formato binário, se disponível
+    if [ -f "results/graphs/${institution}/graph_${institution}_${year}.graph/meta.json" ]; then
+      gexf_path="results/graphs/${institution}/graph_${institution}_${year}.graph"
+    fi
+    # Métricas por vértice em formato colunar ("results/metrics/.../<instituição>_<ano>.metrics")
     output_json_path="results/metrics/${institution}/${institution}_${year}.json"
     
     # Verifica se o arquivo GEXF existe antes de tentar processá-lo
-    if [ -f "$gexf_path" ]; then
+    if [ -e "$gexf_path" ]; then
       echo "    Executando network_metrics_extractor.py para ${institution} - ${year}..."
       
+      # A centralidade de autovetor do ano anterior, se já calculada, serve de ponto de partida
+      previous_json_path="results/metrics/${institution}/${institution}_$((year - 1)).json"
+      warm_start_args=()
+      if [ -f "$previous_json_path" ] || [ -f "results/metrics/${institution}/${institution}_$((year - 1)).metrics/summary.json" ]; then
+        warm_start_args=(--eigenvector-warm-start "$previous_json_path")
+      fi
+
       # Executa o script network_metrics_extractor.py com os caminhos definidos
       # Certifique-se de que o caminho para network_metrics_extractor.py está correto
-      python scripts/network_metrics_extractor.py --gexf-path "$gexf_path" --output-json-path "$output_json_path"
+      python scripts/network_metrics_extractor.py --graph-path "$gexf_path" --output-json-path "$output_json_path" --output-format columnar \
+        --catalog-path "results/metrics/catalog.sqlite" --institution "$institution" --year "$year" "${warm_start_args[@]}"
       
       if [ $? -eq 0 ]; then
         echo "    Análise para ${institution} - ${year} concluída com sucesso."
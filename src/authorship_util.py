@@ -1,5 +1,6 @@
 import pandas as pd
 from src.json_resolver import json_string_to_dict
+from src.institutions_util import new_institution_table, intern_institution
 
 def extract_authors(df: pd.DataFrame) -> set:
   """
@@ -76,6 +77,101 @@ def extract_authors(df: pd.DataFrame) -> set:
 
   return authors_set
 
+AUTHORS_TABLE_COLUMNS = [
+  'id',
+  'display_name',
+  'orcid',
+  'country',
+  'raw_author_name',
+  'institution_id',
+  'institution_display_name',
+  'institution_country_code'
+]
+
+_AUTHORSHIP_COLUMNS = {
+  'raw_author_name': 'authorships.raw_author_name',
+  'id': 'authorships.author.id',
+  'display_name': 'authorships.author.display_name',
+  'orcid': 'authorships.author.orcid',
+  'country': 'authorships.countries',
+  'institutions': 'authorships.institutions'
+}
+
+AUTHORSHIP_SOURCE_COLUMNS = list(_AUTHORSHIP_COLUMNS.values())
+
+_INSTITUTION_COLUMNS = {
+  'institution_id': 'ids',
+  'institution_display_name': 'display_names',
+  'institution_country_code': 'country_codes'
+}
+
+
+def _explode_authorships(df: pd.DataFrame) -> pd.DataFrame:
+  """
+  Separa as colunas 'authorships.*' de uma só vez e alinha os valores pela posição
+  do autor dentro de cada trabalho.
+
+  Args:
+    df (pd.DataFrame): O DataFrame contendo os dados dos trabalhos.
+
+  Returns:
+    pd.DataFrame: Um DataFrame indexado por (linha do trabalho, posição do autor), com
+      uma coluna por campo de autoria. Posições ausentes em algum campo ficam nulas.
+  """
+  exploded_columns = {}
+
+  for field, column in _AUTHORSHIP_COLUMNS.items():
+    if column not in df.columns:
+      continue
+
+    values = df[column].reset_index(drop=True).dropna().astype(str).str.split('|').explode()
+    positions = values.groupby(level=0).cumcount()
+    values.index = pd.MultiIndex.from_arrays([values.index, positions], names=['work', 'position'])
+    exploded_columns[field] = values
+
+  if not exploded_columns:
+    return pd.DataFrame(columns=list(_AUTHORSHIP_COLUMNS))
+
+  authorships = pd.concat(exploded_columns, axis=1).sort_index()
+  return authorships.reindex(columns=list(_AUTHORSHIP_COLUMNS))
+
+
+def extract_authors_table(df: pd.DataFrame, institution_table=None) -> pd.DataFrame:
+  """
+  Versão colunar de `extract_authors`. As colunas 'authorships.*' são separadas em bloco,
+  alinhadas pela posição do autor e deduplicadas pelo ID do autor, mantendo a primeira
+  ocorrência na ordem do DataFrame.
+
+  Args:
+    df (pd.DataFrame): O DataFrame contendo os dados dos trabalhos.
+    institution_table (InstitutionTable): Tabela de instituições (`institutions_util`) a ser
+      reaproveitada entre chamadas, por exemplo entre os blocos de um CSV. Padrão: uma tabela nova.
+
+  Returns:
+    pd.DataFrame: Uma tabela com um autor por linha e as colunas de `AUTHORS_TABLE_COLUMNS`
+      (tipo 'string'). Campos ausentes ficam nulos. O conteúdo é o mesmo retornado por
+      `extract_authors` para a mesma entrada.
+  """
+  authorships = _explode_authorships(df)
+  authorships = authorships.mask(authorships == 'None')
+
+  authorships = authorships[authorships['id'].notna() & (authorships['id'] != '')]
+  authorships = authorships.drop_duplicates(subset='id', keep='first')
+
+  institutions = authorships['institutions'].astype(object).str.strip()
+  institutions = institutions[institutions.notna() & (institutions != '') & (institutions != 'None')]
+
+  if institution_table is None:
+    institution_table = new_institution_table()
+  codes = institutions.map({inst_str: intern_institution(institution_table, inst_str) for inst_str in institutions.unique()})
+
+  for column, table_column in _INSTITUTION_COLUMNS.items():
+    authorships[column] = codes.map(pd.Series(getattr(institution_table, table_column), dtype=object))
+
+  authors_table = authorships.reindex(columns=AUTHORS_TABLE_COLUMNS).reset_index(drop=True)
+  return authors_table.astype('string')
+
+
 def extract_authors_ids(df: pd.DataFrame) -> set:
   """
   Extrai os IDS de autores de um DataFrame e retorna um set de autores únicos.
@@ -86,10 +182,8 @@ def extract_authors_ids(df: pd.DataFrame) -> set:
   Returns:
     set: Um set de ids.
   """
-  authors_set_ids = set()
-
-  for _, row in df.iterrows():
-    authors_ids = row.get('authorships.author.id', '').split('|') if pd.notna(row.get('authorships.author.id')) else []
-    authors_set_ids.update(authors_ids)
+  if 'authorships.author.id' not in df.columns:
+    return set()
 
-  return authors_set_ids
\ No newline at end of file
+  authors_ids = df['authorships.author.id'].dropna().astype(str).str.split('|').explode()
+  return set(authors_ids)
@@ -0,0 +1,307 @@
+import gc
+import json
+import platform
+import resource
+import subprocess
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy
+from src.authorship_util import extract_authors, extract_authors_table, AUTHORSHIP_SOURCE_COLUMNS
+from src.csv_util import read_openalex_csv
+from src.network_util import (
+  COAUTHORSHIP_SOURCE_COLUMNS, generate_coauthorship_graph, generate_coauthorship_graph_sparse, evolution_graphs,
+  extract_graph_metrics, identify_hubs, analyze_network_attack
+)
+
+BenchmarkStage = namedtuple('BenchmarkStage', ['function', 'requires', 'provides'])
+
+BENCHMARK_DEFAULTS = {
+  'start_year': 1998,
+  'end_year': 2024,
+  'window_size': None,
+  'metrics_backend': 'csr',
+  'pivots': 256,
+  'metrics': None,
+  'seed': 0,
+  'workers': 1,
+  'num_hubs': 10
+}
+
+REGRESSION_THRESHOLD = 0.2
+
+
+def _read_works(context, options):
+  return read_openalex_csv(context['csv_path'], columns=AUTHORSHIP_SOURCE_COLUMNS + COAUTHORSHIP_SOURCE_COLUMNS)
+
+
+def _evolution_graphs(context, options):
+  return evolution_graphs(
+    context['works'], context['authors'], options['start_year'], options['end_year'], window_size=options['window_size']
+  )
+
+
+def _extract_graph_metrics(context, options):
+  return extract_graph_metrics(
+    context['graph'], backend=options['metrics_backend'], pivots=options['pivots'] or None, seed=options['seed'],
+    workers=options['workers'], requested_metrics=options['metrics']
+  )
+
+
+def _analyze_network_attack(context, options):
+  hubs = identify_hubs(dict(context['graph'].degree()), top_n=options['num_hubs'])
+  return analyze_network_attack(context['graph'], hubs, workers=options['workers'])
+
+
+BENCHMARK_STAGES = {
+  'read_openalex_csv': BenchmarkStage(_read_works, [], 'works'),
+  'extract_authors': BenchmarkStage(lambda context, options: extract_authors(context['works']), ['works'], None),
+  'extract_authors_table': BenchmarkStage(lambda context, options: extract_authors_table(context['works']), ['works'], 'authors'),
+  'generate_coauthorship_graph': BenchmarkStage(
+    lambda context, options: generate_coauthorship_graph(context['works'], context['authors']), ['works', 'authors'], 'graph'
+  ),
+  'generate_coauthorship_graph_sparse': BenchmarkStage(
+    lambda context, options: generate_coauthorship_graph_sparse(context['works'], context['authors']), ['works', 'authors'], 'graph'
+  ),
+  'evolution_graphs': BenchmarkStage(_evolution_graphs, ['works', 'authors'], None),
+  'extract_graph_metrics': BenchmarkStage(_extract_graph_metrics, ['graph'], None),
+  'analyze_network_attack': BenchmarkStage(_analyze_network_attack, ['graph'], None)
+}
+
+# O estágio que produz cada entrada quando o estágio que a usa é medido sem ele
+_PROVIDERS = {'works': 'read_openalex_csv', 'authors': 'extract_authors_table', 'graph': 'generate_coauthorship_graph_sparse'}
+
+
+def _git_output(*arguments):
+  try:
+    completed = subprocess.run(['git', *arguments], capture_output=True, text=True, check=True)
+  except (OSError, subprocess.CalledProcessError):
+    return None
+  return completed.stdout.strip()
+
+
+def environment_info():
+  """
+  Identifica a versão do código e do ambiente em que a medição foi feita.
+
+  Returns:
+    dict: O commit atual ('commit', None fora de um repositório git), se há alterações não
+    commitadas nos arquivos versionados ('dirty') e as versões do Python e das bibliotecas.
+  """
+  status = _git_output('status', '--porcelain', '--untracked-files=no')
+  return {
+    'commit': _git_output('rev-parse', 'HEAD'),
+    'dirty': bool(status) if status is not None else None,
+    'python': platform.python_version(),
+    'numpy': np.__version__,
+    'pandas': pd.__version__,
+    'networkx': nx.__version__,
+    'scipy': scipy.__version__
+  }
+
+
+def _max_rss_mb():
+  """O pico de memória residente do processo até agora, em MB (`ru_maxrss` é dado em KB no Linux)."""
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(function, repeat=1, memory=True):
+  """
+  Mede o tempo e o pico de memória de uma chamada.
+
+  O tempo é o menor de `repeat` execuções sem rastreamento de memória. O pico de memória vem
+  de uma execução a mais com o `tracemalloc` ligado, que conta as alocações do Python e dos
+  arrays do NumPy (e, portanto, do pandas e do SciPy), mas deixa o código mais lento; por
+  isso ela não entra no tempo.
+
+  Args:
+    function (callable): A função, sem argumentos.
+    repeat (int): O número de execuções cronometradas.
+    memory (bool): Se falso, o pico de memória não é medido.
+
+  Returns:
+    tuple: (resultado da última execução, lista dos tempos em segundos, pico de memória
+      alocada em MB ou None).
+  """
+  seconds = []
+  for _ in range(repeat):
+    result = None
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    seconds.append(time.perf_counter() - start)
+
+  peak_memory_mb = None
+  if memory:
+    result = None
+    gc.collect()
+    tracemalloc.start()
+    try:
+      result = function()
+      peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+      tracemalloc.stop()
+
+  return result, seconds, peak_memory_mb
+
+
+def run_benchmark(csv_path, stages=None, repeat=1, memory=True, options=None, dataset=None):
+  """
+  Mede cada estágio da análise sobre um CSV de trabalhos.
+
+  Os estágios são executados na ordem de `BENCHMARK_STAGES`, e a saída de um estágio é a
+  entrada dos seguintes (trabalhos, autores e grafo de coautoria). Se uma entrada não vem de
+  nenhum dos estágios escolhidos, ela é calculada antes, fora da medição.
+
+  Args:
+    csv_path (str): O caminho do CSV de trabalhos no formato do OpenAlex.
+    stages (list): Os estágios (chaves de `BENCHMARK_STAGES`). Padrão: todos.
+    repeat (int): O número de execuções cronometradas de cada estágio.
+    memory (bool): Se verdadeiro, mede também o pico de memória de cada estágio (`measure`).
+    options (dict): Os parâmetros dos estágios (chaves de `BENCHMARK_DEFAULTS`).
+    dataset (dict): A descrição da base medida (ex.: número de trabalhos e semente), copiada
+      para cada resultado.
+
+  Returns:
+    list: Um dicionário por estágio, com o estágio, os tempos ('seconds' é o menor deles), o
+    pico de memória alocada ('peak_memory_mb'), o pico de memória residente do processo até
+    o fim do estágio ('max_rss_mb'), os parâmetros, a base e o ambiente (`environment_info`).
+  """
+  stages = list(BENCHMARK_STAGES) if stages is None else [stage for stage in BENCHMARK_STAGES if stage in stages]
+  options = {**BENCHMARK_DEFAULTS, **(options or {})}
+  environment = environment_info()
+  timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+  context = {'csv_path': csv_path}
+  results = []
+
+  def prepare(requirements):
+    for requirement in requirements:
+      if requirement not in context:
+        provider = BENCHMARK_STAGES[_PROVIDERS[requirement]]
+        prepare(provider.requires)
+        context[requirement] = provider.function(context, options)
+
+  for stage_name in stages:
+    stage = BENCHMARK_STAGES[stage_name]
+    prepare(stage.requires)
+
+    print(f"Medindo '{stage_name}'...")
+    output, seconds, peak_memory_mb = measure(lambda: stage.function(context, options), repeat=repeat, memory=memory)
+    if stage.provides:
+      context[stage.provides] = output
+    del output
+
+    results.append({
+      'timestamp': timestamp,
+      'stage': stage_name,
+      'seconds': min(seconds),
+      'runs': seconds,
+      'peak_memory_mb': peak_memory_mb,
+      'max_rss_mb': _max_rss_mb(),
+      'parameters': options,
+      'dataset': dict(dataset or {}),
+      'environment': environment
+    })
+    print(f"  {min(seconds):.3f} s" + (f", pico de {peak_memory_mb:.1f} MB" if peak_memory_mb is not None else ''))
+
+  return results
+
+
+def append_benchmark_results(results_path, results):
+  """Acrescenta os resultados (`run_benchmark`) ao arquivo de resultados, um JSON por linha."""
+  with open(results_path, 'a', encoding='utf-8') as f:
+    for result in results:
+      f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def load_benchmark_results(results_path):
+  """
+  Lê o arquivo de resultados das medições.
+
+  Args:
+    results_path (str): O caminho do arquivo (`append_benchmark_results`).
+
+  Returns:
+    pd.DataFrame: Uma linha por estágio medido, com as colunas dos resultados, as chaves de
+    'dataset' e 'environment' como colunas próprias (ex.: 'num_works' e 'commit'), a base e
+    os parâmetros também como JSONs de chaves ordenadas ('dataset' e 'parameters') e a
+    versão do código ('version': o commit, com o sufixo '+dirty' se havia alterações não
+    commitadas).
+  """
+  with open(results_path, 'r', encoding='utf-8') as f:
+    records = [json.loads(line) for line in f if line.strip()]
+
+  rows = [
+    {
+      **{name: value for name, value in record.items() if name not in ['dataset', 'environment', 'parameters']},
+      **record['dataset'],
+      **record['environment'],
+      'dataset': json.dumps(record['dataset'], sort_keys=True),
+      'parameters': json.dumps(record['parameters'], sort_keys=True)
+    }
+    for record in records
+  ]
+  results = pd.DataFrame(rows)
+  if not results.empty:
+    results['version'] = [
+      f"{commit}+dirty" if dirty and commit else commit
+      for commit, dirty in zip(results['commit'], results['dirty'])
+    ]
+  return results
+
+
+def compare_benchmarks(results, baseline=None, current=None, threshold=REGRESSION_THRESHOLD):
+  """
+  Compara as medições de duas versões do código, estágio a estágio, para as mesmas bases e
+  os mesmos parâmetros.
+
+  Args:
+    results (pd.DataFrame): Os resultados (`load_benchmark_results`).
+    baseline (str): A versão (ou prefixo do commit) de referência. Padrão: a última versão
+      medida antes de `current`.
+    current (str): A versão (ou prefixo do commit) avaliada. Padrão: a última medida.
+    threshold (float): O aumento relativo de tempo ou de memória a partir do qual a medição é
+      marcada como regressão (0.2 = 20%).
+
+  Returns:
+    pd.DataFrame: Uma linha por base, parâmetros e estágio, com o tempo e a memória de cada
+    versão (a última medição de cada uma), as razões atual/referência e a coluna booleana
+    'regression'. As versões comparadas ficam em `attrs`. Vazio se não houver duas versões
+    para comparar.
+  """
+  results = results.sort_values('timestamp', kind='stable')
+  versions = list(dict.fromkeys(results['version'].dropna()))
+
+  def resolve(prefix):
+    matches = [version for version in versions if version.startswith(prefix)]
+    if not matches:
+      raise ValueError(f"Nenhuma medição da versão '{prefix}'")
+    return matches[-1]
+
+  current = resolve(current) if current is not None else (versions[-1] if versions else None)
+  if baseline is not None:
+    baseline = resolve(baseline)
+  elif current is not None and versions.index(current) > 0:
+    baseline = versions[versions.index(current) - 1]
+
+  if current is None or baseline is None:
+    return pd.DataFrame()
+
+  keys = ['dataset', 'parameters', 'stage']
+  columns = keys + ['seconds', 'peak_memory_mb']
+  latest = results.drop_duplicates(subset=keys + ['version'], keep='last')
+  comparison = latest[latest['version'] == baseline][columns].merge(
+    latest[latest['version'] == current][columns], on=keys, suffixes=('_baseline', '_current')
+  )
+
+  comparison['time_ratio'] = comparison['seconds_current'] / comparison['seconds_baseline']
+  comparison['memory_ratio'] = comparison['peak_memory_mb_current'] / comparison['peak_memory_mb_baseline']
+  comparison['regression'] = (comparison['time_ratio'] > 1 + threshold) | (comparison['memory_ratio'] > 1 + threshold)
+  comparison = comparison.set_index(keys)
+  comparison.attrs.update({'baseline': baseline, 'current': current})
+  return comparison
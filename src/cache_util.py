@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import numpy as np
+from src.csr_util import CSRGraph, to_csr
+
+# Retornado por `load_cached_metric` quando a métrica não está no cache (None é um valor válido)
+CACHE_MISS = object()
+
+
+def graph_content_hash(graph):
+  """
+  Calcula um hash do conteúdo de um grafo: IDs dos vértices (na ordem do grafo),
+  arestas e pesos. Atributos dos vértices não entram no hash, pois não alteram as métricas.
+
+  Args:
+    graph (nx.Graph ou CSRGraph): O grafo NetworkX ou em CSR.
+
+  Returns:
+    str: O hash SHA-256 em hexadecimal.
+  """
+  csr_graph = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+  digest = hashlib.sha256()
+
+  for node_id in csr_graph.node_ids:
+    digest.update(str(node_id).encode('utf-8'))
+    digest.update(b'\0')
+
+  adjacency = csr_graph.adjacency
+  for array, dtype in ((adjacency.indptr, np.int64), (adjacency.indices, np.int64), (adjacency.data, np.float64)):
+    digest.update(np.ascontiguousarray(array, dtype=dtype).tobytes())
+
+  return digest.hexdigest()
+
+
+def parameters_hash(parameters):
+  """
+  Calcula um hash curto e estável para um dicionário de parâmetros.
+
+  Args:
+    parameters (dict): Parâmetros serializáveis em JSON.
+
+  Returns:
+    str: Os 16 primeiros caracteres do hash SHA-256 do JSON ordenado.
+  """
+  serialized = json.dumps(parameters, sort_keys=True, ensure_ascii=False)
+  return hashlib.sha256(serialized.encode('utf-8')).hexdigest()[:16]
+
+
+def metric_cache_path(cache_dir, graph_hash, metric, parameters):
+  """
+  Monta o caminho do arquivo de cache de uma métrica:
+  `<cache_dir>/<hash do grafo>/<métrica>_<hash dos parâmetros>.json`.
+  """
+  return os.path.join(cache_dir, graph_hash, f"{metric}_{parameters_hash(parameters)}.json")
+
+
+def load_cached_value(cache_path, default=None):
+  """
+  Lê o valor gravado por `store_cached_value`.
+
+  Args:
+    cache_path (str): O caminho do arquivo de cache.
+    default: O valor retornado se o arquivo não existir ou for inválido.
+
+  Returns:
+    O valor, ou `default` se o arquivo não existir ou for inválido.
+  """
+  if not os.path.exists(cache_path):
+    return default
+
+  try:
+    with open(cache_path, 'r', encoding='utf-8') as f:
+      return json.load(f)['value']
+  except (json.JSONDecodeError, KeyError) as e:
+    print(f"Aviso: arquivo de cache inválido '{cache_path}' ignorado: {e}")
+    return default
+
+
+def store_cached_value(cache_path, record):
+  """
+  Grava um registro de cache (um dicionário com a chave 'value') de forma atômica: o JSON
+  é escrito em um arquivo temporário e renomeado, então leitores concorrentes nunca veem um
+  arquivo pela metade.
+  """
+  os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+  temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+  with open(temporary_path, 'w', encoding='utf-8') as f:
+    json.dump(record, f, ensure_ascii=False)
+  os.replace(temporary_path, cache_path)
+
+
+def load_cached_metric(cache_dir, graph_hash, metric, parameters):
+  """
+  Lê o valor de uma métrica do cache.
+
+  Args:
+    cache_dir (str): O diretório do cache.
+    graph_hash (str): O hash do conteúdo do grafo (`graph_content_hash`).
+    metric (str): O nome da métrica.
+    parameters (dict): Os parâmetros que alteram o resultado da métrica.
+
+  Returns:
+    O valor da métrica (que pode ser None, como o menor caminho médio de um grafo sem arestas),
+    ou `CACHE_MISS` se não estiver no cache. As chaves de 'degree_distribution' voltam a ser inteiras.
+  """
+  value = load_cached_value(metric_cache_path(cache_dir, graph_hash, metric, parameters), default=CACHE_MISS)
+
+  if value is not CACHE_MISS and metric == 'degree_distribution':
+    value = {int(degree): count for degree, count in value.items()}
+  return value
+
+
+def store_cached_metric(cache_dir, graph_hash, metric, parameters, value):
+  """
+  Grava o valor de uma métrica no cache, junto com os parâmetros usados.
+
+  Args:
+    cache_dir (str): O diretório do cache.
+    graph_hash (str): O hash do conteúdo do grafo (`graph_content_hash`).
+    metric (str): O nome da métrica.
+    parameters (dict): Os parâmetros que alteram o resultado da métrica.
+    value: O valor da métrica (serializável em JSON).
+  """
+  store_cached_value(
+    metric_cache_path(cache_dir, graph_hash, metric, parameters),
+    {'metric': metric, 'parameters': parameters, 'value': value}
+  )
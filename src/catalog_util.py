@@ -0,0 +1,248 @@
+import json
+import numbers
+import os
+import sqlite3
+import pandas as pd
+from src.metrics_store_util import NODE_METRICS
+
+CATALOG_TIMEOUT = 60
+
+CATALOG_SCHEMA = [
+  """CREATE TABLE IF NOT EXISTS graph_metrics (
+    institution TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (institution, year, parameters, metric)
+  )""",
+  "CREATE INDEX IF NOT EXISTS graph_metrics_by_metric ON graph_metrics (metric, year)",
+  """CREATE TABLE IF NOT EXISTS degree_distributions (
+    institution TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    degree INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (institution, year, parameters, degree)
+  )""",
+  """CREATE TABLE IF NOT EXISTS attack_results (
+    institution TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    num_hubs INTEGER NOT NULL,
+    parameters TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (institution, year, metric, num_hubs, parameters, quantity)
+  )""",
+  "CREATE INDEX IF NOT EXISTS attack_results_by_quantity ON attack_results (quantity, metric, num_hubs)"
+]
+
+
+def connect_catalog(catalog_path):
+  """
+  Abre (ou cria) o catálogo de métricas, um banco SQLite com as tabelas:
+
+    - 'graph_metrics': as métricas escalares de cada grafo (uma linha por métrica; métricas
+      aninhadas como 'centrality_sampling' viram nomes com ponto, ex.: 'centrality_sampling.pivots').
+    - 'degree_distributions': a distribuição de graus de cada grafo (uma linha por grau).
+    - 'attack_results': os resultados dos ataques a hubs (uma linha por grandeza, ex.:
+      'after_attack.global_efficiency' ou 'impact.lcc_size_reduction_percent').
+
+  As linhas são identificadas pela instituição, pelo ano e pelos parâmetros do cálculo
+  (um JSON com as chaves ordenadas; '{}' para as métricas exatas). O banco usa o modo WAL,
+  então vários processos podem gravar nele ao mesmo tempo.
+
+  Args:
+    catalog_path (str): O caminho do arquivo SQLite.
+
+  Returns:
+    sqlite3.Connection: A conexão.
+  """
+  catalog_dir = os.path.dirname(catalog_path)
+  if catalog_dir:
+    os.makedirs(catalog_dir, exist_ok=True)
+
+  connection = sqlite3.connect(catalog_path, timeout=CATALOG_TIMEOUT)
+  connection.execute('PRAGMA journal_mode=WAL')
+  for statement in CATALOG_SCHEMA:
+    connection.execute(statement)
+  return connection
+
+
+def _parameters_key(parameters):
+  return json.dumps(parameters or {}, sort_keys=True)
+
+
+def _scalar_values(values, prefix=''):
+  """Achata dicionários aninhados em pares (nome com ponto, valor numérico ou None)."""
+  for name, value in values.items():
+    if isinstance(value, dict):
+      yield from _scalar_values(value, f"{prefix}{name}.")
+    elif isinstance(value, numbers.Real) and not isinstance(value, bool):
+      yield f"{prefix}{name}", float(value)
+    elif not isinstance(value, (list, tuple)):
+      yield f"{prefix}{name}", None
+
+
+def record_graph_metrics(catalog_path, institution, year, metrics, parameters=None):
+  """
+  Grava no catálogo as métricas escalares e a distribuição de graus de um grafo. As métricas
+  por vértice não são catalogadas (ficam nos arquivos de métricas), e valores não numéricos
+  (ex.: "Could not converge") são gravados como NULL.
+
+  Args:
+    catalog_path (str): O caminho do catálogo.
+    institution (str): A instituição.
+    year (int): O ano.
+    metrics (dict): As métricas (`network_util.extract_graph_metrics`).
+    parameters (dict): Os parâmetros do cálculo (ex.: pivôs e semente do modo aproximado).
+  """
+  key = (institution, int(year), _parameters_key(parameters))
+  scalar_metrics = {
+    metric: value for metric, value in metrics.items()
+    if metric != 'degree_distribution' and not (metric in NODE_METRICS and isinstance(value, dict))
+  }
+
+  with connect_catalog(catalog_path) as connection:
+    connection.executemany(
+      "INSERT OR REPLACE INTO graph_metrics VALUES (?, ?, ?, ?, ?)",
+      [key + (metric, value) for metric, value in _scalar_values(scalar_metrics)]
+    )
+
+    if 'degree_distribution' in metrics:
+      connection.execute("DELETE FROM degree_distributions WHERE institution = ? AND year = ? AND parameters = ?", key)
+      connection.executemany(
+        "INSERT INTO degree_distributions VALUES (?, ?, ?, ?, ?)",
+        [key + (int(degree), int(count)) for degree, count in metrics['degree_distribution'].items()]
+      )
+  connection.close()
+
+
+def record_attack_results(catalog_path, institution, year, attack_results, parameters=None):
+  """
+  Grava no catálogo os resultados dos ataques a hubs de um grafo.
+
+  Args:
+    catalog_path (str): O caminho do catálogo.
+    institution (str): A instituição.
+    year (int): O ano.
+    attack_results (dict): Dicionário `{métrica: {quantidade de hubs: resultado}}`
+      (`robustness_util.hub_attack_results`).
+    parameters (dict): Os parâmetros do ataque além da métrica e da quantidade de hubs.
+      Padrão: o escopo da análise e, se houver, as informações do ataque adaptativo e da
+      amostragem das centralidades, lidos de 'hubs_removed_info'.
+  """
+  rows = []
+  for metric, results_by_hubs in attack_results.items():
+    for num_hubs, result in results_by_hubs.items():
+      if parameters is None:
+        info = result.get('hubs_removed_info', {})
+        attack_parameters = {name: info[name] for name in ['analysis_scope', 'adaptive', 'centrality_sampling'] if name in info}
+      else:
+        attack_parameters = parameters
+
+      values = {section: result[section] for section in ['before_attack', 'after_attack', 'impact'] if section in result}
+      rows += [
+        (institution, int(year), metric, int(num_hubs), _parameters_key(attack_parameters), quantity, value)
+        for quantity, value in _scalar_values(values)
+      ]
+
+  with connect_catalog(catalog_path) as connection:
+    connection.executemany("INSERT OR REPLACE INTO attack_results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+  connection.close()
+
+
+def _filters(**columns):
+  """Monta a cláusula WHERE para as colunas com valores (listas ou valor único)."""
+  clauses, values = [], []
+  for column, selected in columns.items():
+    if selected is None:
+      continue
+    selected = list(selected) if isinstance(selected, (list, tuple, set)) else [selected]
+    clauses.append(f"{column} IN ({', '.join('?' * len(selected))})")
+    values += selected
+  return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), values
+
+
+def _query(catalog_path, query, values):
+  if not os.path.exists(catalog_path):
+    raise FileNotFoundError(2, 'Catálogo de métricas não encontrado', catalog_path)
+  with sqlite3.connect(catalog_path, timeout=CATALOG_TIMEOUT) as connection:
+    data = pd.read_sql_query(query, connection, params=values)
+  connection.close()
+  return data
+
+
+def query_graph_metrics(catalog_path, metrics=None, institutions=None, years=None, parameters=None, all_parameters=False):
+  """
+  Consulta as métricas escalares de vários grafos de uma vez.
+
+  Args:
+    catalog_path (str): O caminho do catálogo.
+    metrics (list): As métricas desejadas. Padrão: todas.
+    institutions (list): As instituições. Padrão: todas.
+    years (list): Os anos. Padrão: todos.
+    parameters (dict): Os parâmetros do cálculo. Padrão: nenhum (métricas exatas).
+    all_parameters (bool): Se verdadeiro, ignora `parameters` e retorna os cálculos com
+      quaisquer parâmetros ('parameters' entra no índice do resultado).
+
+  Returns:
+    pd.DataFrame: Uma linha por instituição e ano (índice) e uma coluna por métrica.
+  """
+  where, values = _filters(
+    metric=metrics, institution=institutions, year=years,
+    parameters=None if all_parameters else _parameters_key(parameters)
+  )
+  data = _query(catalog_path, f"SELECT institution, year, parameters, metric, value FROM graph_metrics{where}", values)
+
+  index = ['institution', 'year', 'parameters'] if all_parameters else ['institution', 'year']
+  table = data.pivot_table(index=index, columns='metric', values='value', aggfunc='first', dropna=False)
+  table.columns.name = None
+  return table
+
+
+def query_degree_distributions(catalog_path, institutions=None, years=None, parameters=None):
+  """
+  Consulta as distribuições de graus de vários grafos de uma vez.
+
+  Args:
+    catalog_path (str): O caminho do catálogo.
+    institutions (list): As instituições. Padrão: todas.
+    years (list): Os anos. Padrão: todos.
+    parameters (dict): Os parâmetros do cálculo. Padrão: nenhum (métricas exatas).
+
+  Returns:
+    pd.DataFrame: Colunas 'institution', 'year', 'degree' e 'count', ordenadas.
+  """
+  where, values = _filters(institution=institutions, year=years, parameters=_parameters_key(parameters))
+  return _query(
+    catalog_path,
+    f"SELECT institution, year, degree, count FROM degree_distributions{where} ORDER BY institution, year, degree",
+    values
+  )
+
+
+def query_attack_results(catalog_path, quantities=None, institutions=None, years=None, metrics=None, num_hubs=None):
+  """
+  Consulta os resultados dos ataques a hubs de vários grafos de uma vez.
+
+  Args:
+    catalog_path (str): O caminho do catálogo.
+    quantities (list): As grandezas desejadas (ex.: 'impact.lcc_size_reduction_percent').
+      Padrão: todas.
+    institutions, years, metrics, num_hubs (list): Filtros. Padrão: todos.
+
+  Returns:
+    pd.DataFrame: Uma linha por ataque (índice: instituição, ano, métrica, quantidade de
+    hubs e parâmetros) e uma coluna por grandeza.
+  """
+  where, values = _filters(quantity=quantities, institution=institutions, year=years, metric=metrics, num_hubs=num_hubs)
+  data = _query(catalog_path, f"SELECT institution, year, metric, num_hubs, parameters, quantity, value FROM attack_results{where}", values)
+
+  table = data.pivot_table(
+    index=['institution', 'year', 'metric', 'num_hubs', 'parameters'], columns='quantity', values='value',
+    aggfunc='first', dropna=False
+  )
+  table.columns.name = None
+  return table
@@ -0,0 +1,850 @@
+import math
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import eigsh
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+CSRGraph = namedtuple('CSRGraph', ['adjacency', 'node_ids'])
+
+BFS_BATCH_ELEMENTS = 2 ** 22
+
+EIGENVECTOR_TOLERANCE = 1.0e-9
+EIGENVALUE_TIE_TOLERANCE = 1.0e-6
+DENSE_EIGEN_SIZE = 64
+
+DISTANCE_METRICS = ['average_shortest_path_length', 'betweenness_centrality', 'closeness_centrality']
+
+
+def to_csr(graph, weight='weight'):
+  """Converte um grafo NetworkX para a representação CSR (compressed sparse row)
+  com IDs inteiros para os vértices.
+
+  Args:
+    graph (nx.Graph): O grafo NetworkX a ser convertido.
+    weight (str): O atributo das arestas usado como valor da matriz.
+
+  Returns:
+    CSRGraph: Tupla com a matriz de adjacência `sp.csr_matrix` (n × n) e a lista
+      `node_ids`, onde o vértice de índice i da matriz corresponde a `node_ids[i]`.
+  """
+  node_ids = list(graph.nodes())
+  if not node_ids:
+    return CSRGraph(sp.csr_matrix((0, 0), dtype=np.float64), node_ids)
+
+  adjacency = nx.to_scipy_sparse_array(graph, nodelist=node_ids, weight=weight, format='csr')
+  return CSRGraph(sp.csr_matrix(adjacency, dtype=np.float64), node_ids)
+
+
+def binary_structure(adjacency):
+  """Retorna a matriz binária da adjacência, sem laços, usada nas travessias e contagens."""
+  structure = sp.csr_matrix(adjacency, dtype=np.float64, copy=True)
+  structure.setdiag(0)
+  structure.eliminate_zeros()
+  structure.data[:] = 1.0
+  return structure
+
+
+def _source_batches(sources, num_nodes):
+  """Divide os vértices de origem em lotes que cabem em matrizes densas (n × lote)."""
+  batch_size = max(1, min(len(sources), BFS_BATCH_ELEMENTS // max(num_nodes, 1)))
+  for start in range(0, len(sources), batch_size):
+    yield sources[start:start + batch_size]
+
+
+def _to_dict(node_ids, values):
+  return dict(zip(node_ids, values.tolist()))
+
+
+def induced_subgraph(csr_graph, node_indices):
+  """Retorna o subgrafo induzido pelos vértices de índices `node_indices`.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    node_indices (np.ndarray): Índices dos vértices mantidos.
+
+  Returns:
+    CSRGraph: O subgrafo, com os vértices renumerados na ordem de `node_indices`.
+  """
+  node_indices = np.asarray(node_indices, dtype=np.int64)
+  adjacency = csr_graph.adjacency[node_indices][:, node_indices]
+  return CSRGraph(sp.csr_matrix(adjacency), [csr_graph.node_ids[i] for i in node_indices])
+
+
+def number_of_edges(csr_graph):
+  """Conta as arestas do grafo (laços contam uma vez, como no NetworkX)."""
+  adjacency = csr_graph.adjacency
+  return int((adjacency.nnz + np.count_nonzero(adjacency.diagonal())) // 2)
+
+
+def degrees(csr_graph):
+  """Calcula o grau de cada vértice, contando laços duas vezes como no NetworkX.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+
+  Returns:
+    np.ndarray: Vetor com o grau de cada vértice.
+  """
+  adjacency = csr_graph.adjacency
+  return np.diff(adjacency.indptr) + (adjacency.diagonal() != 0)
+
+
+def connected_components(csr_graph):
+  """Calcula as componentes conexas do grafo.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+
+  Returns:
+    tuple: O número de componentes e o vetor com o rótulo da componente de cada vértice.
+  """
+  return csgraph.connected_components(csr_graph.adjacency, directed=False)
+
+
+def largest_component(csr_graph):
+  """Retorna os índices dos vértices da maior componente conexa."""
+  num_nodes = csr_graph.adjacency.shape[0]
+  if num_nodes == 0:
+    return np.array([], dtype=np.int64)
+
+  _, labels = connected_components(csr_graph)
+  return np.flatnonzero(labels == np.bincount(labels).argmax())
+
+
+def _oriented_triangle_sums(oriented):
+  """Soma, para cada vértice, os pesos dos triângulos que o contêm, a partir da matriz das
+  arestas orientadas do vértice de menor para o de maior posto. Cada triângulo a → b → c
+  (com a → c) aparece uma única vez: em (U @ U) ∘ U, na entrada (a, c), e em (Uᵀ @ U) ∘ U, na
+  linha do vértice do meio b."""
+  closing = (oriented @ oriented).multiply(oriented).tocsr()
+  middle = (oriented.T @ oriented).multiply(oriented).tocsr()
+  return (
+    np.asarray(closing.sum(axis=1)).ravel()
+    + np.asarray(closing.sum(axis=0)).ravel()
+    + np.asarray(middle.sum(axis=1)).ravel()
+  )
+
+
+def triangle_counts(csr_graph, weighted=False):
+  """Conta os triângulos de cada vértice, ignorando laços.
+
+  As arestas são orientadas do vértice de menor para o de maior grau, de modo que os produtos
+  esparsos percorrem só os caminhos de dois passos "subindo" de grau, e não os d² pares de
+  vizinhos de cada hub, como em diag(A³).
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    weighted (bool): Se verdadeiro, cada triângulo conta como a média geométrica dos pesos das
+      suas arestas, normalizados pelo maior peso do grafo (como em `nx.clustering(weight=...)`).
+
+  Returns:
+    np.ndarray: Vetor com o número (ou a soma ponderada) de triângulos de cada vértice.
+  """
+  structure = binary_structure(csr_graph.adjacency)
+  num_nodes = structure.shape[0]
+  if num_nodes == 0:
+    return np.zeros(0)
+
+  simple_degrees = np.diff(structure.indptr)
+  rank = np.empty(num_nodes, dtype=np.int64)
+  rank[np.lexsort((np.arange(num_nodes), simple_degrees))] = np.arange(num_nodes)
+
+  if weighted:
+    adjacency = sp.csr_matrix(csr_graph.adjacency, dtype=np.float64)
+    max_weight = adjacency.data.max() if adjacency.nnz else 1.0
+    edges = sp.triu(adjacency, k=1).tocoo()
+    values = np.cbrt(edges.data / max_weight)
+  else:
+    edges = sp.triu(structure, k=1).tocoo()
+    values = edges.data
+
+  forward = rank[edges.row] < rank[edges.col]
+  rows = np.where(forward, edges.row, edges.col)
+  cols = np.where(forward, edges.col, edges.row)
+  oriented = sp.csr_matrix((values, (rows, cols)), shape=(num_nodes, num_nodes))
+  return _oriented_triangle_sums(oriented)
+
+
+def local_clustering(csr_graph, weighted=False):
+  """Calcula o coeficiente de agrupamento local de cada vértice, ignorando laços.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    weighted (bool): Se verdadeiro, usa o agrupamento ponderado pelos pesos da adjacência,
+      como `nx.clustering(graph, weight='weight')`.
+
+  Returns:
+    np.ndarray: Vetor com o coeficiente de agrupamento de cada vértice.
+  """
+  structure = binary_structure(csr_graph.adjacency)
+  simple_degrees = np.diff(structure.indptr)
+  triangles = triangle_counts(csr_graph, weighted=weighted)
+
+  possible_triangles = simple_degrees * (simple_degrees - 1) / 2
+  clustering = np.zeros(len(simple_degrees))
+  np.divide(triangles, possible_triangles, out=clustering, where=possible_triangles > 0)
+  return clustering
+
+
+BFSSweep = namedtuple('BFSSweep', [
+  'distance_totals',
+  'distance_squares',
+  'reached',
+  'inverse_distance_totals',
+  'dependencies',
+  'dependencies_squared'
+])
+
+
+def _sweep_batches(structure, sources, dependencies):
+  """Gera, para cada lote de origens, a matriz (n × lote) de profundidades das BFS e,
+  se `dependencies` for verdadeiro, a matriz das dependências de Brandes. As BFS e a
+  retropropagação são feitas por produtos de matriz esparsa sobre todo o lote.
+  """
+  num_nodes = structure.shape[0]
+
+  for batch in _source_batches(sources, num_nodes):
+    columns = np.arange(len(batch))
+    depth = np.full((num_nodes, len(batch)), -1, dtype=np.int32)
+    sigma = np.zeros((num_nodes, len(batch)))
+    depth[batch, columns] = 0
+    sigma[batch, columns] = 1.0
+
+    frontier = sigma.copy()
+    level = 0
+    while True:
+      paths = structure @ frontier
+      discovered = (paths > 0) & (depth < 0)
+      if not discovered.any():
+        break
+      level += 1
+      depth[discovered] = level
+      sigma[discovered] = paths[discovered]
+      frontier = np.where(discovered, paths, 0.0)
+
+    if not dependencies:
+      yield batch, depth, None
+      continue
+
+    delta = np.zeros((num_nodes, len(batch)))
+    for current_level in range(level, 0, -1):
+      at_level = depth == current_level
+      coefficients = np.zeros((num_nodes, len(batch)))
+      coefficients[at_level] = (1.0 + delta[at_level]) / sigma[at_level]
+      contributions = structure @ coefficients
+      parents = depth == current_level - 1
+      delta[parents] += sigma[parents] * contributions[parents]
+
+    delta[batch, columns] = 0.0
+    yield batch, depth, delta
+
+
+def bfs_sweep(csr_graph, sources=None, dependencies=True, workers=1):
+  """Faz uma única BFS a partir de cada origem e acumula, na mesma passada, todas as
+  grandezas das métricas baseadas em distância: menor caminho médio, proximidade,
+  eficiência global e (opcionalmente) as dependências da intermediação.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    sources (np.ndarray): Índices dos vértices de origem. Padrão: todos os vértices.
+    dependencies (bool): Se verdadeiro, faz também a retropropagação de Brandes.
+    workers (int): Número de processos. Com mais de um, as origens são divididas entre
+      os processos, que leem a mesma matriz de adjacência em memória compartilhada.
+
+  Returns:
+    BFSSweep: Vetores indexados pelo vértice de destino v, acumulados sobre as origens s:
+      - 'distance_totals': soma de d(s, v) para as origens que alcançam v.
+      - 'distance_squares': soma de d(s, v)².
+      - 'reached': quantidade de origens que alcançam v (incluindo v, se for origem).
+      - 'inverse_distance_totals': soma de 1 / d(s, v) para s ≠ v.
+      - 'dependencies': soma das dependências de Brandes de v (ou None).
+      - 'dependencies_squared': soma dos quadrados das dependências de v (ou None).
+      Com todas as origens, o grafo não direcionado torna essas somas iguais às somas por origem.
+  """
+  structure = binary_structure(csr_graph.adjacency)
+  num_nodes = structure.shape[0]
+  sources = np.arange(num_nodes) if sources is None else np.asarray(sources)
+
+  if workers > 1 and len(sources) > 1:
+    return _parallel_sweep(structure, sources, dependencies, workers)
+
+  return _accumulate_sweep(structure, sources, dependencies)
+
+
+def _accumulate_sweep(structure, sources, dependencies):
+  """Executa `_sweep_batches` sobre as origens e acumula os vetores de `BFSSweep`."""
+  num_nodes = structure.shape[0]
+
+  distance_totals = np.zeros(num_nodes)
+  distance_squares = np.zeros(num_nodes)
+  reached = np.zeros(num_nodes, dtype=np.int64)
+  inverse_distance_totals = np.zeros(num_nodes)
+  node_dependencies = np.zeros(num_nodes) if dependencies else None
+  node_dependencies_squared = np.zeros(num_nodes) if dependencies else None
+
+  for _, depth, delta in _sweep_batches(structure, sources, dependencies):
+    reachable = depth >= 0
+    distances = np.where(reachable, depth, 0).astype(np.float64)
+    distance_totals += distances.sum(axis=1)
+    distance_squares += (distances ** 2).sum(axis=1)
+    reached += reachable.sum(axis=1)
+
+    inverse_distances = np.zeros_like(distances)
+    np.divide(1.0, distances, out=inverse_distances, where=distances > 0)
+    inverse_distance_totals += inverse_distances.sum(axis=1)
+
+    if dependencies:
+      node_dependencies += delta.sum(axis=1)
+      node_dependencies_squared += (delta ** 2).sum(axis=1)
+
+  return BFSSweep(
+    distance_totals,
+    distance_squares,
+    reached,
+    inverse_distance_totals,
+    node_dependencies,
+    node_dependencies_squared
+  )
+
+
+_worker_structure = None
+_worker_shared_memory = []
+
+
+def _share_array(array):
+  """Copia um vetor NumPy para um bloco de memória compartilhada."""
+  memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+  np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+  return memory, (memory.name, array.shape, array.dtype.str)
+
+
+def _attach_structure(array_specs, num_nodes):
+  """Inicializa um processo trabalhador, montando a matriz CSR sobre os vetores da
+  memória compartilhada, sem cópia."""
+  global _worker_structure
+
+  arrays = []
+  for name, shape, dtype in array_specs:
+    memory = shared_memory.SharedMemory(name=name)
+    _worker_shared_memory.append(memory)
+    arrays.append(np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+  data, indices, indptr = arrays
+  _worker_structure = sp.csr_matrix((num_nodes, num_nodes))
+  _worker_structure.data, _worker_structure.indices, _worker_structure.indptr = data, indices, indptr
+
+
+def worker_structure():
+  """Retorna a matriz de adjacência (binária, sem laços) montada em um processo trabalhador
+  de `shared_structure_executor`."""
+  return _worker_structure
+
+
+@contextmanager
+def shared_structure_executor(structure, workers):
+  """Abre um pool de processos cujos trabalhadores leem uma única cópia da matriz
+  `structure` em memória compartilhada (acessível com `worker_structure`). A memória é
+  liberada ao sair do contexto.
+
+  Args:
+    structure (sp.csr_matrix): A matriz de adjacência a ser compartilhada.
+    workers (int): Número de processos.
+
+  Yields:
+    ProcessPoolExecutor: O pool de processos.
+  """
+  num_nodes = structure.shape[0]
+  shared = [_share_array(array) for array in (structure.data, structure.indices, structure.indptr)]
+
+  try:
+    with ProcessPoolExecutor(
+      max_workers=workers,
+      initializer=_attach_structure,
+      initargs=([spec for _, spec in shared], num_nodes)
+    ) as executor:
+      yield executor
+  finally:
+    for memory, _ in shared:
+      memory.close()
+      memory.unlink()
+
+
+def _sweep_worker(sources, dependencies):
+  return _accumulate_sweep(_worker_structure, sources, dependencies)
+
+
+def _parallel_sweep(structure, sources, dependencies, workers):
+  """Divide as origens entre um pool de processos que leem uma única cópia da matriz
+  de adjacência em memória compartilhada e soma os vetores acumulados por cada um."""
+  chunks = [chunk for chunk in np.array_split(sources, workers * 4) if len(chunk) > 0]
+
+  with shared_structure_executor(structure, workers) as executor:
+    partial_sweeps = list(executor.map(_sweep_worker, chunks, [dependencies] * len(chunks)))
+
+  return BFSSweep(*(
+    None if fields[0] is None else np.sum(fields, axis=0)
+    for fields in zip(*partial_sweeps)
+  ))
+
+
+def betweenness_from_sweep(sweep, num_nodes):
+  """Normaliza as dependências de uma varredura completa como `nx.betweenness_centrality`."""
+  betweenness = sweep.dependencies.copy()
+  if num_nodes > 2:
+    betweenness *= 1 / ((num_nodes - 1) * (num_nodes - 2))
+  return betweenness
+
+
+def betweenness_centrality(csr_graph, workers=1):
+  """Calcula a centralidade de intermediação normalizada, como `nx.betweenness_centrality`.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    workers (int): Número de processos da varredura BFS.
+
+  Returns:
+    np.ndarray: Vetor com a centralidade de intermediação de cada vértice.
+  """
+  return betweenness_from_sweep(bfs_sweep(csr_graph, workers=workers), csr_graph.adjacency.shape[0])
+
+
+def efficiency_from_sweep(sweep, num_nodes):
+  """Calcula a eficiência global (como `nx.global_efficiency`) de uma varredura completa."""
+  if num_nodes < 2:
+    return 0
+  return float(sweep.inverse_distance_totals.sum() / (num_nodes * (num_nodes - 1)))
+
+
+def global_efficiency(csr_graph, workers=1):
+  """Calcula a eficiência global do grafo, como `nx.global_efficiency`.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    workers (int): Número de processos da varredura BFS.
+
+  Returns:
+    float: A média de 1 / d(u, v) sobre todos os pares ordenados de vértices distintos.
+  """
+  num_nodes = csr_graph.adjacency.shape[0]
+  return efficiency_from_sweep(bfs_sweep(csr_graph, dependencies=False, workers=workers), num_nodes)
+
+
+def pivots_for_epsilon(num_nodes, epsilon, delta=0.1):
+  """Calcula quantos pivôs garantem, pela desigualdade de Hoeffding com união sobre os
+  vértices, erro absoluto máximo `epsilon` nas centralidades normalizadas com
+  probabilidade de pelo menos 1 - `delta`.
+  """
+  if num_nodes == 0:
+    return 0
+  return min(num_nodes, math.ceil(math.log(2 * num_nodes / delta) / (2 * epsilon ** 2)))
+
+
+def epsilon_for_pivots(num_nodes, pivots, delta=0.1):
+  """Inverso de `pivots_for_epsilon`: o erro máximo garantido para `pivots` pivôs."""
+  if num_nodes == 0 or pivots >= num_nodes:
+    return 0.0
+  return math.sqrt(math.log(2 * num_nodes / delta) / (2 * pivots))
+
+
+def _standard_error_summary(standard_errors):
+  if len(standard_errors) == 0:
+    return {'mean': 0.0, 'max': 0.0}
+  return {'mean': float(standard_errors.mean()), 'max': float(standard_errors.max())}
+
+
+def check_sampling_parameters(pivots=None, epsilon=None):
+  """Valida os parâmetros da amostragem de pivôs: `pivots` deve ser um inteiro positivo e
+  `epsilon` um número positivo (quando informados).
+  """
+  if pivots is not None and (isinstance(pivots, bool) or not isinstance(pivots, (int, np.integer)) or pivots < 1):
+    raise ValueError(f"O número de pivôs deve ser um inteiro positivo, não {pivots!r}.")
+  if epsilon is not None and (isinstance(epsilon, bool) or not isinstance(epsilon, (int, float, np.number)) or not epsilon > 0):
+    raise ValueError(f"O erro máximo (epsilon) deve ser positivo, não {epsilon!r}.")
+
+
+def sample_pivots(num_nodes, pivots=None, epsilon=None, seed=None, delta=0.1):
+  """Sorteia os vértices de origem (pivôs) das estimativas por amostragem.
+
+  Args:
+    num_nodes (int): Número de vértices do grafo.
+    pivots (int): Número de pivôs. Se omitido, é calculado a partir de `epsilon`.
+    epsilon (float): Erro absoluto máximo desejado, usado quando `pivots` é omitido.
+    seed (int): Semente do sorteio.
+    delta (float): Probabilidade de o erro máximo ultrapassar `epsilon`.
+
+  Returns:
+    np.ndarray: Os índices dos pivôs, em ordem crescente.
+  """
+  if pivots is None and epsilon is None:
+    raise ValueError("Informe o número de pivôs ou o erro máximo (epsilon) da aproximação.")
+  check_sampling_parameters(pivots, epsilon)
+
+  num_pivots = min(num_nodes, pivots if pivots is not None else pivots_for_epsilon(num_nodes, epsilon, delta))
+  rng = np.random.default_rng(seed)
+  return np.sort(rng.choice(num_nodes, size=num_pivots, replace=False))
+
+
+def centralities_from_pivot_sweep(sweep, sampled, num_nodes, seed=None, epsilon=None, delta=0.1):
+  """Estima as centralidades de intermediação e de proximidade a partir de uma varredura
+  `bfs_sweep` feita a partir dos pivôs `sampled`. Veja `approximate_centralities`.
+  """
+  num_pivots = len(sampled)
+  is_pivot = np.zeros(num_nodes, dtype=bool)
+  is_pivot[sampled] = True
+
+  betweenness = np.zeros(num_nodes)
+  betweenness_se = np.zeros(num_nodes)
+  if num_nodes > 2 and num_pivots > 0:
+    samples = np.where(is_pivot, num_pivots - 1, num_pivots).astype(np.float64)
+    valid = samples > 0
+    scale = 1 / (num_nodes - 2)
+    mean = np.zeros(num_nodes)
+    mean[valid] = sweep.dependencies[valid] / samples[valid]
+    variance = np.zeros(num_nodes)
+    variance[valid] = np.maximum(sweep.dependencies_squared[valid] / samples[valid] - mean[valid] ** 2, 0)
+    betweenness = mean * scale
+    betweenness_se[valid] = np.sqrt(variance[valid] / samples[valid]) * scale
+
+  closeness = np.zeros(num_nodes)
+  closeness_se = np.zeros(num_nodes)
+  if num_pivots > 0:
+    estimated_reachable = sweep.reached * num_nodes / num_pivots
+    estimated_totals = sweep.distance_totals * num_nodes / num_pivots
+    closeness = closeness_from_distances(estimated_totals, estimated_reachable, num_nodes)
+
+    valid = (sweep.reached > 1) & (sweep.distance_totals > 0)
+    mean_distance = sweep.distance_totals[valid] / sweep.reached[valid]
+    variance = np.maximum(sweep.distance_squares[valid] / sweep.reached[valid] - mean_distance ** 2, 0)
+    closeness_se[valid] = closeness[valid] * np.sqrt(variance / sweep.reached[valid]) / mean_distance
+
+  if num_pivots >= num_nodes:
+    betweenness_se[:] = 0.0
+    closeness_se[:] = 0.0
+
+  sampling = {
+    'mode': 'approximate' if num_pivots < num_nodes else 'exact',
+    'pivots': int(num_pivots),
+    'seed': seed,
+    'requested_epsilon': epsilon,
+    'epsilon_bound': epsilon_for_pivots(num_nodes, num_pivots, delta),
+    'confidence': 1 - delta,
+    'betweenness_standard_error': _standard_error_summary(betweenness_se),
+    'closeness_standard_error': _standard_error_summary(closeness_se)
+  }
+
+  return betweenness, closeness, sampling
+
+
+def approximate_centralities(csr_graph, pivots=None, epsilon=None, seed=None, delta=0.1, workers=1):
+  """Estima as centralidades de intermediação e de proximidade a partir de uma única
+  varredura `bfs_sweep` feita só a partir de uma amostra de vértices de origem (pivôs).
+
+  A intermediação segue a mesma estimativa de `nx.betweenness_centrality` com `k` pivôs.
+  A proximidade usa a soma das distâncias dos pivôs até cada vértice (Eppstein e Wang)
+  extrapolada para o grafo todo; vértices que nenhum pivô alcança ficam com proximidade 0.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    pivots (int): Número de pivôs. Se omitido, é calculado a partir de `epsilon`.
+    epsilon (float): Erro absoluto máximo desejado, usado quando `pivots` é omitido.
+    seed (int): Semente do sorteio dos pivôs.
+    delta (float): Probabilidade de o erro máximo ultrapassar `epsilon`.
+    workers (int): Número de processos da varredura BFS.
+
+  Returns:
+    tuple: Os vetores de intermediação e de proximidade e um dicionário com os
+      parâmetros da amostragem e os erros estimados (limite teórico e erro padrão
+      empírico, médio e máximo, de cada centralidade).
+  """
+  num_nodes = csr_graph.adjacency.shape[0]
+  sampled = sample_pivots(num_nodes, pivots=pivots, epsilon=epsilon, seed=seed, delta=delta)
+  sweep = bfs_sweep(csr_graph, sources=sampled, workers=workers)
+  return centralities_from_pivot_sweep(sweep, sampled, num_nodes, seed=seed, epsilon=epsilon, delta=delta)
+
+
+def approximate_centrality_metrics(csr_graph, pivots=None, epsilon=None, seed=None, workers=1):
+  """Monta as entradas 'betweenness_centrality', 'closeness_centrality' e
+  'centrality_sampling' do dicionário de métricas com `approximate_centralities`.
+  """
+  betweenness, closeness, sampling = approximate_centralities(
+    csr_graph, pivots=pivots, epsilon=epsilon, seed=seed, workers=workers
+  )
+  return {
+    'betweenness_centrality': _to_dict(csr_graph.node_ids, betweenness),
+    'closeness_centrality': _to_dict(csr_graph.node_ids, closeness),
+    'centrality_sampling': sampling
+  }
+
+
+def closeness_from_distances(totals, reachable, num_nodes):
+  """Calcula a centralidade de proximidade (fórmula de Wasserman e Faust, como
+  `nx.closeness_centrality`) a partir das somas de distâncias de cada vértice.
+  """
+  closeness = np.zeros(len(totals))
+  valid = (totals > 0) & (num_nodes > 1)
+  closeness[valid] = (reachable[valid] - 1) / totals[valid]
+  closeness[valid] *= (reachable[valid] - 1) / (num_nodes - 1)
+  return closeness
+
+
+def average_path_length_from_sweep(sweep, sources, component_nodes):
+  """Calcula o menor caminho médio entre os vértices de um componente conexo a partir de uma
+  varredura `bfs_sweep`. Se todos os vértices do componente foram origens, o valor é exato; com
+  uma amostra de origens (pivôs), é a média das distâncias dos pivôs do componente até os demais
+  vértices dele, uma estimativa não enviesada do valor exato.
+
+  Args:
+    sweep (BFSSweep): A varredura.
+    sources (np.ndarray): Os índices das origens da varredura.
+    component_nodes (np.ndarray): Os índices dos vértices do componente.
+
+  Returns:
+    float: O menor caminho médio, ou None se o componente tiver menos de dois vértices ou
+      nenhuma origem.
+  """
+  component_size = len(component_nodes)
+  in_component = np.zeros(len(sweep.distance_totals), dtype=bool)
+  in_component[component_nodes] = True
+  component_sources = int(in_component[sources].sum())
+
+  if component_size < 2 or component_sources == 0:
+    return None
+  return float(sweep.distance_totals[component_nodes].sum() / (component_sources * (component_size - 1)))
+
+
+def distance_metrics(csr_graph, requested_metrics, lcc_nodes=None, pivots=None, epsilon=None, seed=None, workers=1):
+  """Calcula as métricas baseadas em distância ('average_shortest_path_length',
+  'betweenness_centrality' e 'closeness_centrality') a partir de uma única varredura
+  `bfs_sweep`: de todos os vértices no modo exato, ou só dos pivôs sorteados quando `pivots`
+  ou `epsilon` é informado. No modo aproximado, o menor caminho médio também é estimado a
+  partir dos pivôs (`average_path_length_from_sweep`), e as duas centralidades são estimadas
+  juntas, com 'centrality_sampling'.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    requested_metrics (list): As métricas solicitadas; as que não são baseadas em distância são ignoradas.
+    lcc_nodes (np.ndarray): Os índices do maior componente conectado. Padrão: calculados aqui.
+    pivots (int): Número de pivôs do modo aproximado.
+    epsilon (float): Alternativa a `pivots`: erro máximo desejado nas centralidades.
+    seed (int): Semente do sorteio dos pivôs.
+    workers (int): Número de processos da varredura BFS.
+
+  Returns:
+    dict: As métricas calculadas, com os IDs originais dos vértices.
+  """
+  requested = set(requested_metrics)
+  wants_path_length = 'average_shortest_path_length' in requested
+  wants_centralities = bool(requested & {'betweenness_centrality', 'closeness_centrality'})
+  if not (wants_path_length or wants_centralities):
+    return {}
+
+  node_ids = csr_graph.node_ids
+  num_nodes = len(node_ids)
+  sampling = pivots is not None or epsilon is not None
+  if sampling:
+    sources = sample_pivots(num_nodes, pivots=pivots, epsilon=epsilon, seed=seed)
+    dependencies = wants_centralities
+  else:
+    sources = np.arange(num_nodes)
+    dependencies = 'betweenness_centrality' in requested
+  sweep = bfs_sweep(csr_graph, sources=sources, dependencies=dependencies, workers=workers)
+
+  metrics = {}
+  if wants_path_length:
+    print('Coleta de dados: média da distância geodésica')
+    if lcc_nodes is None:
+      lcc_nodes = largest_component(csr_graph)
+    if num_nodes == 1:
+      metrics['average_shortest_path_length'] = 0
+    else:
+      metrics['average_shortest_path_length'] = average_path_length_from_sweep(sweep, sources, lcc_nodes)
+
+  if wants_centralities:
+    print('Coleta de dados: centralidades')
+    if sampling:
+      betweenness, closeness, centrality_sampling = centralities_from_pivot_sweep(sweep, sources, num_nodes, seed=seed, epsilon=epsilon)
+      metrics['betweenness_centrality'] = _to_dict(node_ids, betweenness)
+      metrics['closeness_centrality'] = _to_dict(node_ids, closeness)
+      metrics['centrality_sampling'] = centrality_sampling
+    else:
+      if 'betweenness_centrality' in requested:
+        metrics['betweenness_centrality'] = _to_dict(node_ids, betweenness_from_sweep(sweep, num_nodes))
+      if 'closeness_centrality' in requested:
+        metrics['closeness_centrality'] = _to_dict(node_ids, closeness_from_distances(sweep.distance_totals, sweep.reached, num_nodes))
+
+  return metrics
+
+
+def _perron_vector(adjacency, start=None, tol=EIGENVECTOR_TOLERANCE):
+  """Retorna o maior autovalor de uma matriz de adjacência conexa e o autovetor positivo
+  associado (de norma 1), com `eigsh` partindo de `start` ou, em matrizes pequenas, com `eigh`."""
+  num_nodes = adjacency.shape[0]
+  if num_nodes <= DENSE_EIGEN_SIZE:
+    eigenvalues, eigenvectors = np.linalg.eigh(adjacency.toarray())
+    eigenvalue, vector = eigenvalues[-1], eigenvectors[:, -1]
+  else:
+    v0 = None if start is None else np.asarray(start, dtype=np.float64) + 1.0 / num_nodes
+    eigenvalues, eigenvectors = eigsh(adjacency, k=1, which='LA', v0=v0, tol=tol)
+    eigenvalue, vector = eigenvalues[0], eigenvectors[:, 0]
+
+  vector = np.abs(vector)
+  return float(eigenvalue), vector / (np.linalg.norm(vector) or 1)
+
+
+def eigenvector_centrality(csr_graph, start=None, tol=EIGENVECTOR_TOLERANCE):
+  """Calcula a centralidade de autovetor (sem pesos) com um solver esparso de autovalores,
+  sempre retornando um resultado.
+
+  O resultado é o limite da iteração de potência de `nx.eigenvector_centrality` (sobre A + I,
+  partindo do vetor uniforme): o autovetor de Perron é calculado em cada componente conexa,
+  e só as componentes com o maior autovalor recebem centralidade, proporcional à projeção do
+  vetor inicial (as demais ficam com zero). Componentes cujo grau máximo não alcança o maior
+  autovalor já encontrado são descartadas sem resolver.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em representação CSR.
+    start (np.ndarray): Estimativa inicial por vértice (ex.: a centralidade do ano anterior),
+      usada apenas para acelerar a convergência do solver.
+    tol (float): Tolerância relativa do solver.
+
+  Returns:
+    np.ndarray: Vetor com a centralidade de autovetor de cada vértice (norma 1).
+  """
+  structure = sp.csr_matrix(csr_graph.adjacency, dtype=np.float64, copy=True)
+  structure.data[:] = 1.0
+  num_nodes = structure.shape[0]
+  if num_nodes == 0:
+    return np.zeros(0)
+
+  num_components, labels = csgraph.connected_components(structure, directed=False)
+  order = np.argsort(labels, kind='stable')
+  boundaries = np.searchsorted(labels[order], np.arange(num_components + 1))
+  max_degrees = np.zeros(num_components)
+  np.maximum.at(max_degrees, labels, np.asarray(structure.sum(axis=1)).ravel())
+
+  best_eigenvalue = -np.inf
+  perron = []
+  for component in np.argsort(-max_degrees, kind='stable'):
+    if max_degrees[component] < best_eigenvalue * (1 - EIGENVALUE_TIE_TOLERANCE):
+      break
+
+    nodes = order[boundaries[component]:boundaries[component + 1]]
+    component_structure = structure if num_components == 1 else structure[nodes][:, nodes]
+    eigenvalue, vector = _perron_vector(component_structure, None if start is None else np.abs(start[nodes]), tol)
+    best_eigenvalue = max(best_eigenvalue, eigenvalue)
+    perron.append((eigenvalue, nodes, vector))
+
+  centrality = np.zeros(num_nodes)
+  for eigenvalue, nodes, vector in perron:
+    if eigenvalue >= best_eigenvalue - EIGENVALUE_TIE_TOLERANCE * max(abs(best_eigenvalue), 1):
+      centrality[nodes] = vector * vector.sum()
+
+  return centrality / np.linalg.norm(centrality)
+
+
+def degree_assortativity(csr_graph):
+  """Calcula o coeficiente de assortatividade por grau (correlação de Pearson entre os
+  graus das extremidades de cada aresta), como `nx.degree_assortativity_coefficient`.
+  """
+  adjacency = csr_graph.adjacency.tocoo()
+  node_degrees = degrees(csr_graph).astype(np.float64)
+  x = node_degrees[adjacency.row]
+  y = node_degrees[adjacency.col]
+
+  if len(x) == 0:
+    return float('nan')
+
+  x_centered = x - x.mean()
+  y_centered = y - y.mean()
+  with np.errstate(divide='ignore', invalid='ignore'):
+    return float((x_centered * y_centered).sum() / np.sqrt((x_centered ** 2).sum() * (y_centered ** 2).sum()))
+
+
+def extract_graph_metrics_csr(graph, pivots=None, epsilon=None, seed=None, workers=1, requested_metrics=None,
+                              eigenvector_start=None):
+  """
+  Calcula as mesmas métricas de `network_util.extract_graph_metrics`, convertendo o grafo
+  uma única vez para CSR e usando rotinas NumPy/SciPy. As métricas por vértice são
+  devolvidas com os IDs originais dos vértices.
+
+  Args:
+  graph (nx.Graph ou CSRGraph): O grafo do qual as métricas serão extraídas (ex.: lido com
+    `graph_store_util.read_csr_graph`, sem passar pelo NetworkX).
+  pivots (int): Se informado, estima intermediação, proximidade e menor caminho médio com esse
+    número de pivôs (`distance_metrics`).
+  epsilon (float): Se informado (e `pivots` não), erro máximo desejado para a estimativa.
+  seed (int): Semente do sorteio dos pivôs.
+  workers (int): Número de processos usados nas varreduras BFS (caminhos, intermediação
+    e proximidade). Os resultados são os mesmos da execução serial.
+  requested_metrics (list): Métricas a serem calculadas. Padrão: todas, exceto as opcionais
+    (agrupamento ponderado), calculadas só quando pedidas.
+  eigenvector_start (dict): Centralidade de autovetor de um grafo anterior (ex.: o do ano
+    anterior), por ID de vértice, usada como ponto de partida do solver.
+
+  Returns:
+    dict: Um dicionário com as mesmas chaves de `network_util.extract_graph_metrics`.
+  """
+  metrics = {}
+  csr_graph = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+  node_ids = csr_graph.node_ids
+  num_nodes = len(node_ids)
+  requested = None if requested_metrics is None else set(requested_metrics)
+
+  def wanted(*keys):
+    return requested is None or bool(requested.intersection(keys))
+
+  if wanted('num_nodes', 'num_edges'):
+    print('Coleta de dados: números de vértices e arestas')
+    metrics['num_nodes'] = num_nodes
+    metrics['num_edges'] = number_of_edges(csr_graph)
+
+  lcc_nodes = None
+  if wanted('largest_connected_component_size', 'average_shortest_path_length'):
+    print('Coleta de dados: maior componente conexa')
+    lcc_nodes = largest_component(csr_graph)
+    metrics['largest_connected_component_size'] = len(lcc_nodes)
+
+  if wanted('degrees', 'average_degree', 'degree_distribution'):
+    print('Coleta de dados: grau, grau médio e distribuição de graus')
+    node_degrees = degrees(csr_graph)
+    metrics['degrees'] = _to_dict(node_ids, node_degrees)
+    metrics['average_degree'] = float(node_degrees.sum() / num_nodes) if num_nodes > 0 else 0
+
+    degree_counts = np.bincount(node_degrees) if num_nodes > 0 else np.array([], dtype=np.int64)
+    metrics['degree_distribution'] = {int(i): int(count) for i, count in enumerate(degree_counts) if count > 0}
+
+  if wanted('local_clustering_coefficient', 'average_clustering_coefficient'):
+    print('Coleta de dados: coeficiente de agrupamento')
+    clustering = local_clustering(csr_graph)
+    metrics['local_clustering_coefficient'] = _to_dict(node_ids, clustering)
+    metrics['average_clustering_coefficient'] = float(clustering.mean()) if num_nodes > 0 else 0
+
+  if requested is not None and requested & {'weighted_local_clustering_coefficient', 'weighted_average_clustering_coefficient'}:
+    print('Coleta de dados: coeficiente de agrupamento ponderado')
+    weighted_clustering = local_clustering(csr_graph, weighted=True)
+    metrics['weighted_local_clustering_coefficient'] = _to_dict(node_ids, weighted_clustering)
+    metrics['weighted_average_clustering_coefficient'] = float(weighted_clustering.mean()) if num_nodes > 0 else 0
+
+  if wanted('average_shortest_path_length', 'betweenness_centrality', 'closeness_centrality'):
+    metrics.update(distance_metrics(
+      csr_graph, [metric for metric in DISTANCE_METRICS if wanted(metric)], lcc_nodes=lcc_nodes,
+      pivots=pivots, epsilon=epsilon, seed=seed, workers=workers
+    ))
+
+  if wanted('eigenvector_centrality'):
+    print('Coleta de dados: centralidade de autovetor')
+    start = None
+    if eigenvector_start:
+      start = np.array([eigenvector_start.get(node_id, 0.0) for node_id in node_ids], dtype=np.float64)
+    metrics['eigenvector_centrality'] = _to_dict(node_ids, eigenvector_centrality(csr_graph, start=start))
+
+  if wanted('degree_assortativity_coefficient'):
+    print('Coleta de dados: assortatividade')
+    metrics['degree_assortativity_coefficient'] = degree_assortativity(csr_graph)
+
+  return metrics
@@ -0,0 +1,67 @@
+import csv
+import sys
+import pandas as pd
+
+CSV_ENGINES = ['c', 'python']
+
+
+def read_openalex_csv(csv_path, columns=None, chunksize=None, engine='c'):
+  """
+  Lê um CSV exportado do OpenAlex usando o parser em C do pandas, carregando apenas
+  as colunas necessárias.
+
+  O parser em C não tem o limite de tamanho de campo do módulo `csv`, então os campos
+  longos das colunas 'authorships.*' são lidos sem ajustar `csv.field_size_limit`.
+  O parser em Python continua disponível (`engine='python'`) para arquivos que o parser
+  em C não consiga analisar.
+
+  Args:
+    csv_path (str): O caminho para o arquivo CSV.
+    columns (list): As colunas a serem carregadas. Colunas ausentes no arquivo são
+      ignoradas. Padrão: todas.
+    chunksize (int): Se especificado, o arquivo é lido em blocos com esse número de
+      linhas, mantendo limitado o uso de memória.
+    engine (str): O parser do pandas: 'c' (padrão) ou 'python'.
+
+  Returns:
+    pd.DataFrame ou iterador de pd.DataFrame: O DataFrame completo ou, se `chunksize`
+      for especificado, um iterador sobre os blocos.
+  """
+  if engine not in CSV_ENGINES:
+    raise ValueError(f"Parser '{engine}' inválido. Opções: {', '.join(CSV_ENGINES)}")
+
+  read_options = {'encoding': 'utf8', 'engine': engine, 'chunksize': chunksize}
+
+  if columns is not None:
+    wanted_columns = set(columns)
+    read_options['usecols'] = lambda column: column in wanted_columns
+
+  if engine == 'python':
+    csv.field_size_limit(sys.maxsize)
+  elif chunksize is None:
+    read_options['low_memory'] = False
+
+  return pd.read_csv(csv_path, **read_options)
+
+
+def iter_openalex_csv(csv_path, columns=None, chunksize=None, engine='c'):
+  """
+  Percorre um CSV exportado do OpenAlex em blocos. Sem `chunksize`, o arquivo inteiro
+  é retornado como um único bloco, de forma que o mesmo laço serve aos dois modos.
+
+  Args:
+    csv_path (str): O caminho para o arquivo CSV.
+    columns (list): As colunas a serem carregadas. Padrão: todas.
+    chunksize (int): O número de linhas por bloco. Padrão: o arquivo inteiro.
+    engine (str): O parser do pandas: 'c' (padrão) ou 'python'.
+
+  Yields:
+    pd.DataFrame: Os blocos do arquivo, na ordem.
+  """
+  if chunksize is None:
+    yield read_openalex_csv(csv_path, columns=columns, engine=engine)
+    return
+
+  with read_openalex_csv(csv_path, columns=columns, chunksize=chunksize, engine=engine) as reader:
+    for chunk in reader:
+      yield chunk
@@ -0,0 +1,576 @@
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from src.csr_util import CSRGraph, to_csr
+
+GRAPH_STORE_EXTENSION = '.graph'
+GRAPH_STORE_VERSION = 3
+
+AUTHOR_REGISTRY_EXTENSION = '.registry'
+AUTHOR_REGISTRY_VERSION = 2
+AUTHOR_KEY_DTYPE = np.int32
+
+AuthorRegistry = namedtuple('AuthorRegistry', ['index', 'authors_ids'])
+
+
+def write_strings(directory, name, values):
+  """
+  Grava uma coluna de strings em formato colunar: os bytes UTF-8 concatenados em
+  `<name>.bytes` e as posições de início de cada valor em `<name>.offsets.npy`. Se algum
+  valor não for string (ex.: um atributo numérico ou None, que marca um valor ausente), todos
+  são gravados como JSON, para que os tipos sejam preservados na leitura.
+
+  Returns:
+    str: A codificação da coluna ('utf-8' ou 'json'), a ser passada para `read_strings`.
+  """
+  values = list(values)
+  encoding = 'utf-8' if all(isinstance(value, str) for value in values) else 'json'
+  if encoding == 'json':
+    encoded = [json.dumps(value, ensure_ascii=False, default=str).encode('utf-8') for value in values]
+  else:
+    encoded = [value.encode('utf-8') for value in values]
+  offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+  offsets[1:] = np.cumsum([len(value) for value in encoded])
+
+  np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+  with open(os.path.join(directory, f"{name}.bytes"), 'wb') as f:
+    f.write(b''.join(encoded))
+  return encoding
+
+
+def read_strings(directory, name, mmap=True, encoding='utf-8', indices=None):
+  """
+  Lê uma coluna de strings gravada por `write_strings`. Cada valor é decodificado direto da
+  sua fatia dos bytes (mapeados em memória), sem copiar a tabela inteira; com `indices`, só as
+  posições pedidas são lidas.
+
+  Args:
+    directory (str): O diretório da coluna.
+    name (str): O nome da coluna.
+    mmap (bool): Se verdadeiro, as posições e os bytes são mapeados em memória.
+    encoding (str): A codificação retornada por `write_strings`.
+    indices (list): As posições desejadas. Padrão: todas.
+
+  Returns:
+    list: Os valores, na ordem de `indices`.
+  """
+  offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode='r' if mmap else None)
+  if indices is None:
+    starts, ends = offsets[:-1].tolist(), offsets[1:].tolist()
+  else:
+    indices = np.asarray(indices, dtype=np.int64)
+    starts, ends = offsets[indices].tolist(), offsets[indices + 1].tolist()
+
+  if offsets[-1] == 0:
+    return [''] * len(starts)
+
+  bytes_path = os.path.join(directory, f"{name}.bytes")
+  if mmap:
+    buffer = memoryview(np.memmap(bytes_path, dtype=np.uint8, mode='r'))
+  else:
+    buffer = memoryview(np.fromfile(bytes_path, dtype=np.uint8))
+
+  if encoding == 'json':
+    return [json.loads(str(buffer[start:end], 'utf-8')) for start, end in zip(starts, ends)]
+  return [str(buffer[start:end], 'utf-8') for start, end in zip(starts, ends)]
+
+
+def string_encoding(meta, name):
+  """A codificação de uma coluna de strings registrada em 'string_encodings' do 'meta.json'."""
+  return meta.get('string_encodings', {}).get(name, 'utf-8')
+
+
+def new_author_registry():
+  """
+  Cria um registro de autores vazio. O registro associa cada ID de autor (URL do OpenAlex)
+  a uma chave inteira estável de 32 bits (sua posição na coluna 'authors_ids'). Os atributos
+  dos autores não ficam no registro, e sim em cada grafo ou índice temporal, pois o mesmo
+  autor pode ter atributos diferentes em bases diferentes (ex.: a instituição).
+
+  Returns:
+    AuthorRegistry: O registro vazio.
+  """
+  return AuthorRegistry({}, [])
+
+
+def intern_author(registry, author_id):
+  """
+  Retorna a chave de um autor no registro, incluindo o autor se ele ainda não estiver
+  presente. Autores já registrados mantêm a chave.
+
+  Args:
+    registry (AuthorRegistry): O registro de autores.
+    author_id (str): O ID do autor.
+
+  Returns:
+    int: A chave do autor.
+  """
+  key = registry.index.get(author_id)
+  if key is not None:
+    return key
+
+  key = len(registry.authors_ids)
+  if key > np.iinfo(AUTHOR_KEY_DTYPE).max:
+    raise ValueError(f"O registro de autores comporta no máximo {np.iinfo(AUTHOR_KEY_DTYPE).max + 1} autores.")
+
+  registry.index[author_id] = key
+  registry.authors_ids.append(author_id)
+  return key
+
+
+def author_keys(registry, authors_ids):
+  """
+  Converte IDs de autores nas suas chaves do registro.
+
+  Args:
+    registry (AuthorRegistry): O registro de autores.
+    authors_ids (list): Os IDs dos autores, todos registrados.
+
+  Returns:
+    np.ndarray: As chaves (int32), na ordem de `authors_ids`.
+  """
+  return np.fromiter((registry.index[author_id] for author_id in authors_ids), dtype=AUTHOR_KEY_DTYPE, count=len(authors_ids))
+
+
+def _replace_strings(directory, name, values):
+  """
+  Regrava uma coluna de `write_strings` trocando os arquivos já existentes: os bytes são
+  trocados antes das posições. Como o registro só cresce no fim, um leitor concorrente vê
+  a coluna antiga ou a nova, nunca posições que apontem para fora dos bytes.
+
+  Returns:
+    str: A codificação da coluna (ver `write_strings`).
+  """
+  temporary_dir = tempfile.mkdtemp(dir=directory)
+  try:
+    encoding = write_strings(temporary_dir, name, values)
+    os.replace(os.path.join(temporary_dir, f"{name}.bytes"), os.path.join(directory, f"{name}.bytes"))
+    os.replace(os.path.join(temporary_dir, f"{name}.offsets.npy"), os.path.join(directory, f"{name}.offsets.npy"))
+  finally:
+    shutil.rmtree(temporary_dir, ignore_errors=True)
+  return encoding
+
+
+def write_author_registry(registry, path):
+  """
+  Grava o registro de autores em um diretório (por convenção com a extensão '.registry'),
+  com os IDs em uma coluna de strings.
+
+  Args:
+    registry (AuthorRegistry): O registro de autores.
+    path (str): O diretório de saída.
+  """
+  os.makedirs(path, exist_ok=True)
+
+  encodings = {'authors_ids': _replace_strings(path, 'authors_ids', registry.authors_ids)}
+
+  temporary_path = os.path.join(path, f"meta.json.{os.getpid()}.tmp")
+  with open(temporary_path, 'w', encoding='utf-8') as f:
+    json.dump({
+      'version': AUTHOR_REGISTRY_VERSION,
+      'num_authors': len(registry.authors_ids),
+      'string_encodings': {name: encoding for name, encoding in encodings.items() if encoding != 'utf-8'}
+    }, f, ensure_ascii=False, indent=2)
+  os.replace(temporary_path, os.path.join(path, 'meta.json'))
+
+
+def read_store_meta(path, version_field, version):
+  """
+  Lê o 'meta.json' de um diretório gravado neste módulo (grafo, registro de autores ou índice
+  temporal), recusando os gravados em outra versão do formato.
+
+  Args:
+    path (str): O diretório.
+    version_field (str): O campo do 'meta.json' com a versão do formato.
+    version (int): A versão esperada.
+
+  Returns:
+    dict: O conteúdo do 'meta.json'.
+
+  Raises:
+    ValueError: Se o diretório foi gravado em outra versão do formato.
+  """
+  with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+    meta = json.load(f)
+
+  if meta.get(version_field) != version:
+    raise ValueError(f"'{path}' foi gravado na versão {meta.get(version_field)} do formato; esta versão lê apenas a {version}. Gere o arquivo novamente.")
+  return meta
+
+
+def read_author_registry(path, mmap=True):
+  """
+  Lê um registro de autores gravado por `write_author_registry`.
+
+  Args:
+    path (str): O diretório do registro.
+    mmap (bool): Se verdadeiro, a coluna é lida por mapeamento em memória.
+
+  Returns:
+    AuthorRegistry: O registro.
+  """
+  meta_path = os.path.join(path, 'meta.json')
+  if not os.path.exists(meta_path):
+    raise FileNotFoundError(2, 'Registro de autores não encontrado', path)
+
+  meta = read_store_meta(path, 'version', AUTHOR_REGISTRY_VERSION)
+  authors_ids = read_strings(path, 'authors_ids', mmap=mmap, encoding=string_encoding(meta, 'authors_ids'))[:meta['num_authors']]
+  return AuthorRegistry({author_id: key for key, author_id in enumerate(authors_ids)}, authors_ids)
+
+
+@contextmanager
+def open_author_registry(path):
+  """
+  Abre um registro de autores para inclusão de novos autores: o registro é lido (ou criado)
+  com um bloqueio exclusivo, que impede que outros processos o alterem ao mesmo tempo, e
+  gravado ao final do bloco `with`.
+
+  Args:
+    path (str): O diretório do registro.
+
+  Yields:
+    AuthorRegistry: O registro.
+  """
+  os.makedirs(path, exist_ok=True)
+  with open(os.path.join(path, '.lock'), 'w') as lock:
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    try:
+      registry = read_author_registry(path) if os.path.exists(os.path.join(path, 'meta.json')) else new_author_registry()
+      num_authors = len(registry.authors_ids)
+      yield registry
+      if len(registry.authors_ids) != num_authors or num_authors == 0:
+        write_author_registry(registry, path)
+    finally:
+      fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def is_graph_store(path):
+  """Indica se o caminho é um diretório no formato binário de `write_graph_store`."""
+  return os.path.isdir(path) and os.path.exists(os.path.join(path, 'meta.json'))
+
+
+def _registry_path(path, meta):
+  """O caminho do registro de autores de um grafo gravado com registro (ou None)."""
+  if not meta.get('registry'):
+    return None
+  return os.path.normpath(os.path.join(path, meta['registry']))
+
+
+def write_graph_store(graph, path, registry=None, registry_path=None):
+  """
+  Grava um grafo no formato binário: um diretório com as arestas como vetores de índices
+  inteiros, os pesos e uma tabela colunar com os atributos dos vértices.
+
+  Conteúdo do diretório:
+    - 'meta.json': versão do formato, contagens e nomes dos atributos.
+    - 'node_ids.*': os IDs dos vértices (o índice de cada vértice é a sua posição).
+    - 'edges_source.npy' e 'edges_target.npy': índices das extremidades de cada aresta (int32).
+    - 'edges_weight.npy': peso de cada aresta (pesos inteiros não negativos no menor tipo sem sinal que os comporta).
+    - 'attr_<atributo>.*': uma coluna de strings por atributo dos vértices. Colunas com valores
+      que não são strings (ex.: IDs inteiros ou atributos numéricos) são gravadas como JSON e
+      registradas em 'string_encodings' do 'meta.json', de modo que os tipos são preservados.
+      Vértices sem o atributo ficam com null, e a leitura não cria o atributo para eles.
+
+  Com um registro de autores, os IDs não são repetidos em cada grafo: os vértices são gravados
+  como chaves do registro em 'node_keys.npy' (int32), e 'meta.json' guarda o caminho relativo
+  do registro, de onde os IDs são lidos. Os atributos continuam no grafo.
+
+  Args:
+    graph (nx.Graph): O grafo NetworkX a ser gravado.
+    path (str): O diretório de saída (por convenção com a extensão '.graph').
+    registry (AuthorRegistry): O registro de autores (ver `open_author_registry`). Vértices
+      ainda não registrados são incluídos nele; cabe a quem chama gravar o registro.
+    registry_path (str): O diretório do registro. Obrigatório com `registry`.
+  """
+  os.makedirs(path, exist_ok=True)
+
+  node_ids = list(graph.nodes())
+  node_index = {node_id: index for index, node_id in enumerate(node_ids)}
+
+  attribute_names = []
+  for _, attributes in graph.nodes(data=True):
+    for attribute_name in attributes:
+      if attribute_name not in attribute_names:
+        attribute_names.append(attribute_name)
+
+  edges = list(graph.edges(data='weight', default=1))
+  sources = np.fromiter((node_index[u] for u, _, _ in edges), dtype=np.int32, count=len(edges))
+  targets = np.fromiter((node_index[v] for _, v, _ in edges), dtype=np.int32, count=len(edges))
+  weights = np.asarray([weight for _, _, weight in edges])
+  if weights.dtype == object or len(edges) == 0:
+    weights = weights.astype(np.float64)
+  elif weights.dtype.kind in 'iu' and weights.min() >= 0:
+    weights = weights.astype(np.min_scalar_type(int(weights.max())))
+
+  for file_name in os.listdir(path):
+    if file_name.startswith(('node_ids.', 'node_keys.', 'attr_')):
+      os.remove(os.path.join(path, file_name))
+
+  np.save(os.path.join(path, 'edges_source.npy'), sources)
+  np.save(os.path.join(path, 'edges_target.npy'), targets)
+  np.save(os.path.join(path, 'edges_weight.npy'), weights)
+
+  meta = {
+    'format_version': GRAPH_STORE_VERSION,
+    'num_nodes': len(node_ids),
+    'num_edges': len(edges),
+    'node_attributes': attribute_names
+  }
+
+  encodings = {}
+  if registry is not None:
+    keys = np.fromiter((intern_author(registry, node_id) for node_id in node_ids), dtype=AUTHOR_KEY_DTYPE, count=len(node_ids))
+    np.save(os.path.join(path, 'node_keys.npy'), keys)
+    meta['registry'] = os.path.relpath(registry_path, path)
+  else:
+    encodings['node_ids'] = write_strings(path, 'node_ids', node_ids)
+
+  for attribute_name in attribute_names:
+    values = [attributes.get(attribute_name) for _, attributes in graph.nodes(data=True)]
+    encodings[f"attr_{attribute_name}"] = write_strings(path, f"attr_{attribute_name}", values)
+  meta['string_encodings'] = {name: encoding for name, encoding in encodings.items() if encoding != 'utf-8'}
+
+  with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+    json.dump(meta, f, ensure_ascii=False, indent=4)
+
+
+def read_registry_ids(registry_path, keys, mmap=True):
+  """
+  Lê do registro de autores apenas os IDs das chaves `keys`, pelas posições mapeadas em
+  memória, sem decodificar o registro inteiro.
+
+  Args:
+    registry_path (str): O diretório do registro.
+    keys (np.ndarray): As chaves dos autores.
+    mmap (bool): Se verdadeiro, a coluna é lida por mapeamento em memória.
+
+  Returns:
+    list: Os IDs dos autores, na ordem de `keys`.
+  """
+  registry_meta = read_store_meta(registry_path, 'version', AUTHOR_REGISTRY_VERSION)
+  return read_strings(registry_path, 'authors_ids', mmap=mmap, encoding=string_encoding(registry_meta, 'authors_ids'), indices=keys)
+
+
+def load_graph_arrays(path, mmap=True, interned=False):
+  """
+  Carrega os vetores de um grafo gravado por `write_graph_store`, sem montar o grafo NetworkX.
+
+  Args:
+    path (str): O diretório do grafo.
+    mmap (bool): Se verdadeiro, os vetores de arestas são mapeados em memória (somente leitura).
+    interned (bool): Se verdadeiro e o grafo usar um registro de autores, 'node_ids' traz as
+      chaves inteiras do registro, que não chega a ser lido.
+
+  Returns:
+    dict: Dicionário com 'meta', 'node_ids' (lista), 'node_keys' (chaves do registro de
+      autores, ou None se o grafo não usar registro), 'sources', 'targets' e 'weights'.
+  """
+  meta = read_store_meta(path, 'format_version', GRAPH_STORE_VERSION)
+
+  mmap_mode = 'r' if mmap else None
+  registry_path = _registry_path(path, meta)
+  if registry_path:
+    node_keys = np.load(os.path.join(path, 'node_keys.npy'))
+    node_ids = node_keys.tolist() if interned else read_registry_ids(registry_path, node_keys, mmap=mmap)
+  else:
+    node_keys = None
+    node_ids = read_strings(path, 'node_ids', mmap=mmap, encoding=string_encoding(meta, 'node_ids'))
+
+  return {
+    'meta': meta,
+    'node_ids': node_ids,
+    'node_keys': node_keys,
+    'sources': np.load(os.path.join(path, 'edges_source.npy'), mmap_mode=mmap_mode),
+    'targets': np.load(os.path.join(path, 'edges_target.npy'), mmap_mode=mmap_mode),
+    'weights': np.load(os.path.join(path, 'edges_weight.npy'), mmap_mode=mmap_mode)
+  }
+
+
+def load_node_attributes(path, attribute_names=None, mmap=True):
+  """
+  Lê colunas da tabela de atributos dos vértices.
+
+  Args:
+    path (str): O diretório do grafo.
+    attribute_names (list): Os atributos desejados. Padrão: todos.
+    mmap (bool): Se verdadeiro, as colunas são lidas por mapeamento em memória.
+
+  Returns:
+    dict: Dicionário onde as chaves são os nomes dos atributos e os valores são listas
+      alinhadas com os IDs dos vértices (None onde o vértice não tem o atributo).
+  """
+  meta = read_store_meta(path, 'format_version', GRAPH_STORE_VERSION)
+
+  attribute_names = meta['node_attributes'] if attribute_names is None else attribute_names
+  return {
+    name: read_strings(path, f"attr_{name}", mmap=mmap, encoding=string_encoding(meta, f"attr_{name}"))
+    for name in attribute_names
+  }
+
+
+def load_csr_graph(path, interned=False):
+  """
+  Monta diretamente a representação CSR (`csr_util.CSRGraph`) de um grafo gravado,
+  sem passar pelo NetworkX.
+
+  Args:
+    path (str): O diretório do grafo.
+    interned (bool): Se verdadeiro e o grafo usar um registro de autores, os vértices são
+      identificados pelas chaves inteiras do registro, sem ler os IDs; as métricas e os
+      ataques calculados sobre ele são traduzidos para os IDs só na exportação
+      (`export_node_ids`).
+
+  Returns:
+    CSRGraph: A matriz de adjacência simétrica com os pesos e a lista de IDs (ou chaves) dos vértices.
+  """
+  arrays = load_graph_arrays(path, interned=interned)
+  node_ids = arrays['node_ids']
+  num_nodes = len(node_ids)
+  sources, targets = np.asarray(arrays['sources']), np.asarray(arrays['targets'])
+  weights = np.asarray(arrays['weights'], dtype=np.float64)
+
+  loops = sources == targets
+  rows = np.concatenate([sources, targets[~loops]])
+  columns = np.concatenate([targets, sources[~loops]])
+  data = np.concatenate([weights, weights[~loops]])
+
+  adjacency = sp.csr_matrix((data, (rows, columns)), shape=(num_nodes, num_nodes))
+  return CSRGraph(adjacency, node_ids)
+
+
+def read_csr_graph(path, interned=False):
+  """
+  Lê um grafo em GEXF ou no formato binário direto na representação CSR, para quem não precisa
+  do grafo NetworkX (métricas com o backend 'csr', ataques e falhas aleatórias). No formato
+  binário, o grafo é montado por `load_csr_graph`, sem passar pelo NetworkX.
+
+  Args:
+    path (str): Arquivo '.gexf' ou diretório do formato binário.
+    interned (bool): Ver `load_csr_graph`. Sem registro de autores, os vértices são os IDs.
+
+  Returns:
+    CSRGraph: O grafo em CSR, com os vértices na mesma ordem de `read_graph`.
+  """
+  if is_graph_store(path):
+    return load_csr_graph(path, interned=interned)
+  return to_csr(read_graph(path))
+
+
+def _graph_registry_path(path):
+  """O registro de autores de um grafo no formato binário gravado com registro (ou None)."""
+  if not is_graph_store(path):
+    return None
+  return _registry_path(path, read_store_meta(path, 'format_version', GRAPH_STORE_VERSION))
+
+
+def export_node_ids(path, nodes):
+  """
+  Traduz vértices de `read_csr_graph(path, interned=True)` para os IDs dos autores, lendo do
+  registro apenas as chaves pedidas.
+
+  Args:
+    path (str): O grafo lido.
+    nodes (list): Os vértices (chaves do registro, se o grafo usar um).
+
+  Returns:
+    list: Os IDs dos autores, na ordem de `nodes`. Sem registro, os vértices já são os IDs e
+    `nodes` é retornado como está.
+  """
+  registry_path = _graph_registry_path(path)
+  if registry_path is None:
+    return nodes
+  return read_registry_ids(registry_path, np.asarray(nodes, dtype=np.int64))
+
+
+def node_keys_by_id(path, node_ids):
+  """
+  O caminho inverso de `export_node_ids`: as chaves do registro de IDs de autores (ex.: de
+  métricas gravadas em disco) para um grafo lido com `read_csr_graph(path, interned=True)`.
+
+  Args:
+    path (str): O grafo lido.
+    node_ids (iterable): Os IDs dos autores.
+
+  Returns:
+    dict: Dicionário de cada ID do grafo presente em `node_ids` para a sua chave, ou None se o
+    grafo não usar registro (os vértices já são os IDs).
+  """
+  registry_path = _graph_registry_path(path)
+  if registry_path is None:
+    return None
+  node_keys = np.load(os.path.join(path, 'node_keys.npy'))
+  wanted = set(node_ids)
+  return {
+    author_id: key
+    for author_id, key in zip(read_registry_ids(registry_path, node_keys), node_keys.tolist())
+    if author_id in wanted
+  }
+
+
+def read_graph_store(path):
+  """
+  Lê um grafo gravado por `write_graph_store` como grafo NetworkX, com os mesmos
+  vértices, atributos, arestas e pesos do grafo original.
+
+  Args:
+    path (str): O diretório do grafo.
+
+  Returns:
+    nx.Graph: O grafo NetworkX.
+  """
+  arrays = load_graph_arrays(path)
+  edges = zip(arrays['sources'].tolist(), arrays['targets'].tolist(), arrays['weights'].tolist())
+
+  node_ids = arrays['node_ids']
+  attributes = load_node_attributes(path)
+  attribute_names = list(attributes)
+
+  graph = nx.Graph()
+  graph.add_nodes_from(
+    (node_id, {name: attributes[name][index] for name in attribute_names if attributes[name][index] is not None})
+    for index, node_id in enumerate(node_ids)
+  )
+
+  graph.add_weighted_edges_from((node_ids[u], node_ids[v], weight) for u, v, weight in edges)
+  return graph
+
+
+def read_graph(path):
+  """
+  Lê um grafo em GEXF ou no formato binário, escolhendo o leitor pelo caminho.
+
+  Args:
+    path (str): Arquivo '.gexf' ou diretório do formato binário.
+
+  Returns:
+    nx.Graph: O grafo NetworkX.
+  """
+  if is_graph_store(path):
+    return read_graph_store(path)
+  if not os.path.exists(path):
+    raise FileNotFoundError(2, 'Arquivo de grafo não encontrado', path)
+  return nx.read_gexf(path)
+
+
+def write_graph(graph, path, registry=None, registry_path=None):
+  """
+  Grava um grafo em GEXF (caminho terminado em '.gexf', para uso no Gephi) ou no
+  formato binário (qualquer outro caminho).
+
+  Args:
+    graph (nx.Graph): O grafo NetworkX.
+    path (str): O caminho de saída.
+    registry (AuthorRegistry) e registry_path (str): Registro de autores do formato binário
+      (ver `write_graph_store`). O GEXF sempre leva os IDs e atributos completos.
+  """
+  if path.endswith('.gexf'):
+    nx.write_gexf(graph, path)
+  else:
+    write_graph_store(graph, path, registry=registry, registry_path=registry_path)
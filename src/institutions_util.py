@@ -1,65 +1,162 @@
+import numpy as np
 import pandas as pd
 import re
-from collections import defaultdict
-from itertools import combinations
+from collections import defaultdict, namedtuple
 from src.json_resolver import json_string_to_dict
 
-def parse_institutions_string(institutions_str):
+INSTITUTIONS_SOURCE_COLUMNS = ['authorships.institutions']
+
+InstitutionTable = namedtuple('InstitutionTable', ['index', 'ids', 'display_names', 'country_codes'])
+
+_INSTITUTION_PATTERN = re.compile(r"\{[^}]+\}")
+
+
+def new_institution_table():
+  """
+  Cria uma tabela de instituições vazia. A tabela associa cada string de instituição
+  a um código inteiro (sua posição nas colunas 'ids', 'display_names' e 'country_codes'),
+  de forma que cada string distinta seja analisada uma única vez.
+
+  Returns:
+    InstitutionTable: A tabela vazia.
+  """
+  return InstitutionTable({}, [], [], [])
+
+
+def intern_institution(table, institution_str):
+  """
+  Retorna o código de uma string de instituição na tabela, analisando e incluindo a
+  instituição se ela ainda não estiver presente.
+
+  Args:
+    table (InstitutionTable): A tabela de instituições.
+    institution_str (str): A representação em string do dicionário da instituição.
+
+  Returns:
+    int: O código da instituição. Strings que não puderem ser analisadas também recebem
+    um código, com os campos nulos.
+  """
+  code = table.index.get(institution_str)
+  if code is not None:
+    return code
+
+  institution = json_string_to_dict(institution_str) or {}
+  code = len(table.ids)
+  table.index[institution_str] = code
+  table.ids.append(institution.get('id'))
+  table.display_names.append(institution.get('display_name'))
+  table.country_codes.append(institution.get('country_code'))
+  return code
+
+
+def institution_codes(table, institutions_str):
+  """
+  Retorna os códigos, na tabela, das instituições de uma string de trabalho, incluindo na
+  tabela as que ainda não estiverem presentes.
+
+  Args:
+    table (InstitutionTable): A tabela de instituições.
+    institutions_str (str): Uma string contendo uma ou mais representações em string
+    de dicionários de instituições.
+
+  Returns:
+    list: Os códigos das instituições, na ordem em que aparecem. Valores nulos (None ou NaN)
+    resultam em uma lista vazia.
+  """
+  if not isinstance(institutions_str, str):
+    return []
+  return [intern_institution(table, match_str) for match_str in _INSTITUTION_PATTERN.findall(institutions_str)]
+
+
+def parse_institutions_string(institutions_str, institution_table=None):
   """
   Analisa uma string contendo dicionários de instituições e retorna um conjunto de nomes de exibição de instituições únicos.
+  Os nomes vêm da tabela de instituições (`intern_institution`), de forma que cada dicionário
+  distinto seja analisado uma única vez por tabela.
 
   Args:
     institutions_str (str): Uma string contendo uma ou mais representações em string
     de dicionários de instituições. Cada dicionário deve
     incluir uma chave 'display_name'.
+    institution_table (InstitutionTable): Tabela de instituições a ser reaproveitada entre
+      chamadas. Padrão: uma tabela nova.
 
   Returns:
     set: Um conjunto de strings, onde cada string é o 'display_name' único de uma
-    instituição extraída da string de entrada.
+    instituição extraída da string de entrada. Valores nulos (None ou NaN) resultam em um conjunto vazio.
   """
-  if institutions_str is None:
-    return set()
-  institutions_in_paper = set()
-  matches = re.findall(r"\{[^}]+\}", institutions_str)
-  
-  for match_str in matches:
-    inst_dict = json_string_to_dict(match_str)
-    institutions_in_paper.add(inst_dict['display_name'])
-
-  return institutions_in_paper
+  table = new_institution_table() if institution_table is None else institution_table
+  names = (table.display_names[code] for code in institution_codes(table, institutions_str))
+  return {name for name in names if name is not None}
 
 
-def count_institutions(df):
+def count_institutions(df, institution_table=None):
   """
   Calcula o número de trabalhos em que cada instituição está presente.
 
   Args:
     df (pd.DataFrame): O DataFrame de entrada com uma coluna 'authorships.institutions'.
+    institution_table (InstitutionTable): Tabela de instituições a ser reaproveitada entre
+      chamadas, por exemplo entre os blocos de um CSV. Padrão: uma tabela nova.
 
   Returns:
     dict: Um dicionário onde as chaves são os nomes de exibição das instituições e os valores
     são a contagem de trabalhos em que elas estão presentes.
   """
+  table = new_institution_table() if institution_table is None else institution_table
   institution_counts = defaultdict(int)
 
-  for _, row in df.iterrows():
-    institutions_str = row['authorships.institutions']
-    institutions_in_paper = parse_institutions_string(institutions_str)
-
-    for institution_name in institutions_in_paper:
-      institution_counts[institution_name] += 1
+  for institutions_str, count in df['authorships.institutions'].value_counts().items():
+    for institution_name in parse_institutions_string(institutions_str, table):
+      institution_counts[institution_name] += count
 
   return dict(institution_counts)
 
 
-def analyze_institution_papers(df, target_institutions):
+def institution_masks(df, target_institutions, institution_table=None):
+  """
+  Codifica cada trabalho como uma máscara de bits sobre as instituições alvo: o bit `i`
+  indica a presença da instituição `target_institutions[i]`.
+
+  Args:
+    df (pd.DataFrame): O DataFrame de entrada com uma coluna 'authorships.institutions'.
+    target_institutions (list): A lista de instituições alvo (no máximo 63).
+    institution_table (InstitutionTable): Tabela de instituições a ser reaproveitada entre
+      chamadas. Padrão: uma tabela nova.
+
+  Returns:
+    np.ndarray: Um vetor uint64 com a máscara de cada trabalho, na ordem do DataFrame.
+  """
+  if len(target_institutions) > 63:
+    raise ValueError(f"São suportadas no máximo 63 instituições alvo, mas foram informadas {len(target_institutions)}.")
+
+  table = new_institution_table() if institution_table is None else institution_table
+  bits = {institution_name: 1 << i for i, institution_name in enumerate(target_institutions)}
+  institutions_column = df['authorships.institutions'].fillna('')
+
+  unique_masks = {}
+  for institutions_str in institutions_column.unique():
+    mask = 0
+    for code in institution_codes(table, institutions_str):
+      mask |= bits.get(table.display_names[code], 0)
+    unique_masks[institutions_str] = mask
+
+  return institutions_column.map(unique_masks).to_numpy(dtype=np.uint64)
+
+
+def analyze_institution_papers(df, target_institutions, institution_table=None):
   """
   Analisa os trabalhos quanto à exclusividade de cada instituição alvo, à coocorrência de todas as instituições alvo
   e à coocorrência de todas as combinações de instituições alvo.
 
+  Cada trabalho é codificado como uma máscara de bits (`institution_masks`) e as contagens saem
+  de um único histograma das máscaras, então o custo não cresce com o número de combinações possíveis.
+
   Args:
     df (pd.DataFrame): O DataFrame de entrada com uma coluna 'authorships.institutions'.
     target_institutions (list): Uma lista de nomes de instituições a serem analisadas.
+    institution_table (InstitutionTable): Tabela de instituições a ser reaproveitada entre
+      chamadas. Padrão: uma tabela nova.
 
   Returns:
     dict: Um dicionário contendo:
@@ -69,49 +166,73 @@ def analyze_institution_papers(df, target_institutions):
     está presente, e nenhuma outra instituição da mesma lista está presente.
     - 'all_present_papers': A contagem de trabalhos onde TODAS as instituições da lista
     `target_institutions` estão presentes.
-    - 'combinations_present_papers': Um dicionário onde as chaves são tuplas de instituições
-    (representando uma combinação) e os valores são a contagem de trabalhos onde TODAS
-    as instituições dessa combinação estão presentes.
+    - 'combinations_present_papers': Um dicionário onde as chaves são as instituições de cada
+    combinação (em ordem alfabética, separadas por ", ") e os valores são a contagem de trabalhos
+    onde TODAS as instituições dessa combinação estão presentes. Combinações sem trabalhos são omitidas.
+  """
+  sorted_targets = sorted(set(target_institutions))
+  masks, counts = np.unique(institution_masks(df, sorted_targets, institution_table), return_counts=True)
+  mask_counts = dict(zip(masks.tolist(), counts.tolist()))
+
+  exclusive_papers_per_institution = {}
+  for institution_name in target_institutions:
+    count = mask_counts.get(1 << sorted_targets.index(institution_name), 0)
+    if count:
+      exclusive_papers_per_institution[institution_name] = count
+
+  full_mask = (1 << len(sorted_targets)) - 1
+  all_present_papers_count = mask_counts.get(full_mask, 0) if sorted_targets else len(df)
+
+  # Soma a contagem de cada máscara observada em todas as suas submáscaras com 2 ou mais bits
+  combinations_counts = defaultdict(int)
+  for mask, count in mask_counts.items():
+    submask = mask
+    while submask:
+      if submask & (submask - 1):
+        combinations_counts[submask] += count
+      submask = (submask - 1) & mask
+
+  combinations_present_papers = {}
+  for combo_mask in sorted(combinations_counts, key=lambda combo_mask: _mask_order(combo_mask, len(sorted_targets))):
+    combo = [institution_name for i, institution_name in enumerate(sorted_targets) if combo_mask >> i & 1]
+    combinations_present_papers[", ".join(combo)] = combinations_counts[combo_mask]
+
+  return {
+    'exclusive_papers_per_institution': exclusive_papers_per_institution,
+    'all_present_papers': all_present_papers_count,
+    'combinations_present_papers': combinations_present_papers
+  }
+
+
+def _mask_order(mask, num_bits):
+  """Chave de ordenação das combinações: primeiro pelo tamanho, depois na ordem de `itertools.combinations`."""
+  return (bin(mask).count('1'), [i for i in range(num_bits) if mask >> i & 1])
+
+
+def merge_institution_analyses(analyses):
+  """
+  Soma os resultados de `analyze_institution_papers` calculados sobre partes de um mesmo
+  conjunto de trabalhos (por exemplo, os blocos de um CSV lido em partes).
+
+  Args:
+    analyses (list): Os dicionários retornados por `analyze_institution_papers`.
+
+  Returns:
+    dict: Um dicionário no mesmo formato de `analyze_institution_papers`, com as contagens somadas.
   """
   exclusive_papers_per_institution = defaultdict(int)
   all_present_papers_count = 0
   combinations_present_papers = defaultdict(int)
 
-  target_institutions_set = set(target_institutions)
-
-  all_target_combinations = []
-  for i in range(2, len(target_institutions) + 1):
-    all_target_combinations.extend(combinations(sorted(target_institutions), i))
-
-  print('all')
-  print(all_target_combinations)
-
-  for _, row in df.iterrows():
-    institutions_str = row['authorships.institutions']
-    institutions_in_paper = parse_institutions_string(institutions_str)
-    
-    if target_institutions_set.issubset(institutions_in_paper):
-      all_present_papers_count += 1
-
-    for institution_name in target_institutions:
-      if institution_name in institutions_in_paper:
-        other_target_institutions_set = target_institutions_set - {institution_name}
-        
-        if other_target_institutions_set.isdisjoint(institutions_in_paper):
-          exclusive_papers_per_institution[institution_name] += 1
-          
-    for combo in all_target_combinations:
-      combo_set = set(combo)
-      if combo_set.issubset(institutions_in_paper):
-        combinations_present_papers[combo] += 1
-
-  combinations_present_papers_str_keys = {
-        ", ".join(combo): count
-        for combo, count in combinations_present_papers.items()
-    }   
-  
+  for analysis in analyses:
+    for institution_name, count in analysis['exclusive_papers_per_institution'].items():
+      exclusive_papers_per_institution[institution_name] += count
+    all_present_papers_count += analysis['all_present_papers']
+    for combo, count in analysis['combinations_present_papers'].items():
+      combinations_present_papers[combo] += count
+
   return {
     'exclusive_papers_per_institution': dict(exclusive_papers_per_institution),
     'all_present_papers': all_present_papers_count,
-    'combinations_present_papers': combinations_present_papers_str_keys
-  }
\ No newline at end of file
+    'combinations_present_papers': dict(combinations_present_papers)
+  }
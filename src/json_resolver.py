@@ -1,24 +1,92 @@
 import ast
+import re
+from functools import lru_cache
 
-def json_string_to_dict(string_input) -> dict:
-  """
-  Converte uma string que se parece com um dicionário Python ou JSON
-  em um dicionário Python.
+DICT_STRING_CACHE_SIZE = 65536
 
-  Args:
-    string_input: A string contendo o código que se assemelha a um dicionário ou JSON.
+_STRING = r"'[^'\\]*'|\"[^\"'\\]*'[^\"\\]*\""
+_PAIR = re.compile(
+  r"(?P<key>'[^'\\]*'): (?:(?P<string>" + _STRING + r")|(?P<constant>None|True|False)|(?P<integer>-?\d+)"
+  r"|\[(?P<list>(?:" + _STRING + r")(?:, (?:" + _STRING + r"))*)?\])"
+)
+_LIST_ITEM = re.compile(_STRING)
+_CONSTANTS = {'None': None, 'True': True, 'False': False}
+
+
+def _fast_dict(string_input):
+  """
+  Analisa diretamente o formato mais comum dos dicionários do OpenAlex: chaves de texto e
+  valores de texto sem escapes, None/True/False, inteiros ou listas de textos.
 
   Returns:
-    Um dicionário Python.
+    dict: O dicionário, igual ao de `ast.literal_eval`, ou None se a string sair desse formato.
   """
+  if not string_input.startswith('{') or not string_input.endswith('}'):
+    return None
+
+  result = {}
+  position, end = 1, len(string_input) - 1
+
+  while position < end:
+    match = _PAIR.match(string_input, position)
+    if match is None:
+      return None
+
+    if match.group('string') is not None:
+      value = match.group('string')[1:-1]
+    elif match.group('constant') is not None:
+      value = _CONSTANTS[match.group('constant')]
+    elif match.group('integer') is not None:
+      value = int(match.group('integer'))
+    else:
+      items = match.group('list')
+      value = [item[1:-1] for item in _LIST_ITEM.findall(items)] if items else []
+
+    result[match.group('key')[1:-1]] = value
+    position = match.end()
+
+    if position < end:
+      if not string_input.startswith(', ', position):
+        return None
+      position += 2
+
+  return result
+
+
+@lru_cache(maxsize=DICT_STRING_CACHE_SIZE)
+def _cached_string_to_dict(string_input):
+  """Versão memorizada de `json_string_to_dict`. O dicionário retornado é compartilhado e não deve ser alterado."""
   string_processada = string_input.replace('\u2013', '-')
+
+  result = _fast_dict(string_processada)
+  if result is not None:
+    return result
+
   try:
     result = ast.literal_eval(string_processada)
 
     if not isinstance(result, dict):
       raise ValueError("A string não representa um dicionário válido. Tipo retornado: {}".format(type(result).__name__))
-    
+
     return result
   except (ValueError, SyntaxError) as e:
     print(f"Erro ao codificar a string '{string_input}': {e}")
-  
\ No newline at end of file
+
+
+def json_string_to_dict(string_input) -> dict:
+  """
+  Converte uma string que se parece com um dicionário Python ou JSON
+  em um dicionário Python.
+
+  Strings no formato usual do OpenAlex são analisadas sem `ast.literal_eval`, e os
+  resultados ficam em um cache limitado a `DICT_STRING_CACHE_SIZE` strings, pois as
+  mesmas instituições se repetem em muitos trabalhos.
+
+  Args:
+    string_input: A string contendo o código que se assemelha a um dicionário ou JSON.
+
+  Returns:
+    Um dicionário Python.
+  """
+  result = _cached_string_to_dict(string_input)
+  return dict(result) if result is not None else None
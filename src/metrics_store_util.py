@@ -0,0 +1,239 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.graph_store_util import write_strings, read_strings, string_encoding, export_node_ids, node_keys_by_id
+
+METRICS_STORE_EXTENSION = '.metrics'
+METRICS_STORE_VERSION = 1
+
+METRICS_OUTPUT_FORMATS = {
+  'json': ['.json'],
+  'columnar': [METRICS_STORE_EXTENSION],
+  'both': ['.json', METRICS_STORE_EXTENSION]
+}
+
+NODE_METRICS = [
+  'degrees',
+  'local_clustering_coefficient',
+  'weighted_local_clustering_coefficient',
+  'betweenness_centrality',
+  'closeness_centrality',
+  'eigenvector_centrality'
+]
+
+
+def is_metrics_store(path):
+  """Indica se o caminho é um diretório no formato colunar de `write_metrics_store`."""
+  return os.path.isdir(path) and os.path.exists(os.path.join(path, 'summary.json'))
+
+
+def resolve_metrics_path(metrics_path):
+  """
+  Prefere a versão colunar ('.metrics') de um caminho JSON de métricas, se ela existir e não
+  for mais antiga que o JSON (ex.: quando o JSON foi regravado depois só com `--output-format json`).
+  """
+  root, extension = os.path.splitext(metrics_path)
+  store_path = f"{root}{METRICS_STORE_EXTENSION}"
+  if extension != '.json' or not is_metrics_store(store_path):
+    return metrics_path
+  if os.path.exists(metrics_path) and os.path.getmtime(os.path.join(store_path, 'summary.json')) < os.path.getmtime(metrics_path):
+    return metrics_path
+  return store_path
+
+
+def _relabel_node_metrics(metrics, mapping):
+  """Troca os vértices das métricas por vértice (`NODE_METRICS`) segundo `mapping`, descartando os que não estão nele."""
+  return {
+    metric: {mapping[node]: value for node, value in values.items() if node in mapping}
+    if metric in NODE_METRICS and isinstance(values, dict) else values
+    for metric, values in metrics.items()
+  }
+
+
+def export_node_metrics(metrics, graph_path):
+  """
+  Traduz as métricas por vértice de um grafo lido com `read_csr_graph(graph_path, interned=True)`
+  das chaves do registro de autores para os IDs dos autores, para gravação. Sem registro, as
+  métricas são retornadas como estão.
+
+  Args:
+    metrics (dict): As métricas (`network_util.extract_graph_metrics`).
+    graph_path (str): O caminho do grafo.
+
+  Returns:
+    dict: As métricas, com os IDs dos autores como vértices.
+  """
+  nodes = list(dict.fromkeys(
+    node for metric in NODE_METRICS if isinstance(metrics.get(metric), dict) for node in metrics[metric]
+  ))
+  node_ids = export_node_ids(graph_path, nodes)
+  if node_ids is nodes:
+    return metrics
+  return _relabel_node_metrics(metrics, dict(zip(nodes, node_ids)))
+
+
+def import_node_metrics(metrics, graph_path):
+  """
+  O caminho inverso de `export_node_metrics`: traduz métricas gravadas (com os IDs dos autores)
+  para os vértices de `read_csr_graph(graph_path, interned=True)`. Vértices que não estão no
+  grafo são descartados; sem registro, as métricas são retornadas como estão.
+  """
+  nodes = {node for metric in NODE_METRICS if isinstance(metrics.get(metric), dict) for node in metrics[metric]}
+  node_keys = node_keys_by_id(graph_path, nodes)
+  if node_keys is None:
+    return metrics
+  return _relabel_node_metrics(metrics, node_keys)
+
+
+def metrics_output_paths(output_path, output_format):
+  """Os caminhos de saída das métricas para um formato de `METRICS_OUTPUT_FORMATS`, trocando a extensão de `output_path`."""
+  root = os.path.splitext(output_path)[0]
+  return [f"{root}{extension}" for extension in METRICS_OUTPUT_FORMATS[output_format]]
+
+
+def write_metrics_store(metrics, path):
+  """
+  Grava as métricas de um grafo no formato colunar: as métricas por vértice viram colunas
+  alinhadas (uma linha por vértice) e as demais ficam em um pequeno JSON à parte, que pode
+  ser lido sem tocar nas colunas.
+
+  Conteúdo do diretório:
+    - 'summary.json': versão do formato, número de linhas, nomes das colunas e as métricas
+      que não são por vértice (contagens, médias, distribuição de graus etc.).
+    - 'node_ids.*': os IDs dos vértices (a linha de cada vértice é a sua posição).
+    - '<métrica>.npy': uma coluna por métrica de `NODE_METRICS`. Vértices sem valor na
+      métrica ficam com NaN.
+
+  Args:
+    metrics (dict): As métricas, como retornadas por `network_util.extract_graph_metrics`.
+    path (str): O diretório de saída (por convenção com a extensão '.metrics').
+  """
+  os.makedirs(path, exist_ok=True)
+
+  # JSONs antigos guardam "Could not converge" no lugar da centralidade de autovetor
+  node_metrics = [metric for metric in NODE_METRICS if isinstance(metrics.get(metric), dict)]
+  summary_metrics = {metric: value for metric, value in metrics.items() if metric not in node_metrics}
+
+  node_ids = list(dict.fromkeys(node_id for metric in node_metrics for node_id in metrics[metric]))
+  node_index = pd.Index(node_ids)
+
+  for file_name in os.listdir(path):
+    if file_name.endswith('.npy') and file_name[:-4] in NODE_METRICS:
+      os.remove(os.path.join(path, file_name))
+
+  for metric in node_metrics:
+    values = pd.Series(metrics[metric], dtype=None if metrics[metric] else np.float64)
+    column = values.reindex(node_index).to_numpy()
+    if column.dtype == object:
+      column = column.astype(np.float64)
+    np.save(os.path.join(path, f"{metric}.npy"), column)
+  encoding = write_strings(path, 'node_ids', node_ids)
+
+  with open(os.path.join(path, 'summary.json'), 'w', encoding='utf-8') as f:
+    json.dump({
+      'format_version': METRICS_STORE_VERSION,
+      'num_rows': len(node_ids),
+      'node_metrics': node_metrics,
+      'string_encodings': {'node_ids': encoding} if encoding != 'utf-8' else {},
+      'metrics': summary_metrics
+    }, f, ensure_ascii=False, indent=4)
+
+
+def read_metrics_summary(path):
+  """
+  Lê apenas as métricas que não são por vértice, sem carregar as colunas.
+
+  Args:
+    path (str): O diretório das métricas (ou um JSON de métricas, que é lido por inteiro).
+
+  Returns:
+    dict: As métricas, com as mesmas chaves do JSON de métricas.
+  """
+  path = resolve_metrics_path(path)
+  if not is_metrics_store(path):
+    with open(path, 'r', encoding='utf-8') as f:
+      return {metric: value for metric, value in json.load(f).items() if metric not in NODE_METRICS or not isinstance(value, dict)}
+
+  with open(os.path.join(path, 'summary.json'), 'r', encoding='utf-8') as f:
+    return json.load(f)['metrics']
+
+
+def read_node_metrics(path, metrics=None, mmap=True):
+  """
+  Lê colunas de métricas por vértice.
+
+  Args:
+    path (str): O diretório das métricas.
+    metrics (list): As métricas desejadas (de `NODE_METRICS`). Padrão: todas as gravadas.
+    mmap (bool): Se verdadeiro, as colunas são lidas por mapeamento em memória.
+
+  Returns:
+    pd.DataFrame: Uma linha por vértice (índice 'node_id') e uma coluna por métrica.
+  """
+  with open(os.path.join(path, 'summary.json'), 'r', encoding='utf-8') as f:
+    summary = json.load(f)
+
+  metrics = summary['node_metrics'] if metrics is None else metrics
+  missing_metrics = [metric for metric in metrics if metric not in summary['node_metrics']]
+  if missing_metrics:
+    raise KeyError(f"Métricas não encontradas: {', '.join(missing_metrics)}")
+
+  mmap_mode = 'r' if mmap else None
+  return pd.DataFrame(
+    {metric: np.load(os.path.join(path, f"{metric}.npy"), mmap_mode=mmap_mode) for metric in metrics},
+    index=pd.Index(read_strings(path, 'node_ids', mmap=mmap, encoding=string_encoding(summary, 'node_ids')), name='node_id')
+  )
+
+
+def load_metrics(path, node_metrics=None):
+  """
+  Lê as métricas de um grafo no formato do JSON de métricas (as métricas por vértice como
+  dicionários por ID de vértice), a partir do JSON ou do formato colunar (preferido, se
+  existir ao lado do JSON).
+
+  Args:
+    path (str): O caminho do JSON ou do diretório das métricas.
+    node_metrics (list): As métricas por vértice desejadas. Padrão: todas; com uma lista
+      vazia, apenas as demais métricas. No formato colunar, só essas colunas são lidas.
+
+  Returns:
+    dict: As métricas.
+  """
+  path = resolve_metrics_path(path)
+  if not is_metrics_store(path):
+    with open(path, 'r', encoding='utf-8') as f:
+      metrics = json.load(f)
+    if node_metrics is not None:
+      metrics = {
+        metric: value for metric, value in metrics.items()
+        if metric not in NODE_METRICS or not isinstance(value, dict) or metric in node_metrics
+      }
+    return metrics
+
+  with open(os.path.join(path, 'summary.json'), 'r', encoding='utf-8') as f:
+    summary = json.load(f)
+
+  metrics = dict(summary['metrics'])
+  requested = summary['node_metrics'] if node_metrics is None else [metric for metric in node_metrics if metric in summary['node_metrics']]
+  columns = read_node_metrics(path, requested)
+  for metric in requested:
+    values = columns[metric].dropna()
+    metrics[metric] = dict(zip(values.index, values.tolist()))
+  return metrics
+
+
+def write_metrics(metrics, path):
+  """
+  Grava as métricas em JSON (caminho terminado em '.json') ou no formato colunar (qualquer
+  outro caminho).
+
+  Args:
+    metrics (dict): As métricas.
+    path (str): O caminho de saída.
+  """
+  if path.endswith('.json'):
+    with open(path, 'w', encoding='utf-8') as f:
+      json.dump(metrics, f, ensure_ascii=False, indent=4)
+  else:
+    write_metrics_store(metrics, path)
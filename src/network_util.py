@@ -1,34 +1,36 @@
 import networkx as nx
+import numpy as np
 import pandas as pd
-from src.works_util import count_papers_by_year
+import scipy.sparse as sp
+from src.temporal_util import works_incidence, pair_counts, build_temporal_index, evolution_snapshots
 from src.authorship_util import extract_authors_ids
+from src.cache_util import CACHE_MISS, graph_content_hash, load_cached_metric, store_cached_metric
+from src.csr_util import (
+  CSRGraph, DISTANCE_METRICS, extract_graph_metrics_csr, distance_metrics, check_sampling_parameters, to_csr,
+  induced_subgraph, largest_component, global_efficiency, number_of_edges, eigenvector_centrality, local_clustering
+)
 from itertools import combinations
 import operator
 
+COAUTHORSHIP_SOURCE_COLUMNS = ['publication_year', 'authorships.author.id']
 
-def generate_coauthorship_graph(df_works, df_authors):
-  """Gera um grafo de coautoria a partir de DataFrames de trabalhos e autores.
+
+def author_nodes(df_authors):
+  """Monta os atributos dos vértices de cada autor do DataFrame de autores.
 
   Args:
-    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
     df_authors (pd.DataFrame): DataFrame contendo informações sobre os autores.
 
   Returns:
-    nx.Graph: Um grafo NetworkX representando a rede de coautoria,
-            onde os nós são autores e as arestas são ponderadas
-            pela quantidade de coautorias. Os nós possuem atributos
-            com as informações dos autores.
+    dict: Dicionário, na ordem do DataFrame, onde as chaves são os IDs dos autores
+          e os valores são os dicionários de atributos dos vértices.
   """
-  graph = nx.Graph()
-  authors_ids_set = extract_authors_ids(df_works)
+  nodes = {}
 
   for _, row in df_authors.iterrows():
     author_id = row.get('id', '') if pd.notna(row.get('id')) else ''
-    
-    if author_id not in authors_ids_set:
-      continue
-    
-    author_attributes = {
+
+    nodes[author_id] = {
       'author_display_name' : row.get('display_name', '') if pd.notna(row.get('display_name')) else '',
       'author_institution_display_name' : row.get('institution_display_name', '') if pd.notna(row.get('institution_display_name')) else '',
       'author_institution_country_code' : row.get('institution_country_code', '') if pd.notna(row.get('institution_country_code')) else '',
@@ -38,8 +40,16 @@ def generate_coauthorship_graph(df_works, df_authors):
       'author_orcid' : row.get('orcid', '') if pd.notna(row.get('orcid')) else ''
     }
 
-    graph.add_node(author_id, **author_attributes)
+  return nodes
+
+
+def _add_coauthorship_edges(graph, df_works):
+  """Adiciona ao grafo as coautorias dos trabalhos, incrementando o peso das arestas existentes.
 
+  Args:
+    graph (nx.Graph): O grafo de coautoria que será atualizado.
+    df_works (pd.DataFrame): DataFrame contendo os trabalhos a serem adicionados.
+  """
   for _, row in df_works.iterrows():
     authors_ids = row.get('authorships.author.id', '').split('|') if pd.notna(row.get('authorships.author.id')) else []
 
@@ -50,37 +60,171 @@ def generate_coauthorship_graph(df_works, df_authors):
         else:
           graph.add_edge(author1_id, author2_id, weight=1)
 
+
+def generate_coauthorship_graph(df_works, df_authors):
+  """Gera um grafo de coautoria a partir de DataFrames de trabalhos e autores.
+
+  Args:
+    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
+    df_authors (pd.DataFrame): DataFrame contendo informações sobre os autores.
+
+  Returns:
+    nx.Graph: Um grafo NetworkX representando a rede de coautoria,
+            onde os nós são autores e as arestas são ponderadas
+            pela quantidade de coautorias. Os nós possuem atributos
+            com as informações dos autores.
+  """
+  graph = nx.Graph()
+  authors_ids_set = extract_authors_ids(df_works)
+
+  for author_id, author_attributes in author_nodes(df_authors).items():
+    if author_id in authors_ids_set:
+      graph.add_node(author_id, **author_attributes)
+
+  _add_coauthorship_edges(graph, df_works)
+
   return graph
 
 
-def evolution_graphs(df_works, df_authors, start_year, end_year):
-  graphs = {}
-  df_works['publication_year'] = pd.to_numeric(df_works['publication_year'], errors='coerce')
-  df_works.dropna(subset=['publication_year'], inplace=True)
-  df_works['publication_year'] = df_works['publication_year'].astype(int)
-  year_counts = count_papers_by_year(df_works, start_year, end_year)
-  
-  for year, year_works in year_counts.items():
-    
-    if year_works == 0:
-      continue
-
-    df_works_filtered = df_works[df_works['publication_year'] <= year]
-    graph = generate_coauthorship_graph(df_works_filtered, df_authors)
-    graphs[year] = graph
-    
-  
-  return graphs
+def coauthorship_adjacency(df_works, authors_ids):
+  """Calcula a matriz de adjacência ponderada de coautoria pela projeção B·Bᵀ da
+  matriz esparsa de incidência autor × trabalho.
+
+  Cada posição (i, j) fora da diagonal conta quantos pares de coautoria entre os autores
+  i e j aparecem nos trabalhos, e a diagonal conta os pares de um autor com ele mesmo
+  (IDs repetidos em um trabalho), exatamente como em `generate_coauthorship_graph`.
 
-def extract_graph_metrics(graph):
+  Args:
+    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
+    authors_ids (list): Lista dos IDs dos autores considerados. A posição de cada ID
+      na lista é o seu índice inteiro na matriz.
+
+  Returns:
+    sp.csr_matrix: Matriz simétrica (n_autores × n_autores) com os pesos das coautorias.
+  """
+  authors_ids = list(authors_ids)
+  return pair_counts(works_incidence(df_works, authors_ids))
+
+
+def generate_coauthorship_graph_sparse(df_works, df_authors):
+  """Gera o mesmo grafo de `generate_coauthorship_graph`, calculando os pesos das
+  coautorias com `coauthorship_adjacency` em vez de percorrer os pares de autores em Python.
+
+  Args:
+    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
+    df_authors (pd.DataFrame): DataFrame contendo informações sobre os autores.
+
+  Returns:
+    nx.Graph: Um grafo NetworkX representando a rede de coautoria, com os mesmos
+            vértices, atributos e pesos ('weight') de `generate_coauthorship_graph`.
+  """
+  graph = nx.Graph()
+  authors_ids_set = extract_authors_ids(df_works)
+
+  for author_id, author_attributes in author_nodes(df_authors).items():
+    if author_id in authors_ids_set:
+      graph.add_node(author_id, **author_attributes)
+
+  authors_ids = list(graph.nodes())
+  adjacency = sp.triu(coauthorship_adjacency(df_works, authors_ids)).tocoo()
+
+  graph.add_weighted_edges_from(
+    (authors_ids[i], authors_ids[j], int(weight))
+    for i, j, weight in zip(adjacency.row, adjacency.col, adjacency.data)
+  )
+
+  return graph
+
+
+def evolution_graphs(df_works, df_authors, start_year, end_year, window_size=None):
+  """Gera os grafos de coautoria ano a ano a partir do índice temporal de coautoria.
+
+  As coautorias são contadas uma única vez por aresta e por ano (`temporal_util.build_temporal_index`),
+  e o grafo de cada ano sai de uma filtragem vetorizada desse índice. Sem `window_size`, o grafo
+  de cada ano tem os mesmos vértices, arestas e pesos que `generate_coauthorship_graph` geraria
+  para os trabalhos publicados até aquele ano.
+
+  Args:
+    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
+    df_authors (pd.DataFrame): DataFrame contendo informações sobre os autores.
+    start_year (int): O ano de início (inclusive).
+    end_year (int): O ano de término (inclusive).
+    window_size (int): Se especificado, cada grafo considera apenas os trabalhos dos últimos
+      `window_size` anos (janela deslizante) em vez de todos os anteriores.
+
+  Returns:
+    dict: Dicionário onde as chaves são os anos com pelo menos um trabalho publicado
+          e os valores são os grafos daquele ano.
+  """
+  index = build_temporal_index(df_works, author_nodes(df_authors))
+  return evolution_snapshots(index, start_year, end_year, window_size=window_size)
+
+METRICS_BACKENDS = ['networkx', 'csr']
+
+GRAPH_METRICS = [
+  'num_nodes',
+  'num_edges',
+  'largest_connected_component_size',
+  'degrees',
+  'average_degree',
+  'degree_distribution',
+  'local_clustering_coefficient',
+  'average_clustering_coefficient',
+  'average_shortest_path_length',
+  'betweenness_centrality',
+  'closeness_centrality',
+  'eigenvector_centrality',
+  'degree_assortativity_coefficient'
+]
+
+# Métricas calculadas apenas quando pedidas explicitamente em `requested_metrics`
+OPTIONAL_METRICS = ['weighted_local_clustering_coefficient', 'weighted_average_clustering_coefficient']
+
+SAMPLED_METRICS = ['betweenness_centrality', 'closeness_centrality']
+
+
+def _metric_parameters(metric, backend, pivots, epsilon, seed):
+  """Retorna os parâmetros que alteram o resultado de uma métrica (usados na chave do cache). O
+  backend entra em todas, pois os resultados podem diferir no arredondamento ou no desempate."""
+  if metric in DISTANCE_METRICS + ['centrality_sampling'] and (pivots is not None or epsilon is not None):
+    return {'backend': backend, 'pivots': pivots, 'epsilon': epsilon, 'seed': seed}
+  return {'backend': backend}
+
+
+def extract_graph_metrics(graph, backend='networkx', pivots=None, epsilon=None, seed=None, workers=1,
+                          requested_metrics=None, cache_dir=None, eigenvector_start=None):
   """
   Calcula e retorna diversas métricas de um grafo.
 
   Args:
-  graph (nx.Graph): O grafo NetworkX do qual as métricas serão extraídas.
+  graph (nx.Graph ou CSRGraph): O grafo do qual as métricas serão extraídas. Um `CSRGraph`
+    (ex.: de `graph_store_util.read_csr_graph`) só é aceito pelo backend 'csr'.
+  backend (str): 'networkx' calcula as métricas diretamente sobre o grafo NetworkX;
+    'csr' converte o grafo uma única vez para CSR e usa `csr_util.extract_graph_metrics_csr`.
+    Nos dois backends, o menor caminho médio e as centralidades de intermediação e proximidade
+    saem de uma mesma varredura BFS (`csr_util.distance_metrics`).
+  pivots (int): Se informado (inteiro positivo), as centralidades de intermediação e proximidade
+    e o menor caminho médio são estimados a partir de BFS feitas só a partir desse número de
+    vértices sorteados (pivôs).
+  epsilon (float): Alternativa a `pivots`: erro absoluto máximo desejado nas estimativas
+    (positivo), do qual é derivado o número de pivôs.
+  seed (int): Semente do sorteio dos pivôs.
+  workers (int): Número de processos da varredura BFS das métricas baseadas em distância (menor
+    caminho médio, intermediação e proximidade), nos dois backends. As demais métricas não são
+    paralelizadas.
+  requested_metrics (list): Métricas (chaves de `GRAPH_METRICS` ou `OPTIONAL_METRICS`) a serem
+    calculadas. Padrão: todas as de `GRAPH_METRICS`; as de `OPTIONAL_METRICS` (agrupamento
+    ponderado) só são calculadas quando pedidas.
+  cache_dir (str): Se informado, cada métrica é lida de/gravada em um cache em disco,
+    indexado pelo hash do conteúdo do grafo e pelos parâmetros da métrica.
+  eigenvector_start (dict): Centralidade de autovetor de um grafo anterior da mesma série
+    (ex.: o do ano anterior), por ID de vértice. Serve apenas de ponto de partida da iteração
+    de potência do NetworkX (vértices ausentes partem de 1) e do solver esparso (backend 'csr'
+    ou quando a iteração do NetworkX não converge), para que convirjam em menos iterações; o
+    resultado não depende dela.
 
   Returns:
-    dict: Um dicionário contendo as seguintes métricas do grafo:
+    dict: Um dicionário contendo as métricas solicitadas, entre:
     - 'num_nodes': Número de vértices no grafo.
     - 'num_edges': Número de arestas no grafo.
     - 'largest_connected_component_size': Tamanho da maior componente conexa.
@@ -89,69 +233,155 @@ def extract_graph_metrics(graph):
     - 'degree_distribution': Dicionário com a distribuição de graus.
     - 'local_clustering_coefficient': Dicionário com o coeficiente de agrupamento local de cada vértice.
     - 'average_clustering_coefficient': Coeficiente de agrupamento médio da rede.
-    - 'average_shortest_path_length': Menor caminho médio (apenas para componentes conectados).
+    - 'weighted_local_clustering_coefficient' (opcional): Coeficiente de agrupamento local
+      ponderado pelo atributo 'weight' das arestas (número de trabalhos em coautoria).
+    - 'weighted_average_clustering_coefficient' (opcional): Média do coeficiente de agrupamento ponderado.
+    - 'average_shortest_path_length': Menor caminho médio no maior componente conectado. No modo
+      aproximado, é a média das distâncias a partir dos pivôs desse componente.
     - 'betweenness_centrality': Dicionário com a centralidade de intermediação de cada vértice.
     - 'closeness_centrality': Dicionário com a centralidade de proximidade de cada vértice.
-    - 'eigenvector_centrality': Dicionário com a centralidade de autovetor de cada vértice.
+    - 'eigenvector_centrality': Dicionário com a centralidade de autovetor de cada vértice. Se a
+      iteração de potência do NetworkX não convergir, é calculada com o solver esparso de
+      `csr_util.eigenvector_centrality`.
     - 'degree_assortativity_coefficient': Coeficiente de assortatividade por grau.
+    - 'centrality_sampling': Presente apenas no modo aproximado (`pivots` ou `epsilon`), com o
+      número de pivôs, a semente e os erros estimados das centralidades.
   """
-  metrics = {}
+  if backend not in METRICS_BACKENDS:
+    raise ValueError(f"Backend de métricas desconhecido: '{backend}'. Opções: {METRICS_BACKENDS}")
+  if backend == 'networkx' and isinstance(graph, CSRGraph):
+    raise ValueError("O backend 'networkx' exige um grafo NetworkX; use o backend 'csr' com um CSRGraph.")
+  check_sampling_parameters(pivots, epsilon)
 
-  print('Coleta de dados: números de vértices e arestas')
-  metrics['num_nodes'] = graph.number_of_nodes()
-  metrics['num_edges'] = graph.number_of_edges()
+  requested_metrics = GRAPH_METRICS if requested_metrics is None else list(requested_metrics)
+  unknown_metrics = [metric for metric in requested_metrics if metric not in GRAPH_METRICS + OPTIONAL_METRICS]
+  if unknown_metrics:
+    raise ValueError(f"Métricas desconhecidas: {unknown_metrics}. Opções: {GRAPH_METRICS + OPTIONAL_METRICS}")
 
-  print('Coleta de dados: maior componente conexa')
+  output_metrics = list(requested_metrics)
+  if (pivots is not None or epsilon is not None) and set(SAMPLED_METRICS) & set(requested_metrics):
+    output_metrics.append('centrality_sampling')
 
-  if graph.number_of_nodes() > 0:
-    connected_components = list(nx.connected_components(graph))
-    if connected_components:
-      metrics['largest_connected_component_size'] = len(max(connected_components, key=len))
+  metrics = {}
+  if cache_dir:
+    graph_hash = graph_content_hash(graph)
+    for metric in output_metrics:
+      cached = load_cached_metric(cache_dir, graph_hash, metric, _metric_parameters(metric, backend, pivots, epsilon, seed))
+      if cached is not CACHE_MISS:
+        metrics[metric] = cached
+    if metrics:
+      print(f"Métricas lidas do cache: {list(metrics)}")
+
+  missing_metrics = [metric for metric in requested_metrics if metric not in metrics]
+  if 'centrality_sampling' in output_metrics and 'centrality_sampling' not in metrics:
+    missing_metrics = list(dict.fromkeys(missing_metrics + [m for m in SAMPLED_METRICS if m in requested_metrics]))
+
+  if workers > 1 and not set(missing_metrics) & set(DISTANCE_METRICS):
+    print(f"Aviso: workers={workers} ignorado, pois nenhuma métrica baseada em distância será calculada.")
+
+  if missing_metrics:
+    if backend == 'csr':
+      computed = extract_graph_metrics_csr(
+        graph, pivots=pivots, epsilon=epsilon, seed=seed, workers=workers, requested_metrics=missing_metrics,
+        eigenvector_start=eigenvector_start
+      )
     else:
-      metrics['largest_connected_component_size'] = 0
-  else:
-    metrics['largest_connected_component_size'] = 0
-
-  print('Coleta de dados: grau, grau médio e distribuição de graus')
-  degrees = dict(graph.degree())
-  metrics['degrees'] = degrees
-  metrics['average_degree'] = sum(d for n, d in graph.degree()) / len(graph) if len(graph) > 0 else 0
-
-  degree_counts = nx.degree_histogram(graph)
-  degree_distribution = {i: count for i, count in enumerate(degree_counts) if count > 0}
-  metrics['degree_distribution'] = degree_distribution
-
-  metrics['local_clustering_coefficient'] = nx.clustering(graph)
-
-  metrics['average_clustering_coefficient'] = nx.average_clustering(graph)
-
-  print('Coleta de dados: média da distância geodésica')
-  if nx.is_connected(graph):
-    metrics['average_shortest_path_length'] = nx.average_shortest_path_length(graph)
-  else:
-    components = [graph.subgraph(c).copy() for c in nx.connected_components(graph)]
-    if components:
-      largest_component = max(components, key=len)
-      if len(largest_component) > 1:
-        metrics['average_shortest_path_length'] = nx.average_shortest_path_length(largest_component)
+      computed = _extract_graph_metrics_networkx(
+        graph, pivots=pivots, epsilon=epsilon, seed=seed, workers=workers, requested_metrics=missing_metrics,
+        eigenvector_start=eigenvector_start
+      )
+
+    for metric, value in computed.items():
+      if metric not in output_metrics:
+        continue
+      metrics[metric] = value
+      if cache_dir:
+        store_cached_metric(cache_dir, graph_hash, metric, _metric_parameters(metric, backend, pivots, epsilon, seed), value)
+
+  return {metric: metrics[metric] for metric in output_metrics}
+
+
+def _extract_graph_metrics_networkx(graph, pivots=None, epsilon=None, seed=None, workers=1, requested_metrics=None,
+                                    eigenvector_start=None):
+  """
+  Calcula as métricas solicitadas diretamente sobre o grafo NetworkX, exceto o agrupamento não
+  ponderado e as baseadas em distância, que vêm dos núcleos esparsos `csr_util.local_clustering`
+  e `csr_util.distance_metrics`. Veja `extract_graph_metrics`.
+  """
+  requested = set(GRAPH_METRICS if requested_metrics is None else requested_metrics)
+  metrics = {}
+
+  clustering_metrics = {'local_clustering_coefficient', 'average_clustering_coefficient'}
+  csr_graph = to_csr(graph) if requested & (clustering_metrics | set(DISTANCE_METRICS)) else None
+
+  if requested & {'num_nodes', 'num_edges'}:
+    print('Coleta de dados: números de vértices e arestas')
+    metrics['num_nodes'] = graph.number_of_nodes()
+    metrics['num_edges'] = graph.number_of_edges()
+
+  if 'largest_connected_component_size' in requested:
+    print('Coleta de dados: maior componente conexa')
+
+    if graph.number_of_nodes() > 0:
+      connected_components = list(nx.connected_components(graph))
+      if connected_components:
+        metrics['largest_connected_component_size'] = len(max(connected_components, key=len))
       else:
-        metrics['average_shortest_path_length'] = None
+        metrics['largest_connected_component_size'] = 0
     else:
-      metrics['average_shortest_path_length'] = None
-
-  print('Coleta de dados: centralidades')
-  metrics['betweenness_centrality'] = nx.betweenness_centrality(graph)
-  metrics['closeness_centrality'] = nx.closeness_centrality(graph)
-  
-  try:
-    metrics['eigenvector_centrality'] = nx.eigenvector_centrality(graph)
-  except nx.PowerIterationFailedConvergence:
-    metrics['eigenvector_centrality'] = "Could not converge"
-  except ValueError:
-    metrics['eigenvector_centrality'] = {}
+      metrics['largest_connected_component_size'] = 0
 
-  print('Coleta de dados: assortatividade')
-  metrics['degree_assortativity_coefficient'] = nx.degree_assortativity_coefficient(graph)
+  if requested & {'degrees', 'average_degree', 'degree_distribution'}:
+    print('Coleta de dados: grau, grau médio e distribuição de graus')
+    degrees = dict(graph.degree())
+    metrics['degrees'] = degrees
+    metrics['average_degree'] = sum(d for n, d in graph.degree()) / len(graph) if len(graph) > 0 else 0
+
+    degree_counts = nx.degree_histogram(graph)
+    degree_distribution = {i: count for i, count in enumerate(degree_counts) if count > 0}
+    metrics['degree_distribution'] = degree_distribution
+
+  if requested & clustering_metrics:
+    print('Coleta de dados: coeficiente de agrupamento')
+    clustering = local_clustering(csr_graph)
+    metrics['local_clustering_coefficient'] = dict(zip(csr_graph.node_ids, clustering.tolist()))
+    metrics['average_clustering_coefficient'] = float(clustering.mean()) if len(clustering) > 0 else 0
+
+  if requested & {'weighted_local_clustering_coefficient', 'weighted_average_clustering_coefficient'}:
+    print('Coleta de dados: coeficiente de agrupamento ponderado')
+    weighted_clustering = nx.clustering(graph, weight='weight')
+    metrics['weighted_local_clustering_coefficient'] = weighted_clustering
+    metrics['weighted_average_clustering_coefficient'] = sum(weighted_clustering.values()) / len(weighted_clustering) if weighted_clustering else 0
+
+  if requested & set(DISTANCE_METRICS):
+    metrics.update(distance_metrics(
+      csr_graph, [metric for metric in DISTANCE_METRICS if metric in requested],
+      pivots=pivots, epsilon=epsilon, seed=seed, workers=workers
+    ))
+
+  if 'eigenvector_centrality' in requested:
+    print('Coleta de dados: centralidade de autovetor')
+    nstart = None
+    if eigenvector_start:
+      nstart = {node: eigenvector_start.get(node, 1.0) for node in graph}
+      # O NetworkX recusa um vetor inicial todo nulo; nesse caso, parte do vetor padrão
+      if not any(nstart.values()):
+        nstart = None
+    try:
+      metrics['eigenvector_centrality'] = nx.eigenvector_centrality(graph, nstart=nstart)
+    except nx.PowerIterationFailedConvergence:
+      print('Aviso: a iteração de potência não convergiu; usando o solver esparso de autovalores.')
+      csr_graph = to_csr(graph)
+      start = None
+      if eigenvector_start:
+        start = np.array([eigenvector_start.get(node_id, 0.0) for node_id in csr_graph.node_ids], dtype=np.float64)
+      metrics['eigenvector_centrality'] = dict(zip(csr_graph.node_ids, eigenvector_centrality(csr_graph, start=start).tolist()))
+    except (ValueError, nx.NetworkXPointlessConcept):
+      metrics['eigenvector_centrality'] = {}
+
+  if 'degree_assortativity_coefficient' in requested:
+    print('Coleta de dados: assortatividade')
+    metrics['degree_assortativity_coefficient'] = nx.degree_assortativity_coefficient(graph)
 
   return metrics
 
@@ -175,51 +405,61 @@ def identify_hubs(centrality_dict, top_n=10):
   return hubs
 
 
-def analyze_network_attack(graph, nodes_to_remove):
+def network_attack_baseline(graph, workers=1):
+  """Mede o estado da rede antes de um ataque: número de vértices e arestas, tamanho do
+  maior componente conectado e eficiência global.
+
+  Args:
+    graph (nx.Graph ou CSRGraph): O grafo original.
+    workers (int): Número de processos da varredura BFS da eficiência global.
+
+  Returns:
+    dict: As métricas da rede, no formato de 'before_attack' de `analyze_network_attack`.
+  """
+  csr_graph = graph if isinstance(graph, CSRGraph) else to_csr(graph)
+
+  return {
+    'num_nodes': len(csr_graph.node_ids),
+    'num_edges': number_of_edges(csr_graph),
+    'largest_connected_component_size': len(largest_component(csr_graph)),
+    'global_efficiency': global_efficiency(csr_graph, workers=workers)
+  }
+
+
+def analyze_network_attack(graph, nodes_to_remove, workers=1, before_attack=None):
   """Simula a remoção de nós (ataque a hubs) e mede o impacto na rede.
 
+  O grafo é convertido uma única vez para CSR; a rede atacada é o subgrafo induzido pelos
+  vértices restantes, e a eficiência global de cada rede vem de uma única varredura BFS
+  (`csr_util.bfs_sweep`).
+
   Args:
-    graph (nx.Graph): O grafo original.
+    graph (nx.Graph ou CSRGraph): O grafo original.
     nodes_to_remove (list): A lista de nós (hubs) a serem removidos.
+    workers (int): Número de processos das varreduras BFS da eficiência global.
+    before_attack (dict): As métricas da rede original (`network_attack_baseline`), para
+      reaproveitá-las entre vários ataques ao mesmo grafo. Padrão: calculadas aqui.
 
   Returns:
     dict: Um dicionário com as métricas da rede antes e depois da remoção,
           incluindo o tamanho do maior componente conectado e a eficiência global.
   """
-  analysis_results = {'before_attack': {}, 'after_attack': {}}
+  csr_graph = graph if isinstance(graph, CSRGraph) else to_csr(graph)
 
-  if nx.is_connected(graph):
-    lcc_size_before = len(graph)
-  else:
-    largest_component_nodes = max(nx.connected_components(graph), key=len)
-    lcc_size_before = len(largest_component_nodes)
-  
-  analysis_results['before_attack']['num_nodes'] = graph.number_of_nodes()
-  analysis_results['before_attack']['num_edges'] = graph.number_of_edges()
-  analysis_results['before_attack']['largest_connected_component_size'] = lcc_size_before
-  analysis_results['before_attack']['global_efficiency'] = nx.global_efficiency(graph)
+  if before_attack is None:
+    before_attack = network_attack_baseline(csr_graph, workers=workers)
+  analysis_results = {'before_attack': dict(before_attack), 'after_attack': {}}
+  lcc_size_before = before_attack['largest_connected_component_size']
 
-  attacked_graph = graph.copy()
-  attacked_graph.remove_nodes_from(nodes_to_remove)
+  removed_nodes = set(nodes_to_remove)
+  remaining_indices = [i for i, node in enumerate(csr_graph.node_ids) if node not in removed_nodes]
+  attacked_graph = induced_subgraph(csr_graph, remaining_indices)
 
-  if attacked_graph.number_of_nodes() > 0:
-    if nx.is_connected(attacked_graph):
-      lcc_size_after = len(attacked_graph)
-    else:
-      conn_comps = list(nx.connected_components(attacked_graph))
-      if conn_comps:
-        largest_component_nodes_after = max(conn_comps, key=len)
-        lcc_size_after = len(largest_component_nodes_after)
-      else:
-        lcc_size_after = 0
-    
-    global_efficiency_after = nx.global_efficiency(attacked_graph)
-  else:
-    lcc_size_after = 0
-    global_efficiency_after = 0
-
-  analysis_results['after_attack']['num_nodes'] = attacked_graph.number_of_nodes()
-  analysis_results['after_attack']['num_edges'] = attacked_graph.number_of_edges()
+  lcc_size_after = len(largest_component(attacked_graph))
+  global_efficiency_after = global_efficiency(attacked_graph, workers=workers)
+
+  analysis_results['after_attack']['num_nodes'] = len(attacked_graph.node_ids)
+  analysis_results['after_attack']['num_edges'] = number_of_edges(attacked_graph)
   analysis_results['after_attack']['largest_connected_component_size'] = lcc_size_after
   analysis_results['after_attack']['global_efficiency'] = global_efficiency_after
   
@@ -228,4 +468,4 @@ def analyze_network_attack(graph, nodes_to_remove):
     'lcc_size_reduction_percent': ((lcc_size_before - lcc_size_after) / lcc_size_before) * 100 if lcc_size_before > 0 else 0
   }
 
-  return analysis_results
\ No newline at end of file
+  return analysis_results
@@ -0,0 +1,318 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from src.csr_util import CSRGraph, binary_structure, largest_component, local_clustering, bfs_sweep
+from src.cache_util import graph_content_hash, parameters_hash, load_cached_value, store_cached_value
+
+NULL_MODELS = ['Erdos-Renyi', 'Configuration', 'Double-Edge-Swap']
+
+DOUBLE_EDGE_SWAP_MAX_TRIES = 100
+
+
+def graph_edges(csr_graph):
+  """
+  Retorna as arestas do grafo simples subjacente (sem laços), cada uma uma única vez.
+
+  Returns:
+    tuple: Os vetores (u, v) de índices dos vértices, com u < v.
+  """
+  upper = sp.triu(binary_structure(csr_graph.adjacency), k=1).tocoo()
+  return upper.row.astype(np.int64), upper.col.astype(np.int64)
+
+
+def edges_to_csr(sources, targets, num_nodes):
+  """Monta um CSRGraph (sem IDs) a partir de vetores de arestas não direcionadas."""
+  adjacency = sp.csr_matrix(
+    (np.ones(2 * len(sources)), (np.concatenate([sources, targets]), np.concatenate([targets, sources]))),
+    shape=(num_nodes, num_nodes)
+  )
+  adjacency.sum_duplicates()
+  return CSRGraph(adjacency, None)
+
+
+def erdos_renyi_edges(num_nodes, num_edges, rng):
+  """
+  Sorteia um grafo G(n, m): `num_edges` pares distintos escolhidos uniformemente entre os
+  n(n - 1)/2 possíveis, como `nx.gnm_random_graph`.
+
+  Args:
+    num_nodes (int): O número de vértices.
+    num_edges (int): O número de arestas.
+    rng (np.random.Generator): O gerador de números aleatórios.
+
+  Returns:
+    tuple: Os vetores (u, v) das arestas, com u < v.
+  """
+  possible_edges = num_nodes * (num_nodes - 1) // 2
+  if num_edges > possible_edges:
+    raise ValueError(f"Um grafo com {num_nodes} vértices tem no máximo {possible_edges} arestas.")
+
+  # Cada par u < v é identificado pela sua posição k = v(v - 1)/2 + u no triângulo inferior.
+  codes = rng.choice(possible_edges, size=num_edges, replace=False).astype(np.int64)
+  targets = ((1 + np.sqrt(1 + 8 * codes.astype(np.float64))) // 2).astype(np.int64)
+  targets -= targets * (targets - 1) // 2 > codes
+  targets += (targets + 1) * targets // 2 <= codes
+  sources = codes - targets * (targets - 1) // 2
+  return sources, targets
+
+
+def configuration_edges(degree_sequence, rng):
+  """
+  Sorteia um modelo de configuração: as pontas de aresta de cada vértice são embaralhadas e
+  pareadas, e os laços e arestas múltiplas resultantes são descartados (como
+  `nx.Graph(nx.configuration_model(...))` sem laços).
+
+  Args:
+    degree_sequence (np.ndarray): O grau de cada vértice.
+    rng (np.random.Generator): O gerador de números aleatórios.
+
+  Returns:
+    tuple: Os vetores (u, v) das arestas, com u < v.
+  """
+  stubs = np.repeat(np.arange(len(degree_sequence), dtype=np.int64), degree_sequence)
+  rng.shuffle(stubs)
+  if len(stubs) % 2:
+    stubs = stubs[:-1]
+
+  sources, targets = stubs[0::2], stubs[1::2]
+  sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+  keep = sources != targets
+  codes = np.unique(sources[keep] * len(degree_sequence) + targets[keep])
+  return codes // len(degree_sequence), codes % len(degree_sequence)
+
+
+def double_edge_swap_edges(sources, targets, swaps_per_edge, rng):
+  """
+  Religa o grafo preservando o grau de cada vértice: pares de arestas (u, v), (x, y) são
+  trocados por (u, x), (v, y) sempre que isso não cria laços nem arestas múltiplas, como
+  `nx.double_edge_swap`.
+
+  Args:
+    sources (np.ndarray): Vetor u das arestas.
+    targets (np.ndarray): Vetor v das arestas.
+    swaps_per_edge (float): Trocas bem-sucedidas por aresta.
+    rng (np.random.Generator): O gerador de números aleatórios.
+
+  Returns:
+    tuple: Os vetores (u, v) das arestas religadas, com u < v.
+  """
+  sources, targets = sources.tolist(), targets.tolist()
+  num_edges = len(sources)
+  num_swaps = int(round(swaps_per_edge * num_edges))
+  if num_edges < 2 or num_swaps == 0:
+    return np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+
+  edge_set = set(zip(sources, targets))
+  max_tries = DOUBLE_EDGE_SWAP_MAX_TRIES * num_swaps
+  swaps = tries = 0
+
+  while swaps < num_swaps and tries < max_tries:
+    batch = min(max_tries - tries, 2 * (num_swaps - swaps) + 64)
+    first_edges = rng.integers(num_edges, size=batch).tolist()
+    second_edges = rng.integers(num_edges, size=batch).tolist()
+    flips = rng.integers(2, size=batch).tolist()
+
+    for first, second, flip in zip(first_edges, second_edges, flips):
+      tries += 1
+      u, v = sources[first], targets[first]
+      x, y = (targets[second], sources[second]) if flip else (sources[second], targets[second])
+      if u == x or u == y or v == x or v == y:
+        continue
+
+      new_first = (u, x) if u < x else (x, u)
+      new_second = (v, y) if v < y else (y, v)
+      if new_first in edge_set or new_second in edge_set:
+        continue
+
+      edge_set.discard((u, v))
+      edge_set.discard((sources[second], targets[second]))
+      edge_set.add(new_first)
+      edge_set.add(new_second)
+      sources[first], targets[first] = new_first
+      sources[second], targets[second] = new_second
+
+      swaps += 1
+      if swaps == num_swaps:
+        break
+
+  return np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+
+
+def small_world_statistics(csr_graph, path_pivots=None, rng=None):
+  """
+  Calcula o coeficiente de agrupamento médio e o menor caminho médio no maior componente
+  conectado, como `nx.average_clustering` e `nx.average_shortest_path_length`, usando os
+  núcleos em CSR.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    path_pivots (int): Se especificado, o caminho médio é estimado com BFS a partir desse
+      número de origens sorteadas.
+    rng (np.random.Generator): O gerador usado no sorteio das origens.
+
+  Returns:
+    dict: 'avg_clustering', 'avg_path_length' (NaN se o componente tiver menos de dois
+    vértices) e 'lcc_size'.
+  """
+  lcc_indices = largest_component(csr_graph)
+  lcc = CSRGraph(csr_graph.adjacency[lcc_indices][:, lcc_indices], None)
+  lcc_size = len(lcc_indices)
+
+  avg_clustering = float(local_clustering(lcc).mean()) if lcc_size else float('nan')
+  avg_path_length = float('nan')
+
+  if lcc_size > 1:
+    if path_pivots is None or path_pivots >= lcc_size:
+      sources = np.arange(lcc_size)
+    else:
+      sources = np.sort((rng or np.random.default_rng()).choice(lcc_size, size=path_pivots, replace=False))
+    sweep = bfs_sweep(lcc, sources=sources, dependencies=False)
+    avg_path_length = float(sweep.distance_totals.sum() / (len(sources) * (lcc_size - 1)))
+
+  return {'avg_clustering': avg_clustering, 'avg_path_length': avg_path_length, 'lcc_size': lcc_size}
+
+
+def _null_model_realization(model, num_nodes, sources, targets, degree_sequence, swaps_per_edge, path_pivots, seed_sequence):
+  """Sorteia uma realização de um modelo nulo e calcula suas estatísticas."""
+  rng = np.random.default_rng(seed_sequence)
+
+  if model == 'Erdos-Renyi':
+    edges = erdos_renyi_edges(num_nodes, len(sources), rng)
+  elif model == 'Configuration':
+    edges = configuration_edges(degree_sequence, rng)
+  else:
+    edges = double_edge_swap_edges(sources, targets, swaps_per_edge, rng)
+
+  return small_world_statistics(edges_to_csr(*edges, num_nodes), path_pivots, rng)
+
+
+def _null_model_worker(tasks, num_nodes, sources, targets, degree_sequence, swaps_per_edge, path_pivots):
+  return [
+    _null_model_realization(model, num_nodes, sources, targets, degree_sequence, swaps_per_edge, path_pivots, seed_sequence)
+    for model, seed_sequence in tasks
+  ]
+
+
+def _null_model_summary(realizations):
+  clustering = [realization['avg_clustering'] for realization in realizations]
+  path_lengths = [realization['avg_path_length'] for realization in realizations]
+  valid_paths = [value for value in path_lengths if not np.isnan(value)]
+
+  return {
+    'avg_clustering': float(np.mean(clustering)) if clustering else float('nan'),
+    'avg_path_length': float(np.mean(valid_paths)) if valid_paths else float('nan'),
+    'std_clustering': float(np.std(clustering)) if clustering else float('nan'),
+    'std_path_length': float(np.std(valid_paths)) if valid_paths else float('nan'),
+    'avg_lcc_size': float(np.mean([realization['lcc_size'] for realization in realizations])),
+    'clustering': clustering,
+    'path_length': path_lengths
+  }
+
+
+def generate_null_models(csr_graph, models=NULL_MODELS, realizations=100, seed=None, swaps_per_edge=10, path_pivots=None, workers=1):
+  """
+  Gera realizações de modelos nulos do grafo diretamente como vetores de arestas e mede o
+  coeficiente de agrupamento médio e o menor caminho médio do maior componente conectado de
+  cada uma:
+    - 'Erdos-Renyi': mesmo número de vértices e arestas.
+    - 'Configuration': mesma sequência de graus (sem laços e arestas múltiplas).
+    - 'Double-Edge-Swap': o próprio grafo religado com trocas que preservam os graus.
+
+  Cada realização tem sua própria semente (derivada de `seed`), então os resultados não
+  dependem do número de processos.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR (em geral, o maior componente conectado da rede real).
+    models (list): Os modelos nulos, entre `NULL_MODELS`.
+    realizations (int): O número de realizações de cada modelo.
+    seed (int): A semente das realizações.
+    swaps_per_edge (float): Trocas bem-sucedidas por aresta no modelo 'Double-Edge-Swap'.
+    path_pivots (int): Se especificado, o caminho médio de cada realização é estimado a partir
+      desse número de origens sorteadas.
+    workers (int): Número de processos entre os quais as realizações são divididas.
+
+  Returns:
+    dict: Para cada modelo, a média e o desvio padrão do agrupamento ('avg_clustering',
+    'std_clustering') e do caminho médio ('avg_path_length', 'std_path_length'), o tamanho
+    médio do maior componente ('avg_lcc_size') e os valores de cada realização ('clustering',
+    'path_length').
+  """
+  unknown_models = [model for model in models if model not in NULL_MODELS]
+  if unknown_models:
+    raise ValueError(f"Modelos nulos inválidos: {unknown_models}. Opções: {', '.join(NULL_MODELS)}")
+
+  num_nodes = csr_graph.adjacency.shape[0]
+  sources, targets = graph_edges(csr_graph)
+  degree_sequence = np.bincount(np.concatenate([sources, targets]), minlength=num_nodes)
+
+  model_seeds = np.random.SeedSequence(seed).spawn(len(NULL_MODELS))
+  tasks = [
+    (model, seed_sequence)
+    for model in models
+    for seed_sequence in model_seeds[NULL_MODELS.index(model)].spawn(realizations)
+  ]
+  shared_arguments = (num_nodes, sources, targets, degree_sequence, swaps_per_edge, path_pivots)
+
+  if workers > 1 and len(tasks) > 1:
+    chunks = [list(chunk) for chunk in np.array_split(np.array(tasks, dtype=object), workers * 4) if len(chunk) > 0]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      statistics = [
+        result
+        for chunk_results in executor.map(_null_model_worker, chunks, *([argument] * len(chunks) for argument in shared_arguments))
+        for result in chunk_results
+      ]
+  else:
+    statistics = _null_model_worker(tasks, *shared_arguments)
+
+  return {
+    model: _null_model_summary([result for (task_model, _), result in zip(tasks, statistics) if task_model == model])
+    for model in models
+  }
+
+
+def null_model_cache_path(cache_dir, institution, year, parameters):
+  """
+  Monta o caminho do arquivo de cache dos modelos nulos de uma instituição em um ano:
+  `<cache_dir>/<instituição>/null_models_<instituição>_<ano>_<hash dos parâmetros>.json`.
+  """
+  return os.path.join(cache_dir, institution, f"null_models_{institution}_{year}_{parameters_hash(parameters)}.json")
+
+
+def cached_null_models(csr_graph, institution, year, cache_dir, models=NULL_MODELS, realizations=100, seed=None, swaps_per_edge=10, path_pivots=None, workers=1):
+  """
+  Versão de `generate_null_models` com cache por instituição e ano. O hash do conteúdo do grafo
+  entra nos parâmetros do cache, então um grafo regenerado invalida os modelos antigos.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    institution (str): A instituição.
+    year (int): O ano.
+    cache_dir (str): O diretório do cache (ex.: '../results/null_models/').
+    Os demais argumentos são os de `generate_null_models`.
+
+  Returns:
+    dict: O resultado de `generate_null_models`.
+  """
+  parameters = {
+    'graph_hash': graph_content_hash(csr_graph),
+    'models': list(models),
+    'realizations': realizations,
+    'seed': seed,
+    'swaps_per_edge': swaps_per_edge,
+    'path_pivots': path_pivots
+  }
+  cache_path = null_model_cache_path(cache_dir, institution, year, parameters)
+
+  null_stats = load_cached_value(cache_path)
+  if null_stats is not None:
+    print(f"Modelos nulos carregados de {cache_path}")
+    return null_stats
+
+  null_stats = generate_null_models(
+    csr_graph, models=models, realizations=realizations, seed=seed, swaps_per_edge=swaps_per_edge,
+    path_pivots=path_pivots, workers=workers
+  )
+  store_cached_value(cache_path, {'institution': institution, 'year': year, 'parameters': parameters, 'value': null_stats})
+  print(f"Modelos nulos salvos em {cache_path}")
+  return null_stats
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.cache_util import load_cached_value, store_cached_value
+from src.graph_store_util import GRAPH_STORE_EXTENSION
+from src.metrics_store_util import metrics_output_paths
+from src.robustness_util import load_sweep_spec
+from src.temporal_util import TEMPORAL_INDEX_EXTENSION
+
+PIPELINE_STAGES = ['authors', 'graphs', 'metrics', 'attacks']
+
+PIPELINE_DEFAULTS = {
+  'stages': PIPELINE_STAGES,
+  'data_dir': 'data',
+  'graphs_dir': 'results/graphs',
+  'metrics_dir': 'results/metrics',
+  'state_path': 'results/.pipeline/state.json',
+  'start_year': 1998,
+  'end_year': 2024,
+  'output_format': 'both',
+  'csv_engine': 'c',
+  'chunk_size': None,
+  'metrics_backend': 'csr',
+  'metrics_workers': 1,
+  'metrics_format': 'columnar',
+  'catalog_path': None,
+  'registry_path': None,
+  'robustness_sweep_spec': None
+}
+
+PipelineTask = namedtuple('PipelineTask', ['name', 'command', 'inputs', 'outputs'])
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def _file_hash(path, hash_cache):
+  """SHA-256 de um arquivo, reaproveitado de `hash_cache` enquanto tamanho e data de
+  modificação não mudarem."""
+  status = os.stat(path)
+  cached = hash_cache.get(path)
+  if cached and cached[0] == status.st_size and cached[1] == status.st_mtime_ns:
+    return cached[2]
+
+  digest = hashlib.sha256()
+  with open(path, 'rb') as f:
+    for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+      digest.update(block)
+
+  hash_cache[path] = [status.st_size, status.st_mtime_ns, digest.hexdigest()]
+  return digest.hexdigest()
+
+
+def path_hash(path, hash_cache=None):
+  """
+  Calcula o hash do conteúdo de um arquivo ou diretório (nomes relativos e conteúdo de
+  todos os arquivos, em ordem).
+
+  Args:
+    path (str): O caminho.
+    hash_cache (dict): Cache dos hashes por arquivo, indexado pelo caminho, com tamanho e
+      data de modificação; arquivos inalterados não são relidos.
+
+  Returns:
+    str: O hash SHA-256 em hexadecimal, ou None se o caminho não existir.
+  """
+  hash_cache = {} if hash_cache is None else hash_cache
+  if os.path.isfile(path):
+    return _file_hash(path, hash_cache)
+  if not os.path.isdir(path):
+    return None
+
+  digest = hashlib.sha256()
+  for directory, subdirectories, files in os.walk(path):
+    subdirectories.sort()
+    for file_name in sorted(files):
+      file_path = os.path.join(directory, file_name)
+      digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+      digest.update(b'\0')
+      digest.update(_file_hash(file_path, hash_cache).encode('ascii'))
+  return digest.hexdigest()
+
+
+def load_pipeline_config(config_path, overrides=None):
+  """
+  Lê a configuração do pipeline. Campos do JSON (todos opcionais, exceto 'institutions'):
+
+    - 'institutions' (list): As instituições; os dados de cada uma ficam em
+      '<data_dir>/works_<instituição>.csv'.
+    - 'stages' (list): As etapas, entre 'authors', 'graphs', 'metrics' e 'attacks'.
+    - 'start_year'/'end_year' (int): Os anos dos grafos gerados.
+    - 'metrics_years' (list) ou 'metrics_start_year'/'metrics_end_year' (int): Os anos cujas
+      métricas são calculadas. Padrão: os anos dos grafos.
+    - 'data_dir', 'graphs_dir', 'metrics_dir' (str): As pastas dos dados e resultados.
+    - 'state_path' (str): O arquivo com os hashes das entradas e saídas de cada tarefa já executada.
+    - 'output_format' (str): O formato dos grafos ('gexf', 'binary' ou 'both').
+    - 'registry_path' (str): O registro global de autores usado pelos grafos binários e
+      índices temporais (`graph_store_util.open_author_registry`).
+    - 'csv_engine' (str) e 'chunk_size' (int): Leitura dos CSVs.
+    - 'metrics_backend' (str) e 'metrics_workers' (int): Cálculo das métricas.
+    - 'metrics_format' (str): O formato das métricas ('columnar', 'json' ou 'both').
+    - 'catalog_path' (str): O catálogo SQLite (`catalog_util`) onde as etapas 'metrics' e
+      'attacks' registram os resultados.
+    - 'robustness_sweep_spec' (str): Especificação da varredura de robustez
+      (`robustness_util.load_sweep_spec`) usada pela etapa 'attacks', com os anos e métricas
+      atacados; as instituições, os grafos e os JSONs de métricas vêm do pipeline, e o JSON
+      combinado ('combined_output_json_path') não é gerado.
+
+  Args:
+    config_path (str): O caminho para o JSON da configuração.
+    overrides (dict): Campos que substituem os do JSON (ex.: as opções da linha de comando),
+      aplicados antes da validação. Valores None são ignorados.
+
+  Returns:
+    dict: A configuração com os valores padrão preenchidos e 'metrics_years'.
+  """
+  with open(config_path, 'r', encoding='utf-8') as f:
+    config = {**PIPELINE_DEFAULTS, **json.load(f)}
+  config.update({name: value for name, value in (overrides or {}).items() if value is not None})
+
+  if not config.get('institutions'):
+    raise ValueError("Campo obrigatório 'institutions' ausente na configuração do pipeline.")
+
+  invalid_stages = [stage for stage in config['stages'] if stage not in PIPELINE_STAGES]
+  if invalid_stages:
+    raise ValueError(f"Etapas inválidas: {', '.join(invalid_stages)}. Opções: {', '.join(PIPELINE_STAGES)}")
+
+  if 'attacks' in config['stages'] and not config['robustness_sweep_spec']:
+    raise ValueError("A etapa 'attacks' precisa de 'robustness_sweep_spec'.")
+
+  if 'metrics_years' not in config:
+    config['metrics_years'] = list(range(
+      config.get('metrics_start_year', config['start_year']),
+      config.get('metrics_end_year', config['end_year']) + 1
+    ))
+
+  return config
+
+
+def _script(name):
+  return [sys.executable, os.path.join('scripts', name)]
+
+
+def _write_if_changed(path, content):
+  """Grava um arquivo apenas se o conteúdo mudou, preservando a data de modificação (e o hash em cache)."""
+  if os.path.exists(path):
+    with open(path, 'r', encoding='utf-8') as f:
+      if f.read() == content:
+        return
+
+  os.makedirs(os.path.dirname(path), exist_ok=True)
+  with open(path, 'w', encoding='utf-8') as f:
+    f.write(content)
+
+
+def build_pipeline(config):
+  """
+  Monta as tarefas do pipeline (uma chamada de script por instituição, ou por instituição e
+  ano) com os seus arquivos de entrada e saída. A etapa 'attacks' grava, ao lado do estado,
+  uma especificação de varredura por instituição e ano.
+
+  Args:
+    config (dict): A configuração (`load_pipeline_config`).
+
+  Returns:
+    list: As tarefas (`PipelineTask`), na ordem das etapas.
+  """
+  stages = config['stages']
+  graph_extension = '.gexf' if config['output_format'] == 'gexf' else GRAPH_STORE_EXTENSION
+  csv_options = ['--csv-engine', config['csv_engine']]
+  tasks = []
+
+  sweep_spec = load_sweep_spec(config['robustness_sweep_spec']) if 'attacks' in stages else None
+
+  for institution in config['institutions']:
+    works_path = os.path.join(config['data_dir'], f"works_{institution}.csv")
+    authors_path = os.path.join(config['data_dir'], f"authors_{institution}.csv")
+    graphs_dir = os.path.join(config['graphs_dir'], institution)
+
+    if 'authors' in stages:
+      chunk_options = ['--chunk-size', str(config['chunk_size'])] if config['chunk_size'] else []
+      tasks.append(PipelineTask(
+        name=f"authors:{institution}",
+        command=_script('authors_extractor.py') + ['--csv-path', works_path, '--output-csv-path', authors_path] + csv_options + chunk_options,
+        inputs=[works_path],
+        outputs=[authors_path]
+      ))
+
+    if 'graphs' in stages:
+      registry_options = ['--registry-path', config['registry_path']] if config['registry_path'] else []
+      tasks.append(PipelineTask(
+        name=f"graphs:{institution}",
+        command=_script('network_generator.py') + [
+          '--csv-path-works', works_path,
+          '--csv-path-authors', authors_path,
+          '--output-gexf-path', graphs_dir,
+          '--file-suffix', institution,
+          '--output-format', config['output_format'],
+          '--start-year', str(config['start_year']),
+          '--end-year', str(config['end_year']),
+          '--temporal-index-path', os.path.join(graphs_dir, f"index_{institution}{TEMPORAL_INDEX_EXTENSION}")
+        ] + registry_options + csv_options,
+        inputs=[works_path, authors_path],
+        outputs=[graphs_dir]
+      ))
+
+    attack_years = sweep_spec['years'] if sweep_spec else []
+    for year in sorted(set(config['metrics_years']) | set(attack_years)):
+      graph_path = os.path.join(graphs_dir, f"graph_{institution}_{year}{graph_extension}")
+      metrics_paths = metrics_output_paths(os.path.join(config['metrics_dir'], institution, f"{institution}_{year}.json"), config['metrics_format'])
+
+      if 'metrics' in stages and year in config['metrics_years']:
+        tasks.append(PipelineTask(
+          name=f"metrics:{institution}:{year}",
+          command=_script('network_metrics_extractor.py') + [
+            '--graph-path', graph_path,
+            '--output-json-path', metrics_paths[0],
+            '--output-format', config['metrics_format'],
+            '--backend', config['metrics_backend'],
+            '--workers', str(config['metrics_workers'])
+          ] + (['--catalog-path', config['catalog_path'], '--institution', institution, '--year', str(year)] if config['catalog_path'] else []),
+          inputs=[graph_path],
+          outputs=metrics_paths
+        ))
+
+      if 'attacks' in stages and year in attack_years:
+        spec = {key: value for key, value in sweep_spec.items() if key not in ('start_year', 'end_year', 'combined_output_json_path')}
+        spec.update({'institutions': [institution], 'years': [year], 'graph_path': graph_path})
+        if config['catalog_path']:
+          spec['catalog_path'] = config['catalog_path']
+        inputs = [graph_path]
+        if 'metrics_json_path' in spec:
+          spec['metrics_json_path'] = metrics_paths[-1]
+          inputs.append(metrics_paths[-1])
+
+        outputs = []
+        for metric in spec['metrics']:
+          if spec.get('output_json_path'):
+            outputs += [
+              spec['output_json_path'].format(institution=institution, year=year, metric=metric, num_hubs=num_hubs)
+              for num_hubs in spec['num_hubs']
+            ]
+          if spec.get('curve_output_json_path'):
+            outputs.append(spec['curve_output_json_path'].format(institution=institution, year=year, metric=metric))
+
+        spec_path = os.path.join(os.path.dirname(config['state_path']), 'specs', f"robustness_{institution}_{year}.json")
+        _write_if_changed(spec_path, json.dumps(spec, ensure_ascii=False, indent=2))
+        tasks.append(PipelineTask(
+          name=f"attacks:{institution}:{year}",
+          command=_script('hub_robustness_analyzer.py') + ['--sweep-spec', spec_path],
+          inputs=inputs + [spec_path],
+          outputs=outputs
+        ))
+
+  return tasks
+
+
+def _is_within(path, directory):
+  path, directory = os.path.normpath(path), os.path.normpath(directory)
+  return path == directory or path.startswith(directory + os.sep)
+
+
+def task_dependencies(tasks):
+  """
+  Liga cada tarefa às que produzem as suas entradas: uma entrada depende da tarefa que tem
+  o mesmo caminho (ou uma pasta que o contém) entre as saídas.
+
+  Returns:
+    dict: Para cada nome de tarefa, o conjunto dos nomes das tarefas de que ela depende.
+  """
+  dependencies = {}
+  for task in tasks:
+    dependencies[task.name] = {
+      producer.name
+      for producer in tasks if producer.name != task.name
+      for input_path in task.inputs
+      for output_path in producer.outputs
+      if _is_within(input_path, output_path)
+    }
+  return dependencies
+
+
+def _hashes(paths, hash_cache):
+  return {path: path_hash(path, hash_cache) for path in paths}
+
+
+def is_up_to_date(task, record, hash_cache):
+  """Indica se as saídas da tarefa existem e foram geradas pelo mesmo comando a partir das
+  entradas com o conteúdo atual (e não foram alteradas desde então)."""
+  if not record or record.get('command') != task.command:
+    return False
+  if record.get('inputs') != _hashes(task.inputs, hash_cache):
+    return False
+
+  output_hashes = _hashes(task.outputs, hash_cache)
+  return None not in output_hashes.values() and record.get('outputs') == output_hashes
+
+
+def _run_task(task, log_path, environment):
+  """Executa o comando da tarefa, gravando a saída em `log_path`."""
+  print(f"[executando] {task.name}", flush=True)
+  os.makedirs(os.path.dirname(log_path), exist_ok=True)
+  with open(log_path, 'w', encoding='utf-8') as log:
+    completed = subprocess.run(task.command, stdout=log, stderr=subprocess.STDOUT, env=environment)
+  return completed.returncode
+
+
+def run_pipeline(tasks, state_path, processes=1, force=False, dry_run=False):
+  """
+  Executa as tarefas em ordem de dependência, com até `processes` tarefas independentes
+  (por exemplo, instituições e anos diferentes) ao mesmo tempo.
+
+  Uma tarefa é pulada quando as suas saídas estão atualizadas: o estado em `state_path` guarda,
+  para cada tarefa executada, o comando e os hashes do conteúdo das entradas e saídas. Assim,
+  uma tarefa reexecutada cujas saídas não mudaram não força as tarefas seguintes. A saída de
+  cada comando fica em '<pasta do estado>/logs/<tarefa>.log'.
+
+  Args:
+    tasks (list): As tarefas (`build_pipeline`).
+    state_path (str): O arquivo de estado do pipeline.
+    processes (int): Número máximo de tarefas executadas ao mesmo tempo.
+    force (bool): Se verdadeiro, executa todas as tarefas, mesmo as atualizadas.
+    dry_run (bool): Se verdadeiro, só mostra o que seria executado.
+
+  Returns:
+    dict: O resultado de cada tarefa: 'up_to_date', 'ran', 'would_run', 'failed' ou
+    'skipped' (entrada ausente ou dependência que falhou).
+  """
+  state = load_cached_value(state_path) or {'tasks': {}, 'hash_cache': {}}
+  hash_cache = state['hash_cache']
+  dependencies = task_dependencies(tasks)
+  tasks_by_name = {task.name: task for task in tasks}
+  logs_dir = os.path.join(os.path.dirname(state_path), 'logs')
+
+  environment = dict(os.environ)
+  environment['PYTHONPATH'] = os.pathsep.join(filter(None, [os.getcwd(), environment.get('PYTHONPATH')]))
+
+  results = {}
+  pending = [task.name for task in tasks]
+  running = {}
+
+  def save_state():
+    if not dry_run:
+      store_cached_value(state_path, {'value': state})
+
+  with ThreadPoolExecutor(max_workers=max(processes, 1)) as executor:
+    while pending or running:
+      for name in list(pending):
+        task = tasks_by_name[name]
+        dependency_results = [results.get(dependency) for dependency in dependencies[name]]
+        if None in dependency_results:
+          continue
+        pending.remove(name)
+
+        if any(result in ('failed', 'skipped') for result in dependency_results):
+          results[name] = 'skipped'
+          print(f"[pulada] {name}: uma dependência falhou ou foi pulada")
+          continue
+
+        if dry_run and any(result == 'would_run' for result in dependency_results):
+          results[name] = 'would_run'
+          print(f"[executaria] {name}")
+          continue
+
+        missing_inputs = [path for path in task.inputs if not os.path.exists(path)]
+        if missing_inputs:
+          results[name] = 'skipped'
+          print(f"[pulada] {name}: entrada ausente ({', '.join(missing_inputs)})")
+          continue
+
+        if not force and is_up_to_date(task, state['tasks'].get(name), hash_cache):
+          results[name] = 'up_to_date'
+          print(f"[atualizada] {name}")
+          continue
+
+        if dry_run:
+          results[name] = 'would_run'
+          print(f"[executaria] {name}")
+          continue
+
+        input_hashes = _hashes(task.inputs, hash_cache)
+        log_path = os.path.join(logs_dir, f"{name.replace(':', '_')}.log")
+        running[executor.submit(_run_task, task, log_path, environment)] = (name, input_hashes, log_path)
+
+      if not running:
+        if pending:
+          raise ValueError(f"Dependências circulares entre as tarefas: {', '.join(pending)}")
+        break
+
+      done, _ = wait(running, return_when=FIRST_COMPLETED)
+      for future in done:
+        name, input_hashes, log_path = running.pop(future)
+        task = tasks_by_name[name]
+        output_hashes = _hashes(task.outputs, hash_cache)
+        missing_outputs = [path for path, digest in output_hashes.items() if digest is None]
+
+        if future.result() != 0 or missing_outputs:
+          results[name] = 'failed'
+          state['tasks'].pop(name, None)
+          reason = f"código de saída {future.result()}" if future.result() != 0 else f"saídas ausentes: {', '.join(missing_outputs)}"
+          print(f"[falhou] {name} ({reason}). Veja o log: {log_path}")
+        else:
+          results[name] = 'ran'
+          state['tasks'][name] = {'command': task.command, 'inputs': input_hashes, 'outputs': output_hashes}
+          print(f"[concluída] {name}")
+        save_state()
+
+  save_state()
+  return results
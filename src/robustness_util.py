@@ -0,0 +1,871 @@
+import heapq
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+from src.csr_util import (
+  BFS_BATCH_ELEMENTS, degrees, largest_component, connected_components, induced_subgraph,
+  betweenness_centrality, binary_structure, approximate_centralities, shared_structure_executor, worker_structure
+)
+from src.graph_store_util import read_csr_graph, export_node_ids
+from src.metrics_store_util import load_metrics, import_node_metrics
+from src.catalog_util import record_attack_results
+from src.network_util import identify_hubs, analyze_network_attack, network_attack_baseline, extract_graph_metrics
+
+HUB_METRIC_KEYS = {
+  'degree': 'degrees',
+  'betweenness': 'betweenness_centrality',
+  'closeness': 'closeness_centrality',
+  'eigenvector': 'eigenvector_centrality'
+}
+
+ADAPTIVE_METRICS = ['degree', 'betweenness']
+
+# Limite padrão de recálculos da intermediação no ataque adaptativo: cada recálculo custa uma
+# varredura BFS (O(n·m) exata), então recalcular após cada remoção da curva completa seria O(n²·m)
+ADAPTIVE_MAX_RECOMPUTES = 100
+
+# Pivôs padrão de cada recálculo da intermediação na curva completa do ataque adaptativo
+ADAPTIVE_CURVE_PIVOTS = 256
+
+RANDOM_FAILURE_FRACTIONS = [round(0.05 * step, 2) for step in range(20)]
+
+# Origens sorteadas por ensaio e fração na estimativa padrão da eficiência global das falhas
+# aleatórias (a eficiência exata custa uma varredura BFS completa por ensaio e fração)
+RANDOM_FAILURE_EFFICIENCY_PIVOTS = 64
+
+ANALYSIS_SCOPES = {
+  False: 'General Graph',
+  True: 'Largest Connected Component (LCC)'
+}
+
+
+# Campos dos resultados dos ataques que guardam vértices
+_ATTACK_NODE_FIELDS = ('hubs_ids', 'removal_order')
+
+
+def _attack_nodes(results):
+  if isinstance(results, dict):
+    for field, value in results.items():
+      if field in _ATTACK_NODE_FIELDS:
+        yield from value
+      else:
+        yield from _attack_nodes(value)
+
+
+def _relabel_attack_nodes(results, mapping):
+  if not isinstance(results, dict):
+    return results
+  return {
+    field: [mapping[node] for node in value] if field in _ATTACK_NODE_FIELDS else _relabel_attack_nodes(value, mapping)
+    for field, value in results.items()
+  }
+
+
+def export_attack_nodes(results, graph_path):
+  """
+  Traduz os vértices dos resultados de ataques ('hubs_ids' e 'removal_order', em qualquer
+  nível) de um grafo lido com `read_csr_graph(graph_path, interned=True)` para os IDs dos
+  autores, lendo do registro apenas esses vértices. Sem registro, os resultados são
+  retornados como estão.
+
+  Args:
+    results (dict): Os resultados (`hub_attack_results`, `hub_attack_curves`, `attack_curve`...).
+    graph_path (str): O caminho do grafo.
+
+  Returns:
+    dict: Os resultados, com os IDs dos autores como vértices.
+  """
+  nodes = list(dict.fromkeys(_attack_nodes(results)))
+  node_ids = export_node_ids(graph_path, nodes)
+  if node_ids is nodes:
+    return results
+  return _relabel_attack_nodes(results, dict(zip(nodes, node_ids)))
+
+
+def hub_ranking(csr_graph, centrality_dict, lcc_only=False):
+  """
+  Ordena os vértices pela centralidade, do maior para o menor. Os `n` primeiros da
+  lista são os mesmos retornados por `identify_hubs(..., top_n=n)`.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    centrality_dict (dict): Dicionário onde as chaves são os nós e os valores são suas centralidades.
+    lcc_only (bool): Se verdadeiro, considera apenas os vértices do maior componente conectado.
+
+  Returns:
+    list: Os IDs dos vértices, do mais central ao menos central.
+  """
+  if lcc_only:
+    lcc_nodes = {csr_graph.node_ids[i] for i in largest_component(csr_graph)}
+    centrality_dict = {node: centrality for node, centrality in centrality_dict.items() if node in lcc_nodes}
+
+  return identify_hubs(centrality_dict, top_n=len(centrality_dict))
+
+
+def hub_rankings(csr_graph, centralities, lcc_only=False):
+  """
+  Aplica `hub_ranking` às centralidades de cada métrica.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    centralities (dict): Dicionário onde as chaves são as métricas ('degree', 'betweenness', ...)
+      e os valores são os dicionários de centralidade.
+    lcc_only (bool): Se verdadeiro, considera apenas os vértices do maior componente conectado.
+
+  Returns:
+    dict: Dicionário `{métrica: lista de IDs do mais central ao menos central}`.
+  """
+  return {
+    metric: hub_ranking(csr_graph, centrality_dict, lcc_only=lcc_only)
+    for metric, centrality_dict in centralities.items()
+  }
+
+
+def hub_attack_results(csr_graph, rankings, num_hubs_list, lcc_only=False, workers=1, before_attack=None, attack_info=None):
+  """
+  Executa os ataques a hubs de várias métricas e quantidades de hubs sobre um mesmo grafo,
+  medindo o estado original da rede uma única vez.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    rankings (dict): Dicionário onde as chaves são as métricas ('degree', 'betweenness', ...)
+      e os valores são as ordens de remoção (`hub_rankings` ou `adaptive_hub_rankings`).
+    num_hubs_list (list): As quantidades de hubs a serem removidas em cada ataque.
+    lcc_only (bool): Se os hubs foram escolhidos apenas no maior componente conectado.
+    workers (int): Número de processos das varreduras BFS da eficiência global.
+    before_attack (dict): As métricas da rede original (`network_attack_baseline`). Padrão: calculadas aqui.
+    attack_info (dict): Informações adicionais registradas em 'hubs_removed_info' de cada resultado
+      (por exemplo, 'centrality_sampling').
+
+  Returns:
+    dict: Dicionário `{métrica: {quantidade de hubs: resultado}}`, onde cada resultado tem o
+    formato de `analyze_network_attack` acrescido de 'hubs_removed_info'.
+  """
+  if before_attack is None:
+    before_attack = network_attack_baseline(csr_graph, workers=workers)
+
+  results = {}
+  for metric, ranking in rankings.items():
+    results[metric] = {}
+
+    for num_hubs in num_hubs_list:
+      hubs_to_remove = ranking[:num_hubs]
+      attack_results = analyze_network_attack(csr_graph, hubs_to_remove, workers=workers, before_attack=before_attack)
+      attack_results['hubs_removed_info'] = {
+        'metric_used': metric,
+        'source_metric_key': HUB_METRIC_KEYS[metric],
+        'analysis_scope': ANALYSIS_SCOPES[lcc_only],
+        'hubs_ids': hubs_to_remove
+      }
+      if attack_info:
+        attack_results['hubs_removed_info'].update(attack_info)
+      results[metric][num_hubs] = attack_results
+
+  return results
+
+
+def _adaptive_degree_order(csr_graph, candidates, num_removals):
+  """
+  Ordem do ataque adaptativo por grau: remove sempre o vértice de maior grau no grafo restante.
+  Os graus são atualizados incrementalmente (cada remoção decrementa os vizinhos) em um heap
+  com entradas obsoletas descartadas na retirada, em O((n + m) log n).
+  """
+  adjacency = csr_graph.adjacency
+  indptr, indices = adjacency.indptr, adjacency.indices
+  degree = degrees(csr_graph).tolist()
+  removed = [False] * adjacency.shape[0]
+
+  heap = [(-degree[node], node) for node in candidates]
+  heapq.heapify(heap)
+
+  order = []
+  while heap and len(order) < num_removals:
+    negative_degree, node = heapq.heappop(heap)
+    if removed[node] or -negative_degree != degree[node]:
+      continue
+
+    removed[node] = True
+    order.append(node)
+    for neighbor in indices[indptr[node]:indptr[node + 1]].tolist():
+      if neighbor != node and not removed[neighbor]:
+        degree[neighbor] -= 1
+        if neighbor in candidates:
+          heapq.heappush(heap, (-degree[neighbor], neighbor))
+
+  return order
+
+
+def _adaptive_betweenness_order(csr_graph, candidates, num_removals, recompute_interval, pivots, seed, workers):
+  """
+  Ordem do ataque adaptativo por intermediação: a cada `recompute_interval` remoções, a
+  intermediação é recalculada no grafo restante (exata ou com `pivots` pivôs) e os
+  `recompute_interval` vértices mais centrais são removidos.
+  """
+  num_nodes = csr_graph.adjacency.shape[0]
+  present = np.ones(num_nodes, dtype=bool)
+  is_candidate = np.zeros(num_nodes, dtype=bool)
+  is_candidate[list(candidates)] = True
+
+  order = []
+  while len(order) < num_removals and (present & is_candidate).any():
+    remaining_indices = np.flatnonzero(present)
+    remaining_graph = induced_subgraph(csr_graph, remaining_indices)
+
+    if pivots is not None and pivots < len(remaining_indices):
+      betweenness, _, _ = approximate_centralities(remaining_graph, pivots=pivots, seed=seed, workers=workers)
+    else:
+      betweenness = betweenness_centrality(remaining_graph, workers=workers)
+
+    ranking = remaining_indices[np.argsort(-betweenness, kind='stable')]
+    ranking = ranking[is_candidate[ranking]][:min(recompute_interval, num_removals - len(order))]
+    present[ranking] = False
+    order.extend(ranking.tolist())
+
+  return order
+
+
+def adaptive_recompute_interval(num_removals, recompute_interval=None):
+  """
+  O intervalo entre recálculos da intermediação no ataque adaptativo. Sem um intervalo
+  explícito, ele cresce com o número de remoções para que haja no máximo
+  `ADAPTIVE_MAX_RECOMPUTES` recálculos (intervalo 1 para ataques a poucos hubs).
+
+  Args:
+    num_removals (int): O número de vértices removidos.
+    recompute_interval (int): O intervalo pedido (pelo menos 1), ou None para o automático.
+
+  Returns:
+    int: O intervalo.
+  """
+  if recompute_interval is not None:
+    if recompute_interval < 1:
+      raise ValueError("O intervalo de recálculo deve ser pelo menos 1.")
+    return recompute_interval
+  return max(1, math.ceil(num_removals / ADAPTIVE_MAX_RECOMPUTES))
+
+
+def adaptive_hub_ranking(csr_graph, metric, num_removals=None, lcc_only=False, recompute_interval=None, pivots=None, seed=None, workers=1):
+  """
+  Ordem de remoção de um ataque adaptativo, em que o próximo hub é escolhido pela centralidade
+  no grafo que resta após as remoções anteriores.
+
+  Na intermediação, cada recálculo é uma varredura BFS completa (O(n·m)) ou, com `pivots`, a
+  partir de `pivots` origens (O(pivots·m)). O custo total é o número de recálculos
+  (`num_removals / recompute_interval`) vezes o de um recálculo; para a curva completa, use o
+  intervalo automático e pivôs (ex.: `ADAPTIVE_CURVE_PIVOTS`).
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    metric (str): 'degree' (graus atualizados incrementalmente após cada remoção) ou 'betweenness'
+      (recalculada a cada `recompute_interval` remoções).
+    num_removals (int): Quantos vértices remover. Padrão: todos os candidatos.
+    lcc_only (bool): Se verdadeiro, apenas os vértices do maior componente conectado original são removidos.
+    recompute_interval (int): Número de remoções entre dois recálculos da intermediação. Padrão:
+      automático (`adaptive_recompute_interval`), com no máximo `ADAPTIVE_MAX_RECOMPUTES` recálculos.
+    pivots (int): Se especificado, a intermediação é estimada com esse número de pivôs em cada
+      recálculo. Padrão: exata.
+    seed (int): Semente do sorteio dos pivôs.
+    workers (int): Número de processos das varreduras BFS da intermediação.
+
+  Returns:
+    list: Os IDs dos vértices na ordem de remoção.
+  """
+  if metric not in ADAPTIVE_METRICS:
+    raise ValueError(f"Métrica '{metric}' não suportada no ataque adaptativo. Opções: {', '.join(ADAPTIVE_METRICS)}")
+  num_nodes = csr_graph.adjacency.shape[0]
+  candidates = set(largest_component(csr_graph).tolist()) if lcc_only else set(range(num_nodes))
+  num_removals = len(candidates) if num_removals is None else min(num_removals, len(candidates))
+  recompute_interval = adaptive_recompute_interval(num_removals, recompute_interval)
+
+  if metric == 'degree':
+    order = _adaptive_degree_order(csr_graph, candidates, num_removals)
+  else:
+    order = _adaptive_betweenness_order(csr_graph, candidates, num_removals, recompute_interval, pivots, seed, workers)
+
+  return [csr_graph.node_ids[node] for node in order]
+
+
+def adaptive_hub_rankings(csr_graph, metrics, num_removals=None, lcc_only=False, recompute_interval=None, pivots=None, seed=None, workers=1):
+  """
+  Aplica `adaptive_hub_ranking` a cada métrica.
+
+  Returns:
+    dict: Dicionário `{métrica: lista de IDs na ordem de remoção}`.
+  """
+  return {
+    metric: adaptive_hub_ranking(
+      csr_graph, metric, num_removals=num_removals, lcc_only=lcc_only,
+      recompute_interval=recompute_interval, pivots=pivots, seed=seed, workers=workers
+    )
+    for metric in metrics
+  }
+
+
+def _find(parent, node):
+  """Encontra a raiz de um vértice na union-find, com compressão de caminho por divisão."""
+  while parent[node] != node:
+    parent[node] = parent[parent[node]]
+    node = parent[node]
+  return node
+
+
+def lcc_removal_curve(csr_graph, removal_order):
+  """
+  Calcula o tamanho do maior componente conectado após cada remoção de uma ordem de ataque,
+  por percolação reversa: os vértices removidos são devolvidos ao grafo na ordem inversa e
+  os componentes são mantidos em uma union-find, em tempo quase linear no número de arestas.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    removal_order (list): Os índices dos vértices na ordem de remoção (sem repetições). Vértices
+      fora da lista nunca são removidos.
+
+  Returns:
+    np.ndarray: Vetor com `len(removal_order) + 1` posições, onde a posição `k` é o tamanho do
+    maior componente conectado após a remoção dos `k` primeiros vértices.
+  """
+  adjacency = csr_graph.adjacency
+  num_nodes = adjacency.shape[0]
+  removal_order = np.asarray(removal_order, dtype=np.int64)
+  num_removed = len(removal_order)
+
+  present = np.ones(num_nodes, dtype=bool)
+  present[removal_order] = False
+  remaining_indices = np.flatnonzero(present)
+
+  # Estado inicial: componentes do grafo sem nenhum dos vértices removidos
+  parent = list(range(num_nodes))
+  size = [1] * num_nodes
+  largest = 0
+  if len(remaining_indices):
+    _, labels = connected_components(induced_subgraph(csr_graph, remaining_indices))
+    roots = remaining_indices[np.unique(labels, return_index=True)[1]]
+    component_sizes = np.bincount(labels)
+    for node, label in zip(remaining_indices.tolist(), labels.tolist()):
+      parent[node] = int(roots[label])
+    for root, component_size in zip(roots.tolist(), component_sizes.tolist()):
+      size[root] = component_size
+    largest = int(component_sizes.max())
+
+  curve = np.zeros(num_removed + 1, dtype=np.int64)
+  curve[num_removed] = largest
+  indptr, indices = adjacency.indptr, adjacency.indices
+  present = present.tolist()
+
+  for k in range(num_removed - 1, -1, -1):
+    node = int(removal_order[k])
+    present[node] = True
+
+    for neighbor in indices[indptr[node]:indptr[node + 1]].tolist():
+      if not present[neighbor]:
+        continue
+      root_node, root_neighbor = _find(parent, node), _find(parent, neighbor)
+      if root_node == root_neighbor:
+        continue
+      if size[root_node] < size[root_neighbor]:
+        root_node, root_neighbor = root_neighbor, root_node
+      parent[root_neighbor] = root_node
+      size[root_node] += size[root_neighbor]
+
+    largest = max(largest, size[_find(parent, node)])
+    curve[k] = largest
+
+  return curve
+
+
+def robustness_index(curve, num_nodes):
+  """
+  Calcula o índice de robustez R de Schneider et al. (2011): a média, sobre as remoções
+  Q = 1, ..., N, da fração de vértices no maior componente conectado, R = (1/N) Σ s(Q).
+  Se a ordem de ataque não remover todos os vértices, a soma vai apenas até a última remoção.
+
+  Args:
+    curve (np.ndarray): A curva de `lcc_removal_curve`.
+    num_nodes (int): O número de vértices do grafo original.
+
+  Returns:
+    float: O índice R, entre 0 e 0.5 para uma ordem que remove todos os vértices.
+  """
+  if num_nodes == 0:
+    return 0.0
+  return float(np.sum(curve[1:]) / (num_nodes * num_nodes))
+
+
+def attack_curve(csr_graph, removal_order):
+  """
+  Curva completa de um ataque: o tamanho do maior componente conectado após cada remoção e o
+  índice de robustez R, a partir de uma única passada de componentes.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    removal_order (list): Os IDs dos vértices na ordem de remoção.
+
+  Returns:
+    dict: Dicionário com 'removal_order', 'fraction_removed', 'largest_connected_component_size',
+    'largest_connected_component_fraction' e 'robustness_index'.
+  """
+  num_nodes = len(csr_graph.node_ids)
+  node_index = {node_id: index for index, node_id in enumerate(csr_graph.node_ids)}
+  curve = lcc_removal_curve(csr_graph, [node_index[node] for node in removal_order])
+
+  return {
+    'removal_order': list(removal_order),
+    'fraction_removed': (np.arange(len(curve)) / num_nodes).tolist() if num_nodes else [0.0],
+    'largest_connected_component_size': curve.tolist(),
+    'largest_connected_component_fraction': (curve / num_nodes).tolist() if num_nodes else [0.0],
+    'robustness_index': robustness_index(curve, num_nodes)
+  }
+
+
+def hub_attack_curves(csr_graph, rankings, lcc_only=False, attack_info=None):
+  """
+  Calcula a curva de ataque completa (`attack_curve`) de cada métrica.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    rankings (dict): Dicionário onde as chaves são as métricas e os valores são as ordens de remoção.
+    lcc_only (bool): Se os vértices foram escolhidos apenas no maior componente conectado.
+    attack_info (dict): Informações adicionais registradas em cada curva.
+
+  Returns:
+    dict: Dicionário `{métrica: curva}`, com 'metric_used', 'source_metric_key' e 'analysis_scope' em cada curva.
+  """
+  curves = {}
+  for metric, ranking in rankings.items():
+    curve = attack_curve(csr_graph, ranking)
+    curve.update({
+      'metric_used': metric,
+      'source_metric_key': HUB_METRIC_KEYS[metric],
+      'analysis_scope': ANALYSIS_SCOPES[lcc_only]
+    })
+    if attack_info:
+      curve.update(attack_info)
+    curves[metric] = curve
+  return curves
+
+
+def _removal_ranks(seed_sequences, num_nodes):
+  """Sorteia uma permutação de remoção por ensaio e retorna a posição de cada vértice nela
+  (ensaio × vértice): a fração `f` remove os vértices com posição menor que `round(f · n)`."""
+  ranks = np.empty((len(seed_sequences), num_nodes), dtype=np.int32)
+  for trial, seed_sequence in enumerate(seed_sequences):
+    ranks[trial, np.random.default_rng(seed_sequence).permutation(num_nodes)] = np.arange(num_nodes)
+  return ranks
+
+
+def _block_diagonal(edges, present):
+  """
+  Monta os subgrafos induzidos por cada linha de `present` como blocos de uma única matriz
+  bloco-diagonal (simétrica), só com os vértices presentes, na ordem (subgrafo, vértice).
+
+  Returns:
+    tuple: A matriz e o vetor com o subgrafo de cada linha da matriz.
+  """
+  num_graphs, num_nodes = present.shape
+  sources, targets = edges
+  flat_present = present.ravel()
+  positions = np.cumsum(flat_present) - 1
+  node_graph = np.flatnonzero(flat_present) // num_nodes
+  total_nodes = len(node_graph)
+
+  graph_index, edge_index = np.nonzero(present[:, sources] & present[:, targets])
+  offsets = graph_index * num_nodes
+  rows = positions[offsets + sources[edge_index]]
+  columns = positions[offsets + targets[edge_index]]
+  block_diagonal = sp.csr_matrix(
+    (np.ones(2 * len(rows), dtype=np.float32), (np.concatenate([rows, columns]), np.concatenate([columns, rows]))),
+    shape=(total_nodes, total_nodes)
+  )
+  return block_diagonal, node_graph
+
+
+def _batched_lcc_sizes(block_diagonal, node_graph, num_graphs):
+  """Tamanho do maior componente conectado de cada subgrafo de `_block_diagonal`, a partir de uma
+  única chamada de `connected_components`."""
+  lcc_sizes = np.zeros(num_graphs, dtype=np.int64)
+  if len(node_graph) == 0:
+    return lcc_sizes
+
+  _, labels = csgraph.connected_components(block_diagonal, directed=False)
+  component_sizes = np.bincount(labels)
+  component_graph = np.zeros(len(component_sizes), dtype=np.int64)
+  component_graph[labels] = node_graph
+  np.maximum.at(lcc_sizes, component_graph, component_sizes)
+  return lcc_sizes
+
+
+def _batched_efficiencies(block_diagonal, node_graph, num_graphs, pivots, rngs):
+  """
+  Eficiência global de cada subgrafo de `_block_diagonal`, exata ou estimada a partir de `pivots`
+  origens sorteadas por subgrafo (com o gerador `rngs[i]` do subgrafo i).
+
+  Como os blocos são desconexos, cada coluna da BFS leva uma origem de cada subgrafo ao mesmo
+  tempo: a coluna j parte da j-ésima origem de todos os subgrafos, e as BFS de todos saem dos
+  mesmos produtos de matriz esparsa, sem laço em Python por subgrafo. Os níveis da BFS vão até
+  o maior diâmetro entre os subgrafos, então os subgrafos de um lote devem ser parecidos (ex.:
+  a mesma fração removida em vários ensaios).
+  """
+  num_present = np.bincount(node_graph, minlength=num_graphs)
+  block_starts = np.concatenate([[0], np.cumsum(num_present)[:-1]])
+
+  source_rows, source_columns = [], []
+  num_sources = np.zeros(num_graphs, dtype=np.int64)
+  for graph, rng in enumerate(rngs):
+    size = int(num_present[graph])
+    if size < 2:
+      continue
+    if pivots is None or pivots >= size:
+      chosen = np.arange(size)
+    else:
+      chosen = np.sort(rng.choice(size, size=pivots, replace=False))
+    source_rows.append(block_starts[graph] + chosen)
+    source_columns.append(np.arange(len(chosen)))
+    num_sources[graph] = len(chosen)
+
+  efficiencies = np.zeros(num_graphs)
+  if not source_rows:
+    return efficiencies
+  source_rows, source_columns = np.concatenate(source_rows), np.concatenate(source_columns)
+
+  total_nodes = len(node_graph)
+  num_columns = int(num_sources.max())
+  batch_size = max(1, BFS_BATCH_ELEMENTS // total_nodes)
+  inverse_distance_totals = np.zeros(total_nodes)
+  for start in range(0, num_columns, batch_size):
+    width = min(batch_size, num_columns - start)
+    in_batch = (source_columns >= start) & (source_columns < start + width)
+    visited = np.zeros((total_nodes, width), dtype=bool)
+    visited[source_rows[in_batch], source_columns[in_batch] - start] = True
+    frontier = visited.astype(np.float32)
+
+    level = 0
+    while True:
+      discovered = (block_diagonal @ frontier) > 0
+      discovered &= ~visited
+      counts = discovered.sum(axis=1)
+      if not counts.any():
+        break
+      level += 1
+      visited |= discovered
+      inverse_distance_totals += counts / level
+      frontier = discovered.astype(np.float32)
+
+  totals = np.bincount(node_graph, weights=inverse_distance_totals, minlength=num_graphs)
+  valid = num_sources > 0
+  efficiencies[valid] = totals[valid] / (num_sources[valid] * (num_present[valid] - 1))
+  return efficiencies
+
+
+def _random_failure_trials(structure, seed_sequences, fractions, efficiency, efficiency_pivots):
+  """Executa um lote de ensaios de falha aleatória e retorna as matrizes (ensaio × fração) do tamanho
+  do maior componente conectado e da eficiência global (ou None). Os ensaios são processados em
+  blocos e, em cada bloco, fração a fração: as máscaras e a matriz bloco-diagonal dos subgrafos
+  de uma fração em todos os ensaios do bloco ficam limitadas por `BFS_BATCH_ELEMENTS`."""
+  num_nodes = structure.shape[0]
+  num_trials, num_fractions = len(seed_sequences), len(fractions)
+  upper = sp.triu(structure, k=1).tocoo()
+  edges = (upper.row.astype(np.int64), upper.col.astype(np.int64))
+  removed_counts = np.rint(np.asarray(fractions) * num_nodes).astype(np.int64)
+  chunk_size = max(1, BFS_BATCH_ELEMENTS // max(len(edges[0]), num_nodes, 1))
+
+  lcc_sizes = np.zeros((num_trials, num_fractions), dtype=np.int64)
+  efficiencies = np.zeros((num_trials, num_fractions)) if efficiency else None
+  for start in range(0, num_trials, chunk_size):
+    chunk = seed_sequences[start:start + chunk_size]
+    ranks = _removal_ranks(chunk, num_nodes)
+    # Um gerador por ensaio, usado nas frações em ordem: o resultado não depende dos blocos
+    rngs = [np.random.default_rng(seed_sequence.spawn(1)[0]) for seed_sequence in chunk] if efficiency else None
+
+    for fraction_index, removed_count in enumerate(removed_counts.tolist()):
+      block_diagonal, node_graph = _block_diagonal(edges, ranks >= removed_count)
+      lcc_sizes[start:start + len(chunk), fraction_index] = _batched_lcc_sizes(block_diagonal, node_graph, len(chunk))
+      if efficiency:
+        efficiencies[start:start + len(chunk), fraction_index] = _batched_efficiencies(
+          block_diagonal, node_graph, len(chunk), efficiency_pivots, rngs
+        )
+
+  return lcc_sizes, efficiencies
+
+
+def _random_failure_worker(seed_sequences, fractions, efficiency, efficiency_pivots):
+  return _random_failure_trials(worker_structure(), seed_sequences, fractions, efficiency, efficiency_pivots)
+
+
+def _trial_summary(values):
+  """Média, desvio padrão, intervalo de confiança de 95% da média e faixa dos percentis 2,5–97,5
+  de cada coluna (fração removida) de uma matriz ensaio × fração."""
+  num_trials = values.shape[0]
+  mean = values.mean(axis=0)
+  std = values.std(axis=0, ddof=1) if num_trials > 1 else np.zeros(values.shape[1])
+  margin = 1.96 * std / np.sqrt(num_trials)
+
+  return {
+    'mean': mean.tolist(),
+    'std': std.tolist(),
+    'ci95_lower': (mean - margin).tolist(),
+    'ci95_upper': (mean + margin).tolist(),
+    'percentile_2_5': np.percentile(values, 2.5, axis=0).tolist(),
+    'percentile_97_5': np.percentile(values, 97.5, axis=0).tolist()
+  }
+
+
+def random_failure_analysis(csr_graph, fractions=RANDOM_FAILURE_FRACTIONS, trials=1000, seed=None, efficiency=True,
+                            efficiency_pivots=RANDOM_FAILURE_EFFICIENCY_PIVOTS, workers=1):
+  """
+  Linha de base de falhas aleatórias: em cada ensaio, os vértices são removidos em uma ordem
+  uniformemente aleatória e o tamanho do maior componente conectado e a eficiência global são
+  medidos em cada fração removida.
+
+  Os ensaios são processados em blocos: os subgrafos de todas as frações de um bloco formam uma
+  única matriz bloco-diagonal, da qual saem os componentes (uma chamada de `connected_components`)
+  e a eficiência (BFS em lote, com uma origem de cada subgrafo por coluna). Os ensaios podem ser
+  divididos entre processos que leem o mesmo grafo em memória compartilhada. Cada ensaio tem sua própria semente (derivada de `seed`), então os
+  resultados não dependem do número de processos.
+
+  Args:
+    csr_graph (CSRGraph): O grafo em CSR.
+    fractions (list): As frações de vértices removidos em que a rede é medida.
+    trials (int): O número de ensaios.
+    seed (int): A semente dos ensaios.
+    efficiency (bool): Se verdadeiro, mede também a eficiência global de cada ensaio e fração.
+    efficiency_pivots (int): A eficiência é estimada a partir desse número de origens sorteadas por
+      ensaio e fração. Com None, é exata (uma varredura BFS completa por ensaio e fração).
+    workers (int): Número de processos.
+
+  Returns:
+    dict: Dicionário com os parâmetros ('trials', 'seed', 'fractions', 'nodes_removed', 'efficiency_pivots')
+    e, para 'largest_connected_component_size', 'largest_connected_component_fraction' e
+    'global_efficiency' (None se `efficiency` for falso), a média, o desvio padrão, o intervalo de
+    confiança de 95% da média e os percentis 2,5 e 97,5 em cada fração.
+  """
+  if efficiency_pivots is not None and efficiency_pivots < 1:
+    raise ValueError("O número de origens da eficiência deve ser pelo menos 1.")
+
+  structure = binary_structure(csr_graph.adjacency)
+  num_nodes = structure.shape[0]
+  fractions = [float(fraction) for fraction in fractions]
+  seed_sequences = np.random.SeedSequence(seed).spawn(trials)
+
+  if workers > 1 and trials > 1:
+    chunks = [list(chunk) for chunk in np.array_split(np.array(seed_sequences, dtype=object), workers * 4) if len(chunk) > 0]
+    with shared_structure_executor(structure, workers) as executor:
+      partial_results = list(executor.map(
+        _random_failure_worker, chunks,
+        [fractions] * len(chunks), [efficiency] * len(chunks), [efficiency_pivots] * len(chunks)
+      ))
+    lcc_sizes = np.concatenate([lcc for lcc, _ in partial_results])
+    efficiencies = np.concatenate([eff for _, eff in partial_results]) if efficiency else None
+  else:
+    lcc_sizes, efficiencies = _random_failure_trials(structure, seed_sequences, fractions, efficiency, efficiency_pivots)
+
+  return {
+    'trials': trials,
+    'seed': seed,
+    'fractions': fractions,
+    'nodes_removed': np.rint(np.asarray(fractions) * num_nodes).astype(int).tolist(),
+    'efficiency_pivots': efficiency_pivots,
+    'largest_connected_component_size': _trial_summary(lcc_sizes),
+    'largest_connected_component_fraction': _trial_summary(lcc_sizes / num_nodes) if num_nodes else None,
+    'global_efficiency': _trial_summary(efficiencies) if efficiency else None
+  }
+
+
+def load_sweep_spec(spec_path):
+  """
+  Lê a especificação de uma varredura de robustez. Campos do JSON:
+
+    - 'institutions' (list): As instituições.
+    - 'years' (list) ou 'start_year'/'end_year' (int): Os anos.
+    - 'metrics' (list): As métricas dos hubs ('degree', 'betweenness', 'eigenvector', 'closeness').
+    - 'num_hubs' (list): As quantidades de hubs removidos.
+    - 'graph_path' (str): Modelo do caminho do grafo, com '{institution}' e '{year}'. Se existir a
+      versão no formato binário (extensão '.graph'), ela é usada no lugar do GEXF.
+    - 'metrics_json_path' (str, opcional): Modelo do caminho do JSON de métricas. Se existir a
+      versão no formato colunar (extensão '.metrics'), só as colunas das métricas atacadas são
+      lidas dela. Se omitido, as centralidades são calculadas a partir do grafo (backend "csr").
+    - 'output_json_path' (str, opcional): Modelo do caminho de saída de cada ataque, com
+      '{institution}', '{year}', '{metric}' e '{num_hubs}'.
+    - 'combined_output_json_path' (str, opcional): Caminho de um único JSON com todos os resultados.
+    - 'curve_output_json_path' (str, opcional): Modelo do caminho da curva de ataque completa
+      (`attack_curve`) de cada métrica, com '{institution}', '{year}' e '{metric}'.
+    - 'catalog_path' (str, opcional): Catálogo SQLite de métricas (`catalog_util`) onde os
+      resultados dos ataques são registrados.
+    - 'lcc_only' (bool, opcional): Restringe os hubs ao maior componente conectado. Padrão: false.
+    - 'cache_dir' (str, opcional): Diretório do cache de métricas.
+    - 'adaptive' (bool, opcional): Ataque adaptativo (`adaptive_hub_ranking`), em que os hubs são
+      reclassificados após cada remoção; aceita apenas as métricas 'degree' e 'betweenness' e
+      dispensa o JSON de métricas. Padrão: false.
+    - 'recompute_interval', 'pivots' e 'seed' (opcionais): Parâmetros do ataque adaptativo por
+      intermediação (`adaptive_hub_ranking`). Padrão: intervalo automático e, nas curvas
+      completas, `ADAPTIVE_CURVE_PIVOTS` pivôs.
+
+  Args:
+    spec_path (str): O caminho para o arquivo JSON da especificação.
+
+  Returns:
+    dict: A especificação, com 'years' preenchido.
+  """
+  with open(spec_path, 'r', encoding='utf-8') as f:
+    spec = json.load(f)
+
+  if 'years' not in spec:
+    spec['years'] = list(range(spec['start_year'], spec['end_year'] + 1))
+
+  for field in ['institutions', 'metrics', 'num_hubs', 'graph_path']:
+    if field not in spec:
+      raise ValueError(f"Campo obrigatório '{field}' ausente na especificação da varredura.")
+
+  invalid_metrics = [metric for metric in spec['metrics'] if metric not in HUB_METRIC_KEYS]
+  if invalid_metrics:
+    raise ValueError(f"Métricas inválidas: {', '.join(invalid_metrics)}. Opções: {', '.join(HUB_METRIC_KEYS)}")
+
+  if spec.get('adaptive'):
+    invalid_metrics = [metric for metric in spec['metrics'] if metric not in ADAPTIVE_METRICS]
+    if invalid_metrics:
+      raise ValueError(f"Métricas sem ataque adaptativo: {', '.join(invalid_metrics)}. Opções: {', '.join(ADAPTIVE_METRICS)}")
+
+  if not any(field in spec for field in ['output_json_path', 'combined_output_json_path', 'curve_output_json_path', 'catalog_path']):
+    raise ValueError("A especificação precisa de 'output_json_path', 'combined_output_json_path', 'curve_output_json_path' e/ou 'catalog_path'.")
+
+  return spec
+
+
+def _resolve_graph_path(graph_path):
+  """Prefere a versão no formato binário ('.graph') de um caminho GEXF, se existir."""
+  root, extension = os.path.splitext(graph_path)
+  binary_path = f"{root}.graph"
+  if extension == '.gexf' and os.path.exists(os.path.join(binary_path, 'meta.json')):
+    return binary_path
+  return graph_path
+
+
+def _sweep_task(spec, institution, year, workers):
+  """Executa todos os ataques da varredura para um grafo (instituição e ano)."""
+  graph_path = _resolve_graph_path(spec['graph_path'].format(institution=institution, year=year))
+  csr_graph = read_csr_graph(graph_path, interned=True)
+
+  lcc_only = spec.get('lcc_only', False)
+  write_attacks = spec.get('output_json_path') or spec.get('combined_output_json_path') or spec.get('catalog_path')
+  write_curves = spec.get('curve_output_json_path')
+
+  if spec.get('adaptive'):
+    adaptive = {
+      'recompute_interval': spec.get('recompute_interval'),
+      'pivots': spec.get('pivots', ADAPTIVE_CURVE_PIVOTS if write_curves else None),
+      'seed': spec.get('seed')
+    }
+    rankings = adaptive_hub_rankings(
+      csr_graph, spec['metrics'], num_removals=None if write_curves else max(spec['num_hubs']),
+      lcc_only=lcc_only, workers=workers, **adaptive
+    )
+    attack_info = {'adaptive': adaptive}
+  else:
+    metric_keys = [HUB_METRIC_KEYS[metric] for metric in spec['metrics']]
+    if spec.get('metrics_json_path'):
+      metrics_data = import_node_metrics(
+        load_metrics(spec['metrics_json_path'].format(institution=institution, year=year), node_metrics=metric_keys), graph_path
+      )
+    else:
+      metrics_data = extract_graph_metrics(
+        csr_graph, backend='csr', workers=workers, requested_metrics=metric_keys, cache_dir=spec.get('cache_dir')
+      )
+
+    missing_keys = [key for key in metric_keys if key not in metrics_data]
+    if missing_keys:
+      raise KeyError(f"Métricas não encontradas: {', '.join(missing_keys)}")
+
+    # JSONs antigos guardam "Could not converge" no lugar da centralidade de autovetor
+    invalid_keys = [key for key in metric_keys if not isinstance(metrics_data[key], dict)]
+    if invalid_keys:
+      metrics_data.update(extract_graph_metrics(csr_graph, backend='csr', workers=workers, requested_metrics=invalid_keys))
+
+    centralities = {metric: metrics_data[HUB_METRIC_KEYS[metric]] for metric in spec['metrics']}
+    rankings = hub_rankings(csr_graph, centralities, lcc_only=lcc_only)
+    attack_info = {'centrality_sampling': metrics_data['centrality_sampling']} if 'centrality_sampling' in metrics_data else None
+
+  results = {}
+  if write_attacks:
+    results = hub_attack_results(
+      csr_graph, rankings, spec['num_hubs'], lcc_only=lcc_only, workers=workers, attack_info=attack_info
+    )
+
+  curves = hub_attack_curves(csr_graph, rankings, lcc_only=lcc_only, attack_info=attack_info) if write_curves else {}
+  return export_attack_nodes(results, graph_path), export_attack_nodes(curves, graph_path)
+
+
+def _write_json(path, data):
+  """Grava um JSON, criando o diretório de saída se necessário."""
+  output_dir = os.path.dirname(path)
+  if output_dir and not os.path.exists(output_dir):
+    os.makedirs(output_dir)
+
+  with open(path, 'w', encoding='utf-8') as f:
+    json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def run_robustness_sweep(spec, processes=1, workers=1):
+  """
+  Executa uma varredura de robustez: para cada instituição e ano, lê o grafo e as métricas uma
+  única vez, mede a rede original uma única vez e executa todos os ataques (métricas × quantidades
+  de hubs). Os grafos podem ser distribuídos entre processos.
+
+  Args:
+    spec (dict): A especificação da varredura (`load_sweep_spec`).
+    processes (int): Número de processos entre os quais os grafos são distribuídos.
+    workers (int): Número de processos das varreduras BFS dentro de cada grafo.
+
+  Returns:
+    dict: Dicionário `{instituição: {ano: {métrica: {quantidade de hubs: resultado}}}}`. Grafos que
+    não puderam ser analisados são omitidos (o erro é impresso).
+  """
+  tasks = [(institution, year) for institution in spec['institutions'] for year in spec['years']]
+  all_results = {}
+
+  if processes > 1:
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+      futures = {task: executor.submit(_sweep_task, spec, *task, workers) for task in tasks}
+      outcomes = []
+      for task, future in futures.items():
+        try:
+          outcomes.append((task, future.result(), None))
+        except Exception as e:
+          outcomes.append((task, None, e))
+  else:
+    outcomes = []
+    for task in tasks:
+      try:
+        outcomes.append((task, _sweep_task(spec, *task, workers), None))
+      except Exception as e:
+        outcomes.append((task, None, e))
+
+  for (institution, year), task_results, error in outcomes:
+    if error is not None:
+      print(f"Aviso: análise de {institution} - {year} ignorada: {error}")
+      continue
+    print(f"Ataques para {institution} - {year} concluídos.")
+    results, curves = task_results
+
+    all_results.setdefault(institution, {})[year] = results
+    if spec.get('output_json_path'):
+      for metric, results_by_hubs in results.items():
+        for num_hubs, attack_results in results_by_hubs.items():
+          _write_json(
+            spec['output_json_path'].format(institution=institution, year=year, metric=metric, num_hubs=num_hubs),
+            attack_results
+          )
+
+    if spec.get('catalog_path') and results:
+      record_attack_results(spec['catalog_path'], institution, year, results)
+
+    if spec.get('curve_output_json_path'):
+      for metric, curve in curves.items():
+        _write_json(spec['curve_output_json_path'].format(institution=institution, year=year, metric=metric), curve)
+
+  if spec.get('combined_output_json_path'):
+    _write_json(spec['combined_output_json_path'], all_results)
+
+  return all_results
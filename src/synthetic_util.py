@@ -0,0 +1,271 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy.stats import poisson
+
+SYNTHETIC_CHUNK_SIZE = 100000
+
+TEAM_SIZE_MEAN = 4.0
+TEAM_SIZE_TAIL_SHARE = 0.1
+TEAM_SIZE_EXPONENT = 2.0
+MAX_TEAM_SIZE = 100
+AUTHORS_PER_WORK = 1.2
+PRODUCTIVITY_EXPONENT = 0.7
+YEAR_GROWTH = 0.12
+ORCID_SHARE = 0.45
+UNAFFILIATED_SHARE = 0.15
+PARTNER_INSTITUTIONS = 40
+PARTNER_SHARE = 0.35
+FOREIGN_PARTNER_SHARE = 0.2
+
+WORK_ID_OFFSET = 9000000000
+AUTHOR_ID_OFFSET = 9000000000
+INSTITUTION_ID_OFFSET = 9000000000
+
+# As cinco instituições do Tocantins (IDs do OpenAlex, ver README) e sua participação nos autores
+LOCAL_INSTITUTIONS = [
+  ('https://openalex.org/I41458283', 'Universidade Federal do Tocantins', 0.25),
+  ('https://openalex.org/I4210139493', 'Instituto Federal do Tocantins', 0.08),
+  ('https://openalex.org/I4210089573', 'Universidade Estadual do Tocantins', 0.07),
+  ('https://openalex.org/I4387152431', 'Universidade Federal do Norte do Tocantins', 0.05),
+  ('https://openalex.org/I4387152239', 'Centro Universitário Luterano de Palmas', 0.05)
+]
+
+FOREIGN_COUNTRY_CODES = ['US', 'PT', 'ES', 'FR', 'GB', 'AR', 'CO', 'DE']
+
+SYNTHETIC_COLUMNS = [
+  'id',
+  'title',
+  'publication_year',
+  'authorships.author_position',
+  'authorships.institutions',
+  'authorships.countries',
+  'authorships.raw_author_name',
+  'authorships.author.id',
+  'authorships.author.display_name',
+  'authorships.author.orcid'
+]
+
+_FIRST_NAMES = [
+  'Ana', 'Antônio', 'Beatriz', 'Bruno', 'Carla', 'Carlos', 'Daniela', 'Eduardo', 'Fernanda', 'Francisco',
+  'Gabriela', 'Gustavo', 'Helena', 'João', 'Juliana', 'Lucas', 'Mariana', 'Marcos', 'Patrícia', 'Rafael',
+  'Renata', 'Rodrigo', 'Sandra', 'Thiago'
+]
+
+_LAST_NAMES = [
+  'Almeida', 'Alves', 'Araújo', 'Barbosa', 'Cardoso', 'Carvalho', 'Costa', 'Dias', 'Ferreira', 'Gomes',
+  'Lima', 'Martins', 'Melo', 'Nascimento', 'Oliveira', 'Pereira', 'Ribeiro', 'Rocha', 'Rodrigues', 'Santos',
+  'Silva', 'Soares', 'Sousa', 'Teixeira'
+]
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _institution_string(institution_id, display_name, country_code):
+  """A representação em string de uma instituição, como nas colunas 'authorships.institutions' do OpenAlex."""
+  return repr({
+    'id': institution_id,
+    'display_name': display_name,
+    'ror': None,
+    'country_code': country_code,
+    'type': 'education',
+    'lineage': [institution_id]
+  })
+
+
+def synthetic_institutions(num_partners=PARTNER_INSTITUTIONS):
+  """
+  Monta as instituições dos autores sintéticos: as cinco instituições do Tocantins e
+  `num_partners` instituições parceiras fictícias (a maioria brasileira), cuja participação
+  nos autores segue uma lei de Zipf.
+
+  Args:
+    num_partners (int): O número de instituições parceiras.
+
+  Returns:
+    tuple: (lista das strings das instituições, lista dos códigos de país, array das
+      probabilidades de cada instituição). A probabilidade que falta para somar 1 é a dos
+      autores sem afiliação (`UNAFFILIATED_SHARE`).
+  """
+  institutions = [_institution_string(institution_id, name, 'BR') for institution_id, name, _ in LOCAL_INSTITUTIONS]
+  country_codes = ['BR'] * len(LOCAL_INSTITUTIONS)
+  weights = [weight for _, _, weight in LOCAL_INSTITUTIONS]
+
+  partner_weights = 1.0 / np.arange(1, num_partners + 1)
+  partner_weights *= PARTNER_SHARE / partner_weights.sum() if num_partners else 0
+  num_foreign = int(round(num_partners * FOREIGN_PARTNER_SHARE))
+
+  for partner in range(num_partners):
+    # As parceiras estrangeiras ficam no fim do ranking, com as menores participações
+    foreign = partner >= num_partners - num_foreign
+    country_code = FOREIGN_COUNTRY_CODES[partner % len(FOREIGN_COUNTRY_CODES)] if foreign else 'BR'
+    institution_id = f"https://openalex.org/I{INSTITUTION_ID_OFFSET + partner}"
+    name = f"Synthetic Partner University {partner + 1}" if foreign else f"Universidade Parceira {partner + 1}"
+    institutions.append(_institution_string(institution_id, name, country_code))
+    country_codes.append(country_code)
+  weights = np.concatenate([weights, partner_weights])
+
+  return institutions, country_codes, weights * (1 - UNAFFILIATED_SHARE) / weights.sum()
+
+
+def _author_hashes(authors):
+  """Hash de 64 bits de cada índice de autor, do qual saem os atributos fixos do autor."""
+  return authors.astype(np.uint64) * _HASH_MULTIPLIER
+
+
+def team_size_probabilities(mean=TEAM_SIZE_MEAN, tail_share=TEAM_SIZE_TAIL_SHARE, exponent=TEAM_SIZE_EXPONENT, maximum=MAX_TEAM_SIZE):
+  """
+  Distribuição dos tamanhos das equipes: uma mistura de um núcleo de Poisson (1 + Poisson
+  de média `mean` - 1), com as equipes típicas, e de uma cauda em lei de potência com
+  fração `tail_share`, com as equipes grandes.
+
+  Args:
+    mean (float): O tamanho médio das equipes do núcleo.
+    tail_share (float): A fração das equipes sorteadas da lei de potência.
+    exponent (float): O expoente da lei de potência.
+    maximum (int): O maior tamanho de equipe.
+
+  Returns:
+    np.ndarray: As probabilidades dos tamanhos 1..`maximum`.
+  """
+  sizes = np.arange(1, maximum + 1)
+  core = poisson.pmf(sizes - 1, mean - 1)
+  tail = sizes.astype(np.float64) ** -exponent
+  probabilities = (1 - tail_share) * core / core.sum() + tail_share * tail / tail.sum()
+  return probabilities / probabilities.sum()
+
+
+def _join_by_work(values, starts, ends):
+  return ['|'.join(values[start:end]) for start, end in zip(starts, ends)]
+
+
+def synthetic_works(num_works, num_authors=None, start_year=1998, end_year=2024, seed=None, chunk_size=SYNTHETIC_CHUNK_SIZE,
+                    team_size_mean=TEAM_SIZE_MEAN, team_size_tail_share=TEAM_SIZE_TAIL_SHARE,
+                    team_size_exponent=TEAM_SIZE_EXPONENT, max_team_size=MAX_TEAM_SIZE,
+                    productivity_exponent=PRODUCTIVITY_EXPONENT, year_growth=YEAR_GROWTH, num_partners=PARTNER_INSTITUTIONS):
+  """
+  Gera trabalhos sintéticos no formato dos CSVs exportados do OpenAlex, em blocos, para
+  medir o desempenho do código em bases maiores que as reais.
+
+  - O tamanho das equipes segue `team_size_probabilities`: a maioria dos trabalhos tem
+    poucos autores, e uma cauda pesada tem dezenas, até `max_team_size`.
+  - Cada posição de autoria sorteia um autor de um conjunto de `num_authors` autores com
+    probabilidade proporcional a rank^-`productivity_exponent` (poucos autores muito
+    produtivos e uma cauda longa). Autores repetidos em um trabalho são descartados.
+  - Nome, ORCID (de parte dos autores) e instituição (`synthetic_institutions`) de cada autor
+    são fixos, derivados do seu índice, então se repetem entre trabalhos e blocos.
+  - Os anos de publicação crescem exponencialmente à taxa `year_growth` ao ano.
+
+  Com a mesma `seed` e os mesmos parâmetros (inclusive `chunk_size`), os trabalhos gerados
+  são os mesmos.
+
+  Args:
+    num_works (int): O número de trabalhos.
+    num_authors (int): O número de autores do conjunto. Padrão: `AUTHORS_PER_WORK` por trabalho.
+    start_year (int): O primeiro ano de publicação (inclusive).
+    end_year (int): O último ano de publicação (inclusive).
+    seed (int): A semente dos sorteios.
+    chunk_size (int): O número de trabalhos por bloco.
+    team_size_mean (float): O tamanho médio das equipes do núcleo da distribuição.
+    team_size_tail_share (float): A fração das equipes sorteadas da cauda em lei de potência.
+    team_size_exponent (float): O expoente da cauda dos tamanhos das equipes.
+    max_team_size (int): O maior tamanho de equipe.
+    productivity_exponent (float): O expoente da produtividade dos autores.
+    year_growth (float): A taxa de crescimento anual do número de trabalhos.
+    num_partners (int): O número de instituições parceiras.
+
+  Yields:
+    pd.DataFrame: Blocos de até `chunk_size` trabalhos, com as colunas de `SYNTHETIC_COLUMNS`.
+  """
+  num_authors = num_authors or max(1, int(num_works * AUTHORS_PER_WORK))
+  rng = np.random.default_rng(seed)
+
+  size_probabilities = team_size_probabilities(team_size_mean, team_size_tail_share, team_size_exponent, max_team_size)
+  author_cdf = np.cumsum(np.arange(1, num_authors + 1, dtype=np.float64) ** -productivity_exponent)
+  author_cdf /= author_cdf[-1]
+  # Embaralha os ranks para que os autores mais produtivos não sejam os de menor índice
+  author_ranks = rng.permutation(num_authors)
+
+  years = np.arange(start_year, end_year + 1)
+  year_probabilities = np.exp(year_growth * (years - start_year))
+  year_probabilities /= year_probabilities.sum()
+
+  institutions, country_codes, institution_probabilities = synthetic_institutions(num_partners)
+  institutions = np.array(institutions + [''], dtype=object)
+  country_codes = np.array(country_codes + [''], dtype=object)
+  institution_cdf = np.cumsum(institution_probabilities)
+
+  names = np.array([f"{first} {last}" for last in _LAST_NAMES for first in _FIRST_NAMES], dtype=object)
+  raw_names = np.array([f"{first[0]}. {last}" for last in _LAST_NAMES for first in _FIRST_NAMES], dtype=object)
+
+  for first_work in range(0, num_works, chunk_size):
+    chunk_works = min(chunk_size, num_works - first_work)
+
+    team_sizes = rng.choice(np.arange(1, max_team_size + 1), size=chunk_works, p=size_probabilities)
+    work_of_slot = np.repeat(np.arange(chunk_works), team_sizes)
+    authors = author_ranks[np.searchsorted(author_cdf, rng.random(len(work_of_slot)), side='right').clip(max=num_authors - 1)]
+
+    _, first_slots = np.unique(work_of_slot.astype(np.int64) * num_authors + authors, return_index=True)
+    kept_slots = np.sort(first_slots)
+    work_of_slot, authors = work_of_slot[kept_slots], authors[kept_slots]
+
+    team_sizes = np.bincount(work_of_slot, minlength=chunk_works)
+    ends = np.cumsum(team_sizes)
+    starts = ends - team_sizes
+    positions = np.arange(len(authors)) - starts[work_of_slot]
+    author_positions = np.where(positions == 0, 'first', np.where(positions == team_sizes[work_of_slot] - 1, 'last', 'middle'))
+
+    hashes = _author_hashes(authors)
+    institution_codes = np.searchsorted(institution_cdf, (hashes >> np.uint64(11)) / float(1 << 53), side='right')
+    name_codes = (hashes >> np.uint64(40)) % np.uint64(len(names))
+    has_orcid = (hashes >> np.uint64(20)) % np.uint64(100) < ORCID_SHARE * 100
+    author_keys = authors.astype(np.int64) + AUTHOR_ID_OFFSET
+
+    author_ids = [f"https://openalex.org/A{key}" for key in author_keys.tolist()]
+    orcids = [
+      f"https://orcid.org/0000-{key // 10 ** 8 % 10000:04d}-{key // 10 ** 4 % 10000:04d}-{key % 10000:04d}" if orcid else 'None'
+      for key, orcid in zip(author_keys.tolist(), has_orcid.tolist())
+    ]
+
+    work_ids = np.arange(first_work, first_work + chunk_works)
+    yield pd.DataFrame({
+      'id': [f"https://openalex.org/W{WORK_ID_OFFSET + work}" for work in work_ids.tolist()],
+      'title': [f"Trabalho sintético {work + 1}" for work in work_ids.tolist()],
+      'publication_year': rng.choice(years, size=chunk_works, p=year_probabilities),
+      'authorships.author_position': _join_by_work(author_positions.tolist(), starts, ends),
+      'authorships.institutions': _join_by_work(institutions[institution_codes].tolist(), starts, ends),
+      'authorships.countries': _join_by_work(country_codes[institution_codes].tolist(), starts, ends),
+      'authorships.raw_author_name': _join_by_work(raw_names[name_codes].tolist(), starts, ends),
+      'authorships.author.id': _join_by_work(author_ids, starts, ends),
+      'authorships.author.display_name': _join_by_work(names[name_codes].tolist(), starts, ends),
+      'authorships.author.orcid': _join_by_work(orcids, starts, ends)
+    }, columns=SYNTHETIC_COLUMNS)
+
+
+def write_synthetic_works(csv_path, num_works, **options):
+  """
+  Grava trabalhos sintéticos (`synthetic_works`) em um CSV no formato do OpenAlex, bloco a
+  bloco, com uso de memória limitado ao tamanho de um bloco. O arquivo só aparece no
+  caminho final quando está completo.
+
+  Args:
+    csv_path (str): O caminho do CSV de saída.
+    num_works (int): O número de trabalhos.
+    **options: Os demais parâmetros de `synthetic_works`.
+
+  Returns:
+    int: O número de posições de autoria gravadas.
+  """
+  output_dir = os.path.dirname(csv_path)
+  if output_dir:
+    os.makedirs(output_dir, exist_ok=True)
+
+  temporary_path = f"{csv_path}.tmp"
+  num_authorships = 0
+  with open(temporary_path, 'w', encoding='utf-8', newline='') as f:
+    for chunk_number, chunk in enumerate(synthetic_works(num_works, **options)):
+      chunk.to_csv(f, header=chunk_number == 0, index=False)
+      num_authorships += int(chunk['authorships.author.id'].str.count('\\|').sum()) + len(chunk)
+  os.replace(temporary_path, csv_path)
+
+  return num_authorships
@@ -0,0 +1,359 @@
+import json
+import os
+from collections import namedtuple
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from src.csr_util import CSRGraph
+from src.graph_store_util import write_strings, read_strings, read_registry_ids, read_store_meta, string_encoding, intern_author, AUTHOR_KEY_DTYPE
+
+TEMPORAL_INDEX_EXTENSION = '.temporal'
+TEMPORAL_INDEX_VERSION = 2
+
+TemporalIndex = namedtuple('TemporalIndex', [
+  'authors_ids',
+  'author_attributes',
+  'years',
+  'presence_authors',
+  'presence_years',
+  'edge_sources',
+  'edge_targets',
+  'entry_edges',
+  'entry_years',
+  'entry_counts'
+])
+
+
+def works_incidence(df_works, authors_ids):
+  """Monta a matriz esparsa de incidência autor × trabalho.
+
+  Args:
+    df_works (pd.DataFrame): DataFrame contendo informações sobre os trabalhos.
+    authors_ids (list): Lista dos IDs dos autores considerados. A posição de cada ID
+      na lista é o seu índice inteiro na matriz; autores fora da lista são ignorados.
+
+  Returns:
+    sp.csr_matrix: Matriz (n_autores × n_trabalhos) com o número de vezes que cada autor
+      aparece em cada trabalho (na ordem das linhas de `df_works`).
+  """
+  if 'authorships.author.id' in df_works.columns:
+    works_authors = df_works['authorships.author.id'].reset_index(drop=True).dropna().astype(str).str.split('|').explode()
+  else:
+    works_authors = pd.Series(dtype=str)
+
+  author_indices = pd.Categorical(works_authors, categories=authors_ids).codes
+  known_authors = author_indices >= 0
+
+  return sp.csr_matrix(
+    (np.ones(known_authors.sum(), dtype=np.int64), (author_indices[known_authors], works_authors.index[known_authors])),
+    shape=(len(authors_ids), len(df_works))
+  )
+
+
+def pair_counts(incidence):
+  """Conta os pares de coautoria pela projeção B·Bᵀ da matriz de incidência.
+
+  Cada posição (i, j) fora da diagonal conta quantos pares de coautoria entre os autores
+  i e j aparecem nos trabalhos, e a diagonal conta os pares de um autor com ele mesmo
+  (IDs repetidos em um trabalho), como os pares de `itertools.combinations`.
+
+  Args:
+    incidence (sp.spmatrix): Matriz de incidência autor × trabalho (`works_incidence`).
+
+  Returns:
+    sp.csr_matrix: Matriz simétrica (n_autores × n_autores) com os pesos das coautorias.
+  """
+  incidence = sp.csr_matrix(incidence)
+  adjacency = (incidence @ incidence.T).tolil()
+  authors_incidences = np.asarray(incidence.sum(axis=1)).ravel()
+  adjacency.setdiag((adjacency.diagonal() - authors_incidences) // 2)
+
+  adjacency = adjacency.tocsr()
+  adjacency.eliminate_zeros()
+  return adjacency
+
+
+def build_temporal_index(df_works, author_nodes):
+  """
+  Monta o índice temporal de coautoria: cada aresta (par de autores) aparece uma única vez,
+  com o número de coautorias em cada ano, e cada autor com os anos em que publicou. Com ele,
+  o grafo de qualquer intervalo de anos sai de uma filtragem vetorizada (`snapshot_csr`,
+  `snapshot_graph`), sem reler os trabalhos.
+
+  Trabalhos sem ano de publicação válido são descartados.
+
+  Args:
+    df_works (pd.DataFrame): DataFrame com as colunas 'publication_year' e 'authorships.author.id'.
+    author_nodes (dict): Atributos dos vértices por ID de autor, na ordem dos autores
+      (ver `network_util.author_nodes`). Só esses autores entram no índice.
+
+  Returns:
+    TemporalIndex: O índice, com:
+      - 'authors_ids' e 'author_attributes': os autores e seus atributos, na ordem de `author_nodes`.
+      - 'years': os anos com ao menos um trabalho, em ordem crescente.
+      - 'presence_authors' e 'presence_years': os pares (autor, ano) com ao menos um trabalho.
+      - 'edge_sources' e 'edge_targets': as extremidades de cada aresta (u ≤ v; u = v para laços).
+      - 'entry_edges', 'entry_years' e 'entry_counts': as coautorias de cada aresta em cada
+        ano, ordenadas por aresta e ano.
+  """
+  authors_ids = list(author_nodes)
+  num_authors = len(authors_ids)
+
+  years = pd.to_numeric(df_works['publication_year'], errors='coerce')
+  valid_works = years.notna().to_numpy()
+  df_valid = df_works[valid_works]
+  work_years = years[valid_works].astype(int).to_numpy()
+
+  incidence = works_incidence(df_valid, authors_ids).tocoo()
+  presence = np.unique(np.column_stack([incidence.row, work_years[incidence.col]]).astype(np.int64).reshape(-1, 2), axis=0)
+  presence_authors, presence_years = presence[:, 0], presence[:, 1]
+
+  incidence = incidence.tocsc()
+  sources, targets, entry_years, entry_counts = [], [], [], []
+  for year in np.unique(work_years):
+    year_pairs = sp.triu(pair_counts(incidence[:, np.flatnonzero(work_years == year)])).tocoo()
+    sources.append(year_pairs.row)
+    targets.append(year_pairs.col)
+    entry_years.append(np.full(year_pairs.nnz, year, dtype=np.int64))
+    entry_counts.append(year_pairs.data)
+
+  if sources:
+    sources, targets = np.concatenate(sources).astype(np.int64), np.concatenate(targets).astype(np.int64)
+    entry_years, entry_counts = np.concatenate(entry_years), np.concatenate(entry_counts).astype(np.int64)
+  else:
+    sources = targets = entry_years = entry_counts = np.zeros(0, dtype=np.int64)
+
+  edge_codes, entry_edges = np.unique(sources * max(num_authors, 1) + targets, return_inverse=True)
+  order = np.lexsort((entry_years, entry_edges))
+
+  return TemporalIndex(
+    authors_ids=authors_ids,
+    author_attributes=[author_nodes[author_id] for author_id in authors_ids],
+    years=np.unique(work_years).astype(np.int64),
+    presence_authors=presence_authors,
+    presence_years=presence_years,
+    edge_sources=edge_codes // max(num_authors, 1),
+    edge_targets=edge_codes % max(num_authors, 1),
+    entry_edges=entry_edges[order],
+    entry_years=entry_years[order],
+    entry_counts=entry_counts[order]
+  )
+
+
+def _check_year_range(start_year, end_year):
+  if start_year is not None and end_year is not None and start_year > end_year:
+    raise ValueError(f"O ano de início ({start_year}) é posterior ao ano de término ({end_year}).")
+
+
+def _snapshot_arrays(index, start_year=None, end_year=None, group_years=None):
+  """
+  Filtra o índice para os trabalhos de `start_year` a `end_year` (inclusive; None deixa o
+  intervalo aberto). Os vértices são ordenados pelo primeiro ano em que publicaram no
+  intervalo e, no mesmo ano, pela ordem dos autores; com `group_years`, o primeiro ano é
+  arredondado para cima até o próximo ano dessa lista (a ordem de `evolution_graphs`, que
+  acrescenta os autores novos uma vez por ano gerado).
+
+  Returns:
+    tuple: Os índices dos autores presentes (na ordem dos vértices) e os vetores (u, v, peso)
+    das arestas, com u e v nas posições dos vértices.
+  """
+  _check_year_range(start_year, end_year)
+  low = -np.inf if start_year is None else start_year
+  high = np.inf if end_year is None else end_year
+
+  in_range = (index.presence_years >= low) & (index.presence_years <= high)
+  authors, first_years = index.presence_authors[in_range], index.presence_years[in_range]
+  first_indices = np.unique(authors, return_index=True)[1]
+  authors, first_years = authors[first_indices], first_years[first_indices]
+
+  if group_years is not None:
+    group_years = np.asarray(group_years)
+    first_years = group_years[np.minimum(np.searchsorted(group_years, first_years), len(group_years) - 1)]
+  node_indices = authors[np.lexsort((authors, first_years))]
+
+  entries = (index.entry_years >= low) & (index.entry_years <= high)
+  weights = np.bincount(index.entry_edges[entries], weights=index.entry_counts[entries], minlength=len(index.edge_sources))
+  edges = np.flatnonzero(weights)
+
+  positions = np.full(len(index.authors_ids), -1, dtype=np.int64)
+  positions[node_indices] = np.arange(len(node_indices))
+  return node_indices, positions[index.edge_sources[edges]], positions[index.edge_targets[edges]], weights[edges].astype(np.int64)
+
+
+def snapshot_csr(index, start_year=None, end_year=None):
+  """
+  Retorna o grafo de coautoria dos trabalhos publicados de `start_year` a `end_year`
+  (inclusive) em CSR, sem montar um grafo NetworkX.
+
+  Args:
+    index (TemporalIndex): O índice temporal.
+    start_year (int): O primeiro ano (None: desde o início).
+    end_year (int): O último ano (None: até o fim).
+
+  Returns:
+    CSRGraph: A matriz de adjacência ponderada e os IDs dos autores presentes no intervalo.
+  """
+  node_indices, sources, targets, weights = _snapshot_arrays(index, start_year, end_year)
+  num_nodes = len(node_indices)
+  loops = sources == targets
+
+  adjacency = sp.csr_matrix(
+    (np.concatenate([weights, weights[~loops]]).astype(np.float64),
+     (np.concatenate([sources, targets[~loops]]), np.concatenate([targets, sources[~loops]]))),
+    shape=(num_nodes, num_nodes)
+  )
+  return CSRGraph(adjacency, [index.authors_ids[i] for i in node_indices])
+
+
+def _snapshot_graph(index, start_year, end_year, group_years):
+  node_indices, sources, targets, weights = _snapshot_arrays(index, start_year, end_year, group_years)
+
+  graph = nx.Graph()
+  graph.add_nodes_from((index.authors_ids[i], index.author_attributes[i]) for i in node_indices.tolist())
+
+  node_ids = [index.authors_ids[i] for i in node_indices.tolist()]
+  graph.add_weighted_edges_from(
+    (node_ids[u], node_ids[v], weight)
+    for u, v, weight in zip(sources.tolist(), targets.tolist(), weights.tolist())
+  )
+  return graph
+
+
+def snapshot_graph(index, start_year=None, end_year=None):
+  """
+  Retorna o grafo de coautoria dos trabalhos publicados de `start_year` a `end_year`
+  (inclusive), com os mesmos vértices, atributos e pesos que `generate_coauthorship_graph`
+  geraria para esses trabalhos.
+
+  Args:
+    index (TemporalIndex): O índice temporal.
+    start_year (int): O primeiro ano (None: desde o início).
+    end_year (int): O último ano (None: até o fim).
+
+  Returns:
+    nx.Graph: O grafo de coautoria do intervalo.
+  """
+  return _snapshot_graph(index, start_year, end_year, None)
+
+
+def evolution_snapshots(index, start_year, end_year, window_size=None):
+  """
+  Gera um grafo por ano, de `start_year` a `end_year`, pulando os anos sem trabalhos.
+
+  Args:
+    index (TemporalIndex): O índice temporal.
+    start_year (int): O primeiro ano (inclusive).
+    end_year (int): O último ano (inclusive).
+    window_size (int): Sem valor, cada grafo acumula todos os trabalhos publicados até o seu
+      ano; com valor, só os trabalhos da janela deslizante dos últimos `window_size` anos.
+
+  Returns:
+    dict: Dicionário onde as chaves são os anos e os valores são os grafos.
+
+  Raises:
+    ValueError: Se `start_year` for posterior a `end_year` ou `window_size` for menor que 1.
+  """
+  _check_year_range(start_year, end_year)
+  if window_size is not None and window_size < 1:
+    raise ValueError(f"O tamanho da janela deve ser um inteiro positivo: {window_size}")
+
+  years = np.asarray(index.years)
+  years = years[(years >= start_year) & (years <= end_year)]
+
+  graphs = {}
+  for year in years.tolist():
+    if window_size is None:
+      graphs[year] = _snapshot_graph(index, None, year, years)
+    else:
+      graphs[year] = _snapshot_graph(index, year - window_size + 1, year, None)
+  return graphs
+
+
+def write_temporal_index(index, path, registry=None, registry_path=None):
+  """
+  Grava o índice temporal em um diretório (por convenção com a extensão '.temporal'), com os
+  vetores em '.npy' e os IDs e atributos dos autores em colunas de strings.
+
+  Args:
+    index (TemporalIndex): O índice temporal.
+    path (str): O diretório de saída.
+    registry (AuthorRegistry): Se especificado, os autores são gravados como chaves desse
+      registro ('authors_keys.npy'), sem repetir os IDs; os atributos continuam no índice
+      (ver `graph_store_util.write_graph_store`).
+    registry_path (str): O diretório do registro. Obrigatório com `registry`.
+  """
+  os.makedirs(path, exist_ok=True)
+
+  attribute_names = []
+  for attributes in index.author_attributes:
+    for attribute_name in attributes:
+      if attribute_name not in attribute_names:
+        attribute_names.append(attribute_name)
+
+  meta = {
+    'version': TEMPORAL_INDEX_VERSION,
+    'num_authors': len(index.authors_ids),
+    'num_edges': len(index.edge_sources),
+    'attribute_names': attribute_names
+  }
+
+  encodings = {}
+  if registry is not None:
+    keys = np.fromiter(
+      (intern_author(registry, author_id) for author_id in index.authors_ids), dtype=AUTHOR_KEY_DTYPE, count=len(index.authors_ids)
+    )
+    np.save(os.path.join(path, 'authors_keys.npy'), keys)
+    meta['registry'] = os.path.relpath(registry_path, path)
+  else:
+    encodings['authors_ids'] = write_strings(path, 'authors_ids', index.authors_ids)
+
+  for attribute_name in attribute_names:
+    encodings[f"attr_{attribute_name}"] = write_strings(
+      path, f"attr_{attribute_name}", [attributes.get(attribute_name) for attributes in index.author_attributes]
+    )
+  meta['string_encodings'] = {name: encoding for name, encoding in encodings.items() if encoding != 'utf-8'}
+
+  for field in TemporalIndex._fields[2:]:
+    np.save(os.path.join(path, f"{field}.npy"), np.asarray(getattr(index, field), dtype=np.int64))
+
+  with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+    json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def read_temporal_index(path, mmap=True):
+  """
+  Lê um índice temporal gravado por `write_temporal_index`.
+
+  Args:
+    path (str): O diretório do índice.
+    mmap (bool): Se verdadeiro, os vetores são mapeados em memória.
+
+  Returns:
+    TemporalIndex: O índice temporal.
+  """
+  meta_path = os.path.join(path, 'meta.json')
+  if not os.path.exists(meta_path):
+    raise FileNotFoundError(meta_path)
+
+  meta = read_store_meta(path, 'version', TEMPORAL_INDEX_VERSION)
+  if meta.get('registry'):
+    authors_ids = read_registry_ids(
+      os.path.normpath(os.path.join(path, meta['registry'])), np.load(os.path.join(path, 'authors_keys.npy')), mmap=mmap
+    )
+  else:
+    authors_ids = read_strings(path, 'authors_ids', mmap=mmap, encoding=string_encoding(meta, 'authors_ids'))
+  columns = {
+    name: read_strings(path, f"attr_{name}", mmap=mmap, encoding=string_encoding(meta, f"attr_{name}"))
+    for name in meta['attribute_names']
+  }
+  attributes_by_author = [
+    {name: values[position] for name, values in columns.items() if values[position] is not None}
+    for position in range(len(authors_ids))
+  ]
+
+  arrays = {
+    field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode='r' if mmap else None)
+    for field in TemporalIndex._fields[2:]
+  }
+  return TemporalIndex(authors_ids=authors_ids, author_attributes=attributes_by_author, **arrays)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+PUBLICATION_YEAR_COLUMNS = ['publication_year']
+
 def count_papers_by_year(df, start_year, end_year):
   """
   Calcula o número de trabalhos para cada ano dentro de um intervalo especificado.